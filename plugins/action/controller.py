@@ -0,0 +1,169 @@
+# -*- coding: utf-8 -*-
+# Copyright: (c) 2019, XLAB Steampunk <steampunk@xlab.si>
+#
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+__metaclass__ = type
+
+import importlib
+import json
+import os
+import sys
+import traceback
+
+from ansible.module_utils import basic
+from ansible.module_utils._text import to_bytes, to_native
+from ansible.module_utils.parsing.convert_bool import boolean
+from ansible.module_utils.six import StringIO
+from ansible.plugins.action import ActionBase
+from ansible.utils.vars import merge_hash
+
+try:
+    from ansible.module_utils.common import warnings
+except ImportError:
+    # Ansible 2.9 does not have the global warnings that run_module resets,
+    # so modules always run the usual way there.
+    warnings = None
+
+from ..module_utils import arguments, debug, metrics
+
+MODULES_PACKAGE = "ansible_collections.sensu.sensu_go.plugins.modules"
+# Host variable that enables in-process execution on the controller.
+ENABLE_VAR = "sensu_go_controller_execution"
+
+
+def get_module_name(action):
+    """
+    Return the short name of the module that the task is running. The task
+    action can contain the collection prefix (sensu.sensu_go.check) or not
+    (check, when the task uses the collections keyword).
+    """
+    return action.split(".")[-1]
+
+
+def _set_environment(environment):
+    os.environ.clear()
+    os.environ.update(environment)
+    # Debug logs and metrics read their settings from the environment.
+    debug.configure()
+    metrics.configure()
+
+
+def run_module(name, args, environment=None):
+    """
+    Run the main function of the named module in the current process and
+    return the result that the module reported.
+
+    The environment dict holds the variables from the task's environment
+    keyword. Module code sees them in os.environ, just like it would if it
+    was executed on the target host.
+    """
+    module = importlib.import_module("{0}.{1}".format(MODULES_PACKAGE, name))
+
+    old_args, old_stdout = basic._ANSIBLE_ARGS, sys.stdout
+    old_environment = dict(os.environ)
+    basic._ANSIBLE_ARGS = to_bytes(json.dumps(dict(ANSIBLE_MODULE_ARGS=args)))
+    sys.stdout = StringIO()
+    # Warnings and deprecations are global and would otherwise end up in the
+    # results of all subsequent module runs.
+    del warnings._global_warnings[:]
+    del warnings._global_deprecations[:]
+    _set_environment(dict(old_environment, **(environment or {})))
+    try:
+        module.main()
+    except SystemExit:
+        # AnsibleModule.exit_json and fail_json print the result and exit.
+        pass
+    finally:
+        output = sys.stdout.getvalue()
+        basic._ANSIBLE_ARGS, sys.stdout = old_args, old_stdout
+        # This also writes out the debug log and metrics of the run, since
+        # worker processes do not run exit handlers.
+        _set_environment(old_environment)
+
+    try:
+        return json.loads(output)
+    except ValueError:
+        return dict(
+            failed=True, module_stdout=output,
+            msg="Module {0} did not return a valid result".format(name),
+        )
+
+
+class ActionModule(ActionBase):
+    """
+    Run Sensu Go modules inside the controller's worker process.
+
+    All Sensu Go modules only talk to the Sensu Go API, which makes packaging
+    them up and executing them on the target host pure overhead when the
+    tasks are delegated to the controller anyway. If the host enables the
+    controller execution, this plugin calls the module code directly and
+    reuses API clients across loop items. Otherwise, it executes the module
+    the usual way.
+    """
+
+    def run(self, _tmp=None, task_vars=None):
+        self._supports_check_mode = True
+        self._supports_async = True
+
+        result = super(ActionModule, self).run(task_vars=task_vars)
+        task_vars = task_vars or {}
+
+        wrap_async = (
+            self._task.async_val and not self._connection.has_native_async
+        )
+        module_name = get_module_name(self._task.action)
+        in_process = (
+            not self._task.async_val and self.controller_execution(task_vars)
+        )
+        module_args = self.get_module_args(in_process)
+
+        if not in_process:
+            try:
+                return merge_hash(result, self._execute_module(
+                    module_name="sensu.sensu_go." + module_name,
+                    module_args=module_args, task_vars=task_vars,
+                    wrap_async=wrap_async,
+                ))
+            finally:
+                if not wrap_async:
+                    self._remove_tmp_path(self._connection._shell.tmpdir)
+
+        self._update_module_args(
+            "sensu.sensu_go." + module_name, module_args, task_vars,
+        )
+        arguments.enable_client_reuse()
+        try:
+            return merge_hash(result, run_module(
+                module_name, module_args, self.get_environment(),
+            ))
+        except Exception as e:
+            return dict(
+                result, failed=True, exception=traceback.format_exc(),
+                msg="Module {0} failed: {1}".format(module_name, e),
+            )
+
+    def get_module_args(self, in_process):
+        """
+        Return the arguments for the module. Plugins for specific modules
+        can override this method to prepare the arguments on the controller.
+        """
+        return dict(self._task.args)
+
+    def get_environment(self):
+        """
+        Return the templated environment of the task (the same one that
+        Ansible would set on the target host).
+        """
+        environment = {}
+        self._compute_environment_string(raw_environment_out=environment)
+        return dict((k, to_native(v)) for k, v in environment.items())
+
+    def controller_execution(self, task_vars):
+        if warnings is None:
+            return False
+        value = task_vars.get(ENABLE_VAR, False)
+        if self._templar is not None:
+            value = self._templar.template(value)
+        return boolean(value, strict=False)
@@ -0,0 +1,145 @@
+# -*- coding: utf-8 -*-
+# Copyright: (c) 2019, XLAB Steampunk <steampunk@xlab.si>
+#
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+__metaclass__ = type
+
+import os
+import time
+
+from ansible.module_utils.six import string_types
+
+from ..module_utils import cache, user_utils
+from . import controller
+
+DEFAULT_URL = "http://localhost:8080"
+
+
+def get_address(args, environment, default=None):
+    """
+    Return the address that identifies the backend in the cache keys. Just
+    like the module, we fall back to the SENSU_URL environment variable and
+    the default address. Returns None if the address is not known.
+    """
+    url = (
+        (args.get("auth") or {}).get("url")
+        or environment.get("SENSU_URL") or default
+    )
+    if not url:
+        return None
+    if isinstance(url, string_types):
+        url = url.split(",")
+    return url[0]
+
+
+def get_password_cache_ttl(args):
+    try:
+        return int(args.get("password_cache_ttl") or 0)
+    except (TypeError, ValueError):
+        return 0  # Module will report invalid parameters
+
+
+def get_password_cache(args, environment):
+    """
+    Return the controller-side cache for verified passwords or None if the
+    task does not enable it.
+    """
+    if get_password_cache_ttl(args) <= 0:
+        return None
+    directory = (
+        (args.get("auth") or {}).get("cache_dir")
+        or environment.get("SENSU_CACHE_DIR")
+    )
+    if not directory:
+        return None
+    return cache.FileCache(os.path.expanduser(directory))
+
+
+class ActionModule(controller.ActionModule):
+    """
+    Run the user module on the controller or on the target (see the
+    controller action plugin).
+
+    If the task enables the verified password cache (see the
+    password_cache_ttl parameter) and the module runs on the target, we hash
+    passwords that are not known to be valid on the controller, which means
+    that targets do not need the bcrypt library. Without the cache, we would
+    have to hash all passwords on every run, even if none of them changed.
+    """
+
+    def run(self, _tmp=None, task_vars=None):
+        self._password_cache = None
+        self._password_keys = []
+
+        result = super(ActionModule, self).run(task_vars=task_vars)
+
+        # Async results only tell us that the module started.
+        if (
+            self._password_cache is None or self._task.check_mode
+            or self._task.async_val
+        ):
+            return result
+
+        expires_at = time.time() + get_password_cache_ttl(self._task.args)
+        results = self.get_user_results(result)
+        for index, key in self._password_keys:
+            if index < len(results) and not results[index].get("failed"):
+                self._password_cache.set(True, expires_at, *key)
+        return result
+
+    def get_module_args(self, in_process):
+        args = super(ActionModule, self).get_module_args(in_process)
+
+        # Modules see the task environment. Modules that run on the
+        # controller also see the controller's environment. We do not know
+        # the environment on the target, so we do not fall back to the
+        # default address there.
+        environment = self.get_environment()
+        if in_process:
+            environment = dict(os.environ, **environment)
+        address = get_address(
+            args, environment, DEFAULT_URL if in_process else None,
+        )
+        if address is not None:
+            self._password_cache = get_password_cache(args, environment)
+
+        for index, spec in enumerate(self.get_user_specs(args)):
+            password = spec.get("password")
+            if not password or not spec.get("name"):
+                continue
+
+            # Modules use the password hash that comes together with the
+            # password to update the password, which means that it must be
+            # the one we computed. Hashes that users set alongside passwords
+            # are ignored.
+            spec.pop("password_hash", None)
+            if self._password_cache is None:
+                continue
+
+            key = user_utils.password_cache_key(
+                self._password_cache, address, spec["name"], password,
+            )
+            self._password_keys.append((index, key))
+            # Modules that run on the controller only hash passwords that
+            # they need to update.
+            if in_process or not user_utils.HAS_BCRYPT:
+                continue
+            if not self._password_cache.get(*key):
+                spec["password_hash"] = user_utils.hash_password(password)
+
+        return args
+
+    def get_user_specs(self, args):
+        """
+        Return the user specifications from the module arguments. We can
+        modify them in place.
+        """
+        return [args]
+
+    def get_user_results(self, result):
+        """
+        Return the results for the user specifications.
+        """
+        return [result]
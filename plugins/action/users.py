@@ -0,0 +1,30 @@
+# -*- coding: utf-8 -*-
+# Copyright: (c) 2019, XLAB Steampunk <steampunk@xlab.si>
+#
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+__metaclass__ = type
+
+from . import user
+
+
+class ActionModule(user.ActionModule):
+    """
+    Run the users module. Passwords are handled the same way as in the user
+    action plugin.
+    """
+
+    def get_user_specs(self, args):
+        users = args.get("users")
+        if not isinstance(users, list):
+            return []  # Module will report invalid parameters
+        args["users"] = [
+            dict(spec) if isinstance(spec, dict) else spec for spec in users
+        ]
+        return [
+            spec if isinstance(spec, dict) else {} for spec in args["users"]
+        ]
+
+    def get_user_results(self, result):
+        return result.get("results") or []
@@ -36,8 +36,27 @@ options:
           - Location of the Sensu backend API.
             If this is not set the value of the SENSU_URL environment variable
             will be checked.
+          - Can also be a list (or a comma-separated string) of the addresses
+            of all backends in the cluster. Modules spread their requests
+            over the listed backends (see I(auth.backend_selection)) and fail
+            over to the next backend if a backend is not reachable.
+          - List support was added in version 1.15.0.
+        type: list
+        elements: str
+        default: [http://localhost:8080]
+      backend_selection:
+        description:
+          - How modules select the backend for each request when
+            I(auth.url) contains more than one address.
+          - C(round_robin) rotates the backends on each request.
+            C(least_latency) sends requests to the backend that responds the
+            fastest.
+          - Backends that fail are skipped for 30 seconds. If
+            I(auth.cache_dir) is set, all module runs skip them.
         type: str
-        default: http://localhost:8080
+        choices: [ round_robin, least_latency ]
+        default: round_robin
+        version_added: 1.15.0
       api_key:
         description:
           - The API key that should be used when authenticating. If this is
@@ -72,4 +91,158 @@ options:
             environment variable.
         type: path
         version_added: 1.5.0
+      pool_size:
+        description:
+          - Maximal number of idle keep-alive connections that the module
+            keeps open to the backend and reuses for subsequent API requests.
+          - Set this parameter to C(0) to open a new connection for each
+            request. Requests that go through a proxy never reuse connections.
+          - It is also possible to set this parameter via the
+            I(SENSU_POOL_SIZE) environment variable.
+        type: int
+        default: 4
+        version_added: 1.15.0
+      cache_dir:
+        description:
+          - Directory where modules store data that they can reuse in
+            subsequent runs. If this parameter is not set, nothing is cached.
+          - At the moment, modules cache access tokens that they obtain when
+            authenticating with I(auth.user) and I(auth.password). Cached
+            tokens are reused until they expire and are then refreshed.
+          - Modules that need to know the backend version also cache it for
+            an hour.
+          - If I(auth.cache_objects) is enabled, modules also cache the
+            objects that they fetch from the backend.
+          - If I(auth.sync_cache_ttl) is set, modules also remember the
+            resources that were already in the desired state.
+          - Modules also keep the state of request limits here (see
+            I(auth.max_requests_per_second) and I(auth.max_in_flight)). If
+            this parameter is not set, they use the temporary directory.
+          - Directory is created if it does not exist. Make sure that other
+            users cannot access it since it contains sensitive data.
+          - It is also possible to set this parameter via the
+            I(SENSU_CACHE_DIR) environment variable.
+        type: path
+        version_added: 1.15.0
+      cache_objects:
+        description:
+          - Store objects that modules compare with the desired state in
+            I(auth.cache_dir) together with their entity tags. Subsequent
+            module runs ask the backend to only send the object if it
+            changed since, which saves bandwidth when nothing changes.
+          - Collections that info modules list are never cached.
+          - Modules always confirm with the backend that the cached copy is
+            still current, so they never act on stale data.
+          - This parameter has no effect if I(auth.cache_dir) is not set or
+            if the backend does not send entity tags (C(ETag) header).
+          - It is also possible to set this parameter via the
+            I(SENSU_CACHE_OBJECTS) environment variable.
+        type: bool
+        default: false
+        version_added: 1.15.0
+      sync_cache_ttl:
+        description:
+          - Number of seconds for which modules trust that a resource they
+            found in the desired state is still in that state.
+          - Modules store a fingerprint of each payload that matched the
+            resource on the backend in I(auth.cache_dir). If the next run
+            sends the same payload within I(auth.sync_cache_ttl) seconds,
+            the module skips the API request and reports no change.
+          - Changes made outside of Ansible go unnoticed until the cache
+            entry expires. Use I(auth.force_refresh) to ignore the cache.
+          - Set this parameter to C(0) to disable the cache. This parameter
+            has no effect if I(auth.cache_dir) is not set.
+          - It is also possible to set this parameter via the
+            I(SENSU_SYNC_CACHE_TTL) environment variable.
+        type: int
+        default: 0
+        version_added: 1.15.0
+      force_refresh:
+        description:
+          - Ignore the cache that I(auth.sync_cache_ttl) enables and always
+            compare the payload with the resource on the backend. Modules
+            still refresh the cache entries.
+          - It is also possible to set this parameter via the
+            I(SENSU_FORCE_REFRESH) environment variable.
+        type: bool
+        default: false
+        version_added: 1.15.0
+      backend_version:
+        description:
+          - Version of the Sensu Go backend, for example C(6.2.0).
+          - Some modules need to know the backend version in order to select
+            the right API. If this parameter is set, modules use it instead of
+            asking the backend for its version.
+          - It is also possible to set this parameter via the
+            I(SENSU_BACKEND_VERSION) environment variable.
+        type: str
+        version_added: 1.15.0
+      retries:
+        description:
+          - Number of times that modules retry API requests that failed
+            because of connection problems or one of the
+            I(auth.retry_statuses) statuses.
+          - Set this parameter to C(0) to disable retries.
+          - It is also possible to set this parameter via the
+            I(SENSU_RETRIES) environment variable.
+        type: int
+        default: 0
+        version_added: 1.15.0
+      retry_backoff:
+        description:
+          - Delay in seconds before the first retry. Each subsequent retry
+            doubles the delay, up to one minute.
+          - If the backend sets the C(Retry-After) header, modules wait as
+            long as the header says instead.
+          - It is also possible to set this parameter via the
+            I(SENSU_RETRY_BACKOFF) environment variable.
+        type: float
+        default: 1.0
+        version_added: 1.15.0
+      retry_jitter:
+        description:
+          - Randomize the delays between retries so that concurrent module
+            runs do not retry at the same time.
+        type: bool
+        default: true
+        version_added: 1.15.0
+      retry_statuses:
+        description:
+          - HTTP statuses that signal a transient backend problem and cause a
+            retry.
+        type: list
+        elements: int
+        default: [429, 500, 502, 503, 504]
+        version_added: 1.15.0
+      retry_idempotent_only:
+        description:
+          - Only retry requests that are safe to repeat (C(GET), C(PUT),
+            C(DELETE) and similar). Set this parameter to C(false) to also
+            retry C(POST) requests.
+        type: bool
+        default: true
+        version_added: 1.15.0
+      max_requests_per_second:
+        description:
+          - Maximal number of API requests per second that modules send to
+            the backend at I(auth.url). If this parameter is not set, the
+            request rate is not limited.
+          - All module runs on the same host with the same I(auth.cache_dir)
+            share the limit, which makes it possible to run many forks
+            without overloading the backend.
+          - It is also possible to set this parameter via the
+            I(SENSU_MAX_REQUESTS_PER_SECOND) environment variable.
+        type: float
+        version_added: 1.15.0
+      max_in_flight:
+        description:
+          - Maximal number of concurrent API requests that modules send to
+            the backend at I(auth.url). If this parameter is not set, the
+            number of concurrent requests is not limited.
+          - All module runs on the same host with the same I(auth.cache_dir)
+            share the limit.
+          - It is also possible to set this parameter via the
+            I(SENSU_MAX_IN_FLIGHT) environment variable.
+        type: int
+        version_added: 1.15.0
 """
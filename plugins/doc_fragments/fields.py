@@ -0,0 +1,24 @@
+# -*- coding: utf-8 -*-
+# Copyright: (c) 2019, XLAB Steampunk <steampunk@xlab.si>
+#
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+
+class ModuleDocFragment(object):
+    DOCUMENTATION = """
+options:
+  fields:
+    description:
+      - List of dotted paths to the object fields that the module should
+        return, for example C(metadata.name) or C(system.platform).
+      - Fields that are not present in an object are left out.
+      - Objects are trimmed down as they arrive from the backend, which keeps
+        the memory usage low when listing large collections.
+      - If not set, the module returns complete objects.
+    type: list
+    elements: str
+    version_added: 1.15.0
+"""
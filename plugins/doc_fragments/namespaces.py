@@ -0,0 +1,34 @@
+# -*- coding: utf-8 -*-
+# Copyright: (c) 2019, XLAB Steampunk <steampunk@xlab.si>
+#
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+
+class ModuleDocFragment(object):
+    DOCUMENTATION = """
+options:
+  namespaces:
+    description:
+      - List of RBAC namespaces to retrieve objects from.
+      - Takes precedence over the I(namespace) parameter.
+      - Results from all namespaces are merged into a single list.
+    type: list
+    elements: str
+    version_added: 1.15.0
+  all_namespaces:
+    description:
+      - Retrieve objects from all namespaces.
+      - Takes precedence over the I(namespace) and I(namespaces) parameters.
+    type: bool
+    default: false
+    version_added: 1.15.0
+  concurrency:
+    description:
+      - Maximum number of namespaces to retrieve objects from in parallel.
+    type: int
+    default: 4
+    version_added: 1.15.0
+"""
@@ -0,0 +1,26 @@
+# -*- coding: utf-8 -*-
+# Copyright: (c) 2019, XLAB Steampunk <steampunk@xlab.si>
+#
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+
+class ModuleDocFragment(object):
+    DOCUMENTATION = """
+options:
+  page_size:
+    description:
+      - Number of objects to fetch from the backend with a single request.
+      - If not set, all objects are fetched with a single request. Set this
+        when listing large collections to keep the backend responses small.
+    type: int
+    version_added: 1.15.0
+  max_items:
+    description:
+      - Maximum number of objects to return.
+      - If not set, all objects are returned.
+    type: int
+    version_added: 1.15.0
+"""
@@ -0,0 +1,30 @@
+# -*- coding: utf-8 -*-
+# Copyright: (c) 2019, XLAB Steampunk <steampunk@xlab.si>
+#
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+
+class ModuleDocFragment(object):
+    DOCUMENTATION = """
+options:
+  return_object:
+    description:
+      - Controls what the module returns in the I(object) key after it
+        modifies the Sensu object.
+      - C(full) fetches the object from the backend after the update, which
+        costs one additional API request.
+      - C(payload) returns the object that the module sent to the backend,
+        extended with the metadata that the backend manages (for example,
+        I(created_by)) taken from the object before the update.
+      - C(none) returns nothing.
+      - If the object did not change, the module returns the current object
+        for C(full) and C(payload) values without sending additional API
+        requests.
+    type: str
+    choices: [ full, payload, none ]
+    default: full
+    version_added: 1.15.0
+"""
@@ -0,0 +1,33 @@
+# -*- coding: utf-8 -*-
+# Copyright: (c) 2019, XLAB Steampunk <steampunk@xlab.si>
+#
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+
+class ModuleDocFragment(object):
+    DOCUMENTATION = """
+options:
+  label_selector:
+    description:
+      - Only return objects with labels that match this selector, for
+        example C(region == "us-west-1").
+      - Objects are filtered on the backend. Refer to the Sensu Go API
+        documentation at
+        U(https://docs.sensu.io/sensu-go/latest/api/#response-filtering) for
+        the selector syntax.
+    type: str
+    version_added: 1.15.0
+  field_selector:
+    description:
+      - Only return objects with fields that match this selector, for
+        example C(linux in check.subscriptions).
+      - Objects are filtered on the backend. Refer to the Sensu Go API
+        documentation at
+        U(https://docs.sensu.io/sensu-go/latest/api/#response-filtering) for
+        the selector syntax.
+    type: str
+    version_added: 1.15.0
+"""
@@ -6,9 +6,17 @@
 from __future__ import absolute_import, division, print_function
 __metaclass__ = type
 
+import json
+import tempfile
+
 from ansible.module_utils.basic import env_fallback
 
-from . import client
+from . import client, http, throttle
+
+# Clients that get_sensu_client hands out when client reuse is enabled, keyed
+# by the connection parameters. Reuse only makes sense when modules run inside
+# a long-lived process (see the controller action plugin).
+_CLIENTS = None
 
 
 SHARED_SPECS = dict(
@@ -26,8 +34,14 @@ SHARED_SPECS = dict(
                 fallback=(env_fallback, ["SENSU_PASSWORD"]),
             ),
             url=dict(
-                default="http://localhost:8080",
+                default=["http://localhost:8080"],
                 fallback=(env_fallback, ["SENSU_URL"]),
+                type="list",
+                elements="str",
+            ),
+            backend_selection=dict(
+                default="round_robin",
+                choices=["round_robin", "least_latency"],
             ),
             api_key=dict(
                 fallback=(env_fallback, ["SENSU_API_KEY"]),
@@ -42,12 +56,74 @@ SHARED_SPECS = dict(
                 fallback=(env_fallback, ["SENSU_CA_PATH"]),
                 type="path",
             ),
+            pool_size=dict(
+                default=4,
+                fallback=(env_fallback, ["SENSU_POOL_SIZE"]),
+                type="int",
+            ),
+            cache_dir=dict(
+                fallback=(env_fallback, ["SENSU_CACHE_DIR"]),
+                type="path",
+            ),
+            cache_objects=dict(
+                default=False,
+                fallback=(env_fallback, ["SENSU_CACHE_OBJECTS"]),
+                type="bool",
+            ),
+            sync_cache_ttl=dict(
+                default=0,
+                fallback=(env_fallback, ["SENSU_SYNC_CACHE_TTL"]),
+                type="int",
+            ),
+            force_refresh=dict(
+                default=False,
+                fallback=(env_fallback, ["SENSU_FORCE_REFRESH"]),
+                type="bool",
+            ),
+            backend_version=dict(
+                fallback=(env_fallback, ["SENSU_BACKEND_VERSION"]),
+            ),
+            retries=dict(
+                default=0,
+                fallback=(env_fallback, ["SENSU_RETRIES"]),
+                type="int",
+            ),
+            retry_backoff=dict(
+                default=1.0,
+                fallback=(env_fallback, ["SENSU_RETRY_BACKOFF"]),
+                type="float",
+            ),
+            retry_jitter=dict(
+                default=True,
+                type="bool",
+            ),
+            retry_statuses=dict(
+                default=[429, 500, 502, 503, 504],
+                type="list",
+                elements="int",
+            ),
+            retry_idempotent_only=dict(
+                default=True,
+                type="bool",
+            ),
+            max_requests_per_second=dict(
+                fallback=(env_fallback, ["SENSU_MAX_REQUESTS_PER_SECOND"]),
+                type="float",
+            ),
+            max_in_flight=dict(
+                fallback=(env_fallback, ["SENSU_MAX_IN_FLIGHT"]),
+                type="int",
+            ),
         ),
     ),
     state=dict(
         default="present",
         choices=["present", "absent"],
     ),
+    return_object=dict(
+        default="full",
+        choices=["full", "payload", "none"],
+    ),
     name=dict(
         required=True,
     ),
@@ -55,6 +131,18 @@ SHARED_SPECS = dict(
         default="default",
         fallback=(env_fallback, ["SENSU_NAMESPACE"]),
     ),
+    namespaces=dict(
+        type="list",
+        elements="str",
+    ),
+    all_namespaces=dict(
+        type="bool",
+        default=False,
+    ),
+    concurrency=dict(
+        type="int",
+        default=4,
+    ),
     labels=dict(
         type="dict",
         default={},
@@ -63,6 +151,18 @@ SHARED_SPECS = dict(
         type="dict",
         default={},
     ),
+    page_size=dict(
+        type="int",
+    ),
+    max_items=dict(
+        type="int",
+    ),
+    fields=dict(
+        type="list",
+        elements="str",
+    ),
+    label_selector=dict(),
+    field_selector=dict(),
     secrets=dict(
         type="list",
         elements="dict",
@@ -113,8 +213,41 @@ def get_mutation_payload(source, *wanted_params):
     return payload
 
 
-def get_sensu_client(auth):
+def enable_client_reuse():
+    global _CLIENTS
+    if _CLIENTS is None:
+        _CLIENTS = {}
+
+
+def _new_sensu_client(auth):
+    retry = None
+    if auth["retries"]:
+        retry = http.RetryPolicy(
+            auth["retries"], auth["retry_backoff"], auth["retry_jitter"],
+            auth["retry_statuses"], auth["retry_idempotent_only"],
+        )
+    limits = None
+    if auth["max_requests_per_second"] or auth["max_in_flight"]:
+        limits = throttle.Throttle(
+            ",".join(auth["url"]), auth["cache_dir"] or tempfile.gettempdir(),
+            auth["max_requests_per_second"], auth["max_in_flight"],
+        )
     return client.Client(
         auth["url"], auth["user"], auth["password"], auth["api_key"],
-        auth["verify"], auth["ca_path"],
+        auth["verify"], auth["ca_path"], auth["pool_size"], auth["cache_dir"],
+        auth["backend_version"], retry, limits, auth["backend_selection"],
+        auth["cache_objects"], auth["sync_cache_ttl"], auth["force_refresh"],
     )
+
+
+def get_sensu_client(auth):
+    if _CLIENTS is None:
+        return _new_sensu_client(auth)
+
+    key = json.dumps(auth, sort_keys=True)
+    if key not in _CLIENTS:
+        _CLIENTS[key] = _new_sensu_client(auth)
+    sensu_client = _CLIENTS[key]
+    # Prefetched collections belong to the module run that fetched them.
+    sensu_client.clear_index()
+    return sensu_client
@@ -0,0 +1,90 @@
+# -*- coding: utf-8 -*-
+# Copyright: (c) 2019, XLAB Steampunk <steampunk@xlab.si>
+#
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+__metaclass__ = type
+
+import random
+import threading
+import time
+
+
+class Balancer:
+    """
+    Spreads requests over the members of a backend cluster.
+
+    The candidates method returns backend addresses in the order in which
+    the client should try them. The round_robin strategy rotates the
+    addresses on each call, starting at a random address so that concurrent
+    module runs do not all start at the same backend. The least_latency
+    strategy prefers backends with the lowest average response time.
+
+    Backends that fail are ejected for EJECT_TIME seconds and only tried as
+    a last resort. If a cache is available, ejections are shared with other
+    module runs.
+    """
+
+    EJECT_TIME = 30
+    # Weight of the latest measurement in the average latency.
+    LATENCY_WEIGHT = 0.3
+
+    def __init__(self, addresses, strategy="round_robin", cache=None):
+        self.addresses = list(addresses)
+        self.strategy = strategy
+        self.cache = cache
+
+        self._next = random.randrange(len(self.addresses))
+        self._latency = {}
+        self._ejected = {}
+        self._lock = threading.Lock()
+
+        if cache is not None and len(self.addresses) > 1:
+            for address in self.addresses:
+                until = cache.get("ejected", address)
+                if isinstance(until, (int, float)):
+                    self._ejected[address] = until
+
+    def candidates(self):
+        with self._lock:
+            now = time.time()
+            healthy = [
+                a for a in self.addresses if self._ejected.get(a, 0) <= now
+            ]
+            ejected = sorted(
+                (a for a in self.addresses if a not in healthy),
+                key=self._ejected.get,
+            )
+
+            if self.strategy == "least_latency":
+                # Backends without measurements go first so that we get to
+                # know them.
+                healthy.sort(key=lambda a: self._latency.get(a, 0))
+            elif healthy:
+                start = self._next % len(healthy)
+                healthy = healthy[start:] + healthy[:start]
+                self._next += 1
+
+            return healthy + ejected
+
+    def report_success(self, address, latency):
+        with self._lock:
+            if address in self._latency:
+                latency = (
+                    self.LATENCY_WEIGHT * latency
+                    + (1 - self.LATENCY_WEIGHT) * self._latency[address]
+                )
+            self._latency[address] = latency
+            was_ejected = self._ejected.pop(address, None) is not None
+
+        if was_ejected and self.cache is not None:
+            self.cache.delete("ejected", address)
+
+    def report_failure(self, address):
+        until = time.time() + self.EJECT_TIME
+        with self._lock:
+            self._ejected[address] = until
+
+        if self.cache is not None and len(self.addresses) > 1:
+            self.cache.set(until, until, "ejected", address)
@@ -0,0 +1,135 @@
+# -*- coding: utf-8 -*-
+# Copyright: (c) 2019, XLAB Steampunk <steampunk@xlab.si>
+#
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+__metaclass__ = type
+
+import errno
+import hashlib
+import hmac
+import json
+import os
+import stat
+import tempfile
+import time
+
+from ansible.module_utils._text import to_bytes
+
+
+class FileCache:
+    """
+    Key-value store that persists JSON-serializable values between module
+    invocations.
+
+    Each value lives in its own file that is only accessible to the current
+    user. File names are unsalted hashes of the keys, which means that keys
+    must not contain sensitive data like passwords, since anyone who can list
+    the directory could guess them offline. Use digest to put secrets into
+    keys. Values with expiration time set are removed once they expire.
+
+    Cache is best-effort: failures to read or write the cache files are
+    treated as cache misses.
+    """
+
+    # Name of the file that holds the key for digests. Entry files have
+    # hexadecimal names, so the two never clash.
+    KEY_FILE = "hmac-key"
+
+    def __init__(self, directory):
+        self.directory = directory
+        self._key = None
+
+    def digest(self, secret):
+        """
+        Return the HMAC of the secret that is safe to use in cache keys.
+
+        The HMAC key is random and lives in a file that only the current user
+        can read. If we cannot use such a file, the key only lives as long as
+        this object does, and digests from other module runs do not match.
+        """
+        if self._key is None:
+            self._key = self._load_key() or os.urandom(32)
+        mac = hmac.new(self._key, to_bytes(secret), hashlib.sha256)
+        return mac.hexdigest()
+
+    def get(self, *key):
+        path = self._path(key)
+        try:
+            with open(path) as f:
+                entry = json.load(f)
+        except (IOError, OSError, ValueError):
+            return None
+
+        expires_at = entry.get("expires_at")
+        if expires_at is not None and expires_at <= time.time():
+            self.delete(*key)
+            return None
+        return entry.get("value")
+
+    def set(self, value, expires_at, *key):
+        try:
+            self._ensure_directory()
+            fd, tmp_path = tempfile.mkstemp(dir=self.directory)
+        except (IOError, OSError):
+            return
+
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump(dict(expires_at=expires_at, value=value), f)
+            # Rename is atomic, which means that concurrent readers always
+            # see either an old or a new version of the value.
+            os.rename(tmp_path, self._path(key))
+        except (IOError, OSError, TypeError, ValueError):
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+
+    def delete(self, *key):
+        try:
+            os.remove(self._path(key))
+        except OSError:
+            pass
+
+    def _path(self, key):
+        digest = hashlib.sha256(
+            to_bytes(json.dumps(key, separators=(",", ":"))),
+        ).hexdigest()
+        return os.path.join(self.directory, digest)
+
+    def _load_key(self):
+        path = os.path.join(self.directory, self.KEY_FILE)
+        try:
+            self._ensure_directory()
+            fd = os.open(path, os.O_RDWR | os.O_CREAT | os.O_EXCL, 0o600)
+            os.write(fd, os.urandom(32))
+            os.close(fd)
+        except (IOError, OSError):
+            pass
+
+        try:
+            fd = os.open(path, os.O_RDONLY)
+            try:
+                info = os.fstat(fd)
+                # Anyone else that can read or plant the key could guess the
+                # secrets behind our digests.
+                if (
+                    info.st_uid != os.getuid() or
+                    info.st_mode & (stat.S_IRWXG | stat.S_IRWXO)
+                ):
+                    return None
+                key = os.read(fd, 64)
+            finally:
+                os.close(fd)
+        except (IOError, OSError):
+            return None
+        return key if len(key) == 32 else None
+
+    def _ensure_directory(self):
+        try:
+            os.makedirs(self.directory, 0o700)
+        except OSError as e:
+            if e.errno != errno.EEXIST:
+                raise
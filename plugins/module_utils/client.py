@@ -11,56 +11,142 @@ try:
 except ImportError:
     from distutils import version
 
-from . import errors, http
+import threading
+import time
+
+from ansible.module_utils.six import string_types
+from ansible.module_utils.six.moves.urllib.parse import unquote
+
+from . import balancer, cache, errors, http
+
+# Marks indexed objects that were modified and need to be fetched again.
+_STALE = object()
 
 
 class Client:
     BAD_VERSION = version.StrictVersion("9999.99.99")
+    # Cached tokens that expire in less than this many seconds are refreshed
+    # before use in order to survive a module run.
+    TOKEN_EXPIRY_MARGIN = 30
+    # Backend versions only change on upgrades, so cached versions can live
+    # for quite some time.
+    VERSION_CACHE_TTL = 3600
+    # Cached objects are revalidated on every use, so their lifetime only
+    # limits the size of the cache.
+    OBJECT_CACHE_TTL = 7 * 24 * 3600
 
-    def __init__(self, address, username, password, api_key, verify, ca_path):
-        self.address = address.rstrip("/")
+    def __init__(self, address, username, password, api_key, verify, ca_path,
+                 pool_size=0, cache_dir=None, backend_version=None,
+                 retry=None, throttle=None, strategy="round_robin",
+                 cache_objects=False, sync_cache_ttl=0, force_refresh=False):
+        # Address can also be a list of addresses of the cluster members.
+        # The first one identifies the cluster in cache keys.
+        if isinstance(address, string_types):
+            address = [address]
+        addresses = [a.rstrip("/") for a in address]
+        self.address = addresses[0]
         self.username = username
         self.password = password
         self.api_key = api_key
         self.verify = verify
         self.ca_path = ca_path
+        self.retry = retry  # http.RetryPolicy or None for no retries
+        self.throttle = throttle  # throttle.Throttle or None for no limits
+
+        # Pool size of 0 disables connection reuse.
+        self.pool = None
+        if pool_size > 0:
+            self.pool = http.ConnectionPool(pool_size, verify, ca_path)
+
+        self.cache = None
+        if cache_dir:
+            self.cache = cache.FileCache(cache_dir)
+
+        self.backends = balancer.Balancer(addresses, strategy, self.cache)
+        # Object caching requires a place to store the objects.
+        self.cache_objects = cache_objects and self.cache is not None
+        # Seconds to trust that unchanged payloads still match the backend
+        # (see utils.sync). Force refresh ignores, but still updates, the
+        # sync cache.
+        self.sync_cache_ttl = sync_cache_ttl if self.cache is not None else 0
+        self.force_refresh = force_refresh
 
         self._auth_header = None  # Login when/if required
+        self._auth_lock = threading.Lock()
+        self._auth_from_cache = False
+        self._index = {}  # Prefetched collections, see index_collection
         self._version = None  # Set version only if the consumer needs it
+        if backend_version:
+            self._version = self._parse_version(backend_version)
 
     @property
     def auth_header(self):
         if not self._auth_header:
-            self._auth_header = self._login()
+            # Modules can share the client between threads. Make sure only
+            # one of them logs in.
+            with self._auth_lock:
+                if not self._auth_header:
+                    self._auth_header = self._login()
         return self._auth_header
 
+    @property
+    def connection_stats(self):
+        if self.pool is None:
+            return dict(created=0, reused=0)
+        return self.pool.stats
+
     @property
     def version(self):
         if self._version is None:
-            resp = self.get("/version")
-            if resp.status != 200:
-                raise errors.SensuError(
-                    "Version API returned status {0}".format(resp.status),
-                )
-            if resp.json is None:
-                raise errors.SensuError(
-                    "Version API did not return a valid JSON",
-                )
-            if "sensu_backend" not in resp.json:
-                raise errors.SensuError(
-                    "Version API did not return backend version",
-                )
-            try:
-                self._version = version.StrictVersion(
-                    resp.json["sensu_backend"].split("#")[0]
-                )
-            except ValueError:
-                # Backend has no version compiled in - we are probably running
-                # againts self-compiled version from git.
-                self._version = self.BAD_VERSION
+            raw_version = None
+            if self.cache is not None:
+                raw_version = self.cache.get("version", self.address)
+            if not isinstance(raw_version, string_types):
+                raw_version = self._fetch_version()
+                if self.cache is not None:
+                    self.cache.set(
+                        raw_version, time.time() + self.VERSION_CACHE_TTL,
+                        "version", self.address,
+                    )
+            self._version = self._parse_version(raw_version)
 
         return self._version
 
+    def _fetch_version(self):
+        resp = self.get("/version")
+        if resp.status != 200:
+            raise errors.SensuError(
+                "Version API returned status {0}".format(resp.status),
+            )
+        if resp.json is None:
+            raise errors.SensuError(
+                "Version API did not return a valid JSON",
+            )
+        if "sensu_backend" not in resp.json:
+            raise errors.SensuError(
+                "Version API did not return backend version",
+            )
+        return resp.json["sensu_backend"]
+
+    @classmethod
+    def _parse_version(cls, raw_version):
+        try:
+            return version.StrictVersion(raw_version.split("#")[0])
+        except ValueError:
+            # Backend has no version compiled in - we are probably running
+            # againts self-compiled version from git.
+            return cls.BAD_VERSION
+
+    def _http_kwargs(self):
+        kwargs = dict(validate_certs=self.verify, ca_path=self.ca_path)
+        if self.pool is not None:
+            kwargs["pool"] = self.pool
+        if self.retry is not None:
+            kwargs["retry"] = self.retry
+        if self.throttle is not None:
+            kwargs["throttle"] = self.throttle
+        return kwargs
+
     def _login(self):
         if self.api_key:
             return self._api_key_login()
@@ -72,11 +158,54 @@ class Client:
         # reporting will be a mess but there is not much we can do here.
         return dict(Authorization="Key {0}".format(self.api_key))
 
+    def _token_cache_key(self):
+        # Changing the password invalidates the cached token.
+        return (
+            "token", self.address, self.username,
+            self.cache.digest(self.password),
+        )
+
     def _username_password_login(self):
-        resp = http.request(
-            "GET", "{0}/auth".format(self.address), force_basic_auth=True,
+        if self.cache is None:
+            return self._token_to_header(self._fetch_token())
+
+        token = self.cache.get(*self._token_cache_key())
+        if not self._is_valid_token(token):
+            token = None
+        elif token["expires_at"] - self.TOKEN_EXPIRY_MARGIN > time.time():
+            self._auth_from_cache = True
+            return self._token_to_header(token)
+        else:
+            token = self._refresh_token(token)
+
+        if not token:
+            token = self._fetch_token()
+
+        # Refresh tokens outlive access tokens, so we keep the entry around
+        # even after the access token expires and let the backend decide
+        # when the refresh token is no longer valid.
+        if self._is_valid_token(token):
+            self.cache.set(token, None, *self._token_cache_key())
+        return self._token_to_header(token)
+
+    def _refresh_token(self, token):
+        if not token.get("refresh_token"):
+            return None
+
+        resp = self._http_request(
+            "POST", "/auth/token",
+            payload=dict(refresh_token=token["refresh_token"]),
+            headers=self._token_to_header(token),
+        )
+        if resp.status != 200 or not self._is_valid_token(resp.json):
+            # Refresh token is not valid anymore and we need to log in again.
+            return None
+        return resp.json
+
+    def _fetch_token(self):
+        resp = self._http_request(
+            "GET", "/auth", force_basic_auth=True,
             url_username=self.username, url_password=self.password,
-            validate_certs=self.verify, ca_path=self.ca_path,
         )
 
         if resp.status != 200:
@@ -94,19 +223,59 @@ class Client:
                 "Authentication call did not return access token",
             )
 
+        return resp.json
+
+    @staticmethod
+    def _is_valid_token(token):
+        return (
+            isinstance(token, dict)
+            and "access_token" in token
+            and isinstance(token.get("expires_at"), (int, float))
+        )
+
+    @staticmethod
+    def _token_to_header(token):
         return dict(
-            Authorization="Bearer {0}".format(resp.json["access_token"]),
+            Authorization="Bearer {0}".format(token["access_token"]),
         )
 
-    def request(self, method, path, payload=None):
-        url = self.address + path
-        headers = self.auth_header
+    def _http_request(self, method, path, **kwargs):
+        """
+        Send the request to one of the backends. Idempotent requests fail
+        over to the next backend if the request does not get through.
+        """
+        kwargs.update(self._http_kwargs())
+        failover = method in http.RetryPolicy.IDEMPOTENT_METHODS
+        candidates = self.backends.candidates()
+        for i, address in enumerate(candidates):
+            start = time.time()
+            try:
+                response = http.request(method, address + path, **kwargs)
+            except errors.HttpConnectionError:
+                self.backends.report_failure(address)
+                if not failover or i == len(candidates) - 1:
+                    raise
+                continue
+            self.backends.report_success(address, time.time() - start)
+            return response
 
-        response = http.request(
-            method, url, payload=payload, headers=headers,
-            validate_certs=self.verify, ca_path=self.ca_path,
+    def request(self, method, path, payload=None, headers=None):
+        response = self._http_request(
+            method, path, payload=payload,
+            headers=dict(self.auth_header, **(headers or {})),
         )
 
+        if response.status == 401 and self._auth_from_cache:
+            # Cached token was revoked on the backend. Throw it away, log in
+            # again and retry the request with a fresh token.
+            self.cache.delete(*self._token_cache_key())
+            self._auth_from_cache = False
+            self._auth_header = None
+            response = self._http_request(
+                method, path, payload=payload,
+                headers=dict(self.auth_header, **(headers or {})),
+            )
+
         if response.status in (401, 403):
             raise errors.SensuError(
                 "Authentication problem. Verify your credentials."
@@ -114,21 +283,116 @@ class Client:
 
         return response
 
-    def get(self, path):
+    def index_collection(self, path, objects):
+        """
+        Serve GET requests for objects from the collection at path from the
+        objects list instead of querying the backend.
+
+        Names of the objects that are not in the list are treated as missing
+        until the module modifies them.
+        """
+        self._index[path.rstrip("/")] = dict(
+            (self._object_name(o), o) for o in objects
+        )
+
+    @staticmethod
+    def _object_name(obj):
+        # Some objects (namespaces, for example) have no metadata.
+        if "metadata" in obj:
+            return obj["metadata"]["name"]
+        return obj["name"]
+
+    def clear_index(self):
+        self._index = {}
+
+    def _split_indexed_path(self, path):
+        collection, _sep, name = path.rpartition("/")
+        index = self._index.get(collection)
+        if index is None:
+            return None, None
+        return index, unquote(name)
+
+    def get(self, path, cache_object=False):
+        """
+        Send a GET request. Lookups of single objects can set cache_object
+        to revalidate the copy in the object cache instead of downloading the
+        object again (see _conditional_get).
+        """
+        index, name = self._split_indexed_path(path)
+        if index is not None:
+            obj = index.get(name)
+            if obj is None:
+                return http.Response(404, "")
+            if obj is not _STALE:
+                return http.Response(200, None, json=obj)
+
+        if cache_object and self.cache_objects:
+            return self._conditional_get(path)
         return self.request("GET", path)
 
+    def _object_cache_key(self, path):
+        return "object", self.address, path
+
+    def sync_cache_key(self, path):
+        return "sync", self.address, path
+
+    def _conditional_get(self, path):
+        """
+        Fetch the object at path unless the copy in the object cache is still
+        current. Backend confirms that by responding with 304 and no body to
+        a request that carries the ETag of the cached copy.
+        """
+        key = self._object_cache_key(path)
+        cached = self.cache.get(*key)
+        if not isinstance(cached, dict) or "etag" not in cached:
+            cached = None
+
+        if cached is None:
+            response = self.request("GET", path)
+        else:
+            response = self.request(
+                "GET", path, headers={"If-None-Match": cached["etag"]},
+            )
+            if response.status == 304:
+                return http.Response(
+                    200, None, json=cached["object"],
+                    headers=response.headers,
+                )
+
+        etag = response.headers.get("ETag")
+        if response.status == 200 and etag and response.json is not None:
+            self.cache.set(
+                dict(etag=etag, object=response.json),
+                time.time() + self.OBJECT_CACHE_TTL, *key
+            )
+        elif cached is not None:
+            self.cache.delete(*key)
+        return response
+
+    def _forget_object(self, path):
+        if self.cache_objects:
+            self.cache.delete(*self._object_cache_key(path))
+        if self.sync_cache_ttl:
+            self.cache.delete(*self.sync_cache_key(path))
+
     def put(self, path, payload):
+        index, name = self._split_indexed_path(path)
+        if index is not None:
+            index[name] = _STALE
+        self._forget_object(path)
         return self.request("PUT", path, payload)
 
     def delete(self, path):
+        index, name = self._split_indexed_path(path)
+        if index is not None:
+            index.pop(name, None)
+        self._forget_object(path)
         return self.request("DELETE", path)
 
     def validate_auth_data(self, username, password):
-        resp = http.request(
-            "GET", "{0}/auth/test".format(self.address),
-            force_basic_auth=True, url_username=username,
-            url_password=password, validate_certs=self.verify,
-            ca_path=self.ca_path,
+        resp = self._http_request(
+            "GET", "/auth/test", force_basic_auth=True,
+            url_username=username, url_password=password,
         )
         if resp.status not in (200, 401):
             raise errors.SensuError(
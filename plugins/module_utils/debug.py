@@ -6,40 +6,224 @@
 from __future__ import absolute_import, division, print_function
 __metaclass__ = type
 
+import atexit
+import json
 import os
+import random
 import tempfile
-from datetime import datetime
+import threading
+import time
 
+from ansible.module_utils.six import binary_type, string_types
 
-DEBUG = os.environ.get("SENSU_ANSIBLE_DEBUG", "").lower() in ["yes", "true"]
+from . import metrics
+
+LEVELS = dict(debug=10, info=20, warning=30, error=40)
+
+
+def _level_from_env(value):
+    # Values that enabled logging before we had levels enable all of them.
+    value = value.lower()
+    if value in ("yes", "true"):
+        return "debug"
+    if value in LEVELS:
+        return value
+    return None
+
+
+def _number_from_env(name, default, convert=int):
+    try:
+        return convert(os.environ.get(name, default))
+    except ValueError:
+        return default
+
+
+class Logger:
+    """
+    Log messages and API requests to a JSON lines file.
+
+    Sensu API returns fairly modest error messages (e.g. when PUT payload
+    contains unsupported parameter, the error message won't tell you which
+    one) and that makes it difficult to debug. This is why we log requests
+    together with their payloads and responses.
+
+    Each entry contains the time, level, message, and the run identifier that
+    ties together the entries (and request metrics) from the same module run.
+    Entries are buffered and written to the file in batches, when the buffer
+    fills up, when an error is logged, and when the process exits.
+
+    To keep the log size in check, the logger:
+
+      - truncates request and response bodies to max_body characters (0
+        omits the bodies),
+      - logs only the sample_rate fraction of successful requests (failed
+        requests are always logged),
+      - rotates the file once it grows over max_size bytes, keeping at most
+        backups old files around.
+
+    Logging is best-effort: failures to write the file never fail the module.
+    """
+
+    BUFFER_SIZE = 64 * 1024
+
+    def __init__(self, path, level="debug", max_body=1024, sample_rate=1.0,
+                 max_size=10 * 1024 * 1024, backups=3):
+        self.path = path
+        self.level = LEVELS[level]
+        self.max_body = max_body
+        self.sample_rate = sample_rate
+        self.max_size = max_size
+        self.backups = backups
+
+        self._buffer = []
+        self._buffer_size = 0
+        self._lock = threading.Lock()
+
+    def log(self, level, message, **fields):
+        if LEVELS[level] < self.level:
+            return
+
+        entry = dict(
+            fields, time=time.time(), level=level, run=metrics.RUN_ID,
+            pid=os.getpid(), message=message,
+        )
+        line = json.dumps(entry, sort_keys=True, default=str) + "\n"
+        with self._lock:
+            self._buffer.append(line)
+            self._buffer_size += len(line)
+            if level == "error" or self._buffer_size >= self.BUFFER_SIZE:
+                self._flush()
+
+    def log_request(self, method, url, payload, resp=None, comment=None):
+        if resp is None:
+            level, status = "error", None
+        else:
+            status = resp.status
+            level = "warning" if status >= 400 else "debug"
+            if level == "debug" and random.random() >= self.sample_rate:
+                return
+        if LEVELS[level] < self.level:
+            return  # Do not bother with the bodies
+
+        self.log(
+            level, "{0} {1} {2}".format(status or "?", method, url),
+            method=method, url=url, status=status, comment=comment,
+            payload=self.truncate(payload),
+            response=self.truncate(resp.data if resp else None),
+        )
+
+    def truncate(self, body):
+        if body is None or self.max_body <= 0:
+            return None
+        if isinstance(body, binary_type):
+            body = body.decode("utf-8", "replace")
+        elif not isinstance(body, string_types):
+            body = json.dumps(body, default=str)
+        if len(body) <= self.max_body:
+            return body
+        return "{0}... ({1} more characters)".format(
+            body[:self.max_body], len(body) - self.max_body,
+        )
+
+    def flush(self):
+        with self._lock:
+            self._flush()
+
+    def _flush(self):
+        if not self._buffer:
+            return
+
+        data = "".join(self._buffer)
+        self._buffer = []
+        self._buffer_size = 0
+        try:
+            self._rotate(len(data))
+            with open(self.path, "a") as f:
+                f.write(data)
+        except (IOError, OSError):
+            pass
+
+    def _rotate(self, incoming):
+        try:
+            size = os.path.getsize(self.path)
+        except OSError:
+            return  # Nothing to rotate
+        if size == 0 or size + incoming <= self.max_size:
+            return
+
+        if self.backups < 1:
+            os.remove(self.path)
+            return
+        for i in range(self.backups - 1, 0, -1):
+            old = "{0}.{1}".format(self.path, i)
+            if os.path.exists(old):
+                os.rename(old, "{0}.{1}".format(self.path, i + 1))
+        os.rename(self.path, self.path + ".1")
+
+
+LOGGER = None
+# Kept for backward compatibility.
+DEBUG = False
+
+
+def configure():
+    """
+    Read the logger settings from the environment.
+
+    Modules read the settings once they are imported. Modules that run
+    in-process on the controller call this function at the start and at the
+    end of each run, since every run can have a different environment.
+    Entries that the previous logger buffered are written out first.
+    """
+    global DEBUG, LOGGER
+
+    flush()
+    LOGGER = None
+    level = _level_from_env(os.environ.get("SENSU_ANSIBLE_DEBUG", ""))
+    if level:
+        LOGGER = Logger(
+            os.environ.get("SENSU_ANSIBLE_DEBUG_LOG") or os.path.join(
+                tempfile.gettempdir(), "sensu-ansible.log",
+            ),
+            level=level,
+            max_body=_number_from_env("SENSU_ANSIBLE_DEBUG_MAX_BODY", 1024),
+            sample_rate=_number_from_env(
+                "SENSU_ANSIBLE_DEBUG_SAMPLE_RATE", 1.0, float,
+            ),
+            max_size=_number_from_env(
+                "SENSU_ANSIBLE_DEBUG_MAX_SIZE", 10 * 1024 * 1024,
+            ),
+        )
+    DEBUG = LOGGER is not None
 
 
 def log(message, *args, **kwargs):
     """
-    Log message to a file (/tmp/sensu-ansible.log) at remote target
+    Log message to a file (/tmp/sensu-ansible.log by default) at remote
+    target.
 
-    Sensu API returns fairly modest error messages (e.g. when PUT payload contains
-    unsupported parameter, the error message won't tell you which one) and that
-    makes it difficult to debug. For that reason we decided to support at least
-    the most primitive type of logging: write to /tmp/sensu-ansible.log file.
-    Beware the log file resides on Ansible target and not host because this is
-    where the module gets executed.
+    Beware the log file resides on Ansible target and not host because this
+    is where the module gets executed.
 
     This function won't do anything unless target has environment variable
-    SENSU_ANSIBLE_DEBUG set to "yes". When troubleshooting, just set the env
-    variable in the playbook.
+    SENSU_ANSIBLE_DEBUG set to "yes" or to the lowest level of messages to
+    log (debug, info, warning, or error). When troubleshooting, just set the
+    env variable in the playbook.
     """
-    if DEBUG:
-        with open(os.path.join(tempfile.gettempdir(), "sensu-ansible.log"), "a") as f:
-            f.write("[{0}]: {1}\n".format(datetime.utcnow(), message.format(*args, **kwargs)))
+    if LOGGER is not None:
+        LOGGER.log("info", message.format(*args, **kwargs))
 
 
 def log_request(method, url, payload, resp=None, comment=None):
     """Log API request and response"""
-    if DEBUG:
-        if resp:
-            code, data = resp.status, resp.data
-        else:
-            code = data = "?"
-        fmt = "{0} {1} {2}\nPAYLOAD:{3}\nRESPONSE:{4}\nCOMMENT:{5}"
-        log(fmt, code, method, url, payload, data, comment)
+    if LOGGER is not None:
+        LOGGER.log_request(method, url, payload, resp, comment)
+
+
+def flush():
+    if LOGGER is not None:
+        LOGGER.flush()
+
+
+configure()
+atexit.register(flush)
@@ -15,6 +15,10 @@ class HttpError(Error):
     """ Error that signals failure in HTTP connection. """
 
 
+class HttpConnectionError(HttpError):
+    """ Error that signals that the request did not get through. """
+
+
 class SyncError(Error):
     """ Error that signals failure when syncing state with remote. """
 
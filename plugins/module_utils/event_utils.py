@@ -0,0 +1,128 @@
+# -*- coding: utf-8 -*-
+# Copyright: (c) 2019, XLAB Steampunk <steampunk@xlab.si>
+#
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+__metaclass__ = type
+
+from . import arguments, errors, utils
+
+STATUS_MAP = {
+    'ok': 0,
+    'warning': 1,
+    'critical': 2,
+    'unknown': 3,
+}
+
+CHECK_ATTRIBUTES_SPEC = dict(
+    duration=dict(
+        type='float'
+    ),
+    executed=dict(
+        type='int'
+    ),
+    history=dict(
+        type='list', elements='dict',
+    ),
+    issued=dict(
+        type='int'
+    ),
+    last_ok=dict(
+        type='int'
+    ),
+    output=dict(),
+    state=dict(
+        choices=['passing', 'failing', 'flapping']
+    ),
+    status=dict(
+        choices=['ok', 'warning', 'critical', 'unknown']
+    ),
+    total_state_change=dict(
+        type='int'
+    )
+)
+
+METRIC_ATTRIBUTES_SPEC = dict(
+    handlers=dict(
+        type='list',
+        elements='str'
+    ),
+    points=dict(
+        type='list',
+        elements='dict'
+    )
+)
+
+
+def get_check(client, namespace, check):
+    check_path = utils.build_core_v2_path(namespace, 'checks', check)
+    resp = client.get(check_path)
+    if resp.status != 200:
+        raise errors.SyncError("Check with name '{0}' does not exist on remote.".format(check))
+    return resp.json
+
+
+def get_entity(client, namespace, entity):
+    entity_path = utils.build_core_v2_path(namespace, 'entities', entity)
+    resp = client.get(entity_path)
+    if resp.status != 200:
+        raise errors.SyncError("Entity with name '{0}' does not exist on remote.".format(entity))
+    return resp.json
+
+
+def build_path(namespace, entity, check):
+    return utils.build_core_v2_path(namespace, 'events', entity, check)
+
+
+def _update_payload_with_metric_attributes(payload, metric_attributes):
+    if not metric_attributes:
+        return
+
+    payload['metrics'] = arguments.get_spec_payload(metric_attributes, *metric_attributes.keys())
+
+
+def _update_payload_with_check_attributes(payload, check_attributes):
+    if not check_attributes:
+        return
+
+    filtered_attributes = arguments.get_spec_payload(check_attributes, *check_attributes.keys())
+    if filtered_attributes.get('status'):
+        filtered_attributes['status'] = STATUS_MAP[filtered_attributes['status']]
+    payload['check'].update(filtered_attributes)
+
+
+def build_payload(namespace, params, entity, check):
+    """
+    Build the event payload from the module parameters and the entity and
+    check objects that the event belongs to.
+    """
+    payload = arguments.get_spec_payload(params, 'timestamp')
+    payload['metadata'] = dict(
+        namespace=namespace
+    )
+    payload['entity'] = entity
+    # Check attributes are merged into the check object, which can be shared
+    # between events.
+    payload['check'] = dict(check)
+
+    _update_payload_with_check_attributes(payload, params['check_attributes'])
+    _update_payload_with_metric_attributes(payload, params['metric_attributes'])
+    return payload
+
+
+def build_lean_payload(namespace, params):
+    """
+    Build the event payload that references the entity and the check by name
+    and leaves the rest of the event to the backend. We do not set the entity
+    class, since the entity can be an existing agent entity.
+    """
+    return build_payload(
+        namespace, params,
+        dict(
+            metadata=dict(name=params['entity'], namespace=namespace),
+        ),
+        dict(
+            metadata=dict(name=params['check'], namespace=namespace),
+        ),
+    )
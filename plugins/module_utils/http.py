@@ -6,7 +6,15 @@
 from __future__ import absolute_import, division, print_function
 __metaclass__ = type
 
+import base64
+import contextlib
+import errno
 import json
+import random
+import socket
+import threading
+import time
+import zlib
 
 try:
     from ssl import CertificateError
@@ -16,56 +24,525 @@ except ImportError:
     class CertificateError(Exception):
         pass
 
+try:
+    import ssl
+    HAS_SSL_CONTEXT = hasattr(ssl, "create_default_context")
+except ImportError:
+    HAS_SSL_CONTEXT = False
+
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+try:
+    import ujson
+    HAS_UJSON = True
+except ImportError:
+    HAS_UJSON = False
+
+from email.utils import mktime_tz, parsedate_tz
+
+from ansible.module_utils._text import to_bytes, to_native
+from ansible.module_utils.six.moves import http_client
 from ansible.module_utils.six.moves.urllib.error import HTTPError, URLError
+from ansible.module_utils.six.moves.urllib.parse import urlparse
+from ansible.module_utils.six.moves.urllib.request import (
+    getproxies, proxy_bypass,
+)
 from ansible.module_utils.urls import open_url
 
-from . import errors, debug
+from . import errors, debug, metrics
+
+
+if HAS_ORJSON:
+    _fast_loads = orjson.loads
+elif HAS_UJSON:
+    _fast_loads = ujson.loads
+else:
+    _fast_loads = None
+
+# Marks responses with a body that we did not parse yet.
+_UNPARSED = object()
+
+
+def _to_text(data):
+    # Python 3.5 cannot parse bytes.
+    if isinstance(data, bytes) and bytes is not str:
+        return data.decode("utf-8")
+    return data
+
+
+def parse_json(data):
+    """
+    Parse the JSON document using the fastest JSON library available.
+
+    The orjson and ujson libraries are optional. Since they reject some
+    documents that the json module from the standard library accepts (for
+    example, integers that do not fit into 64 bits), we fall back to the
+    standard library when they fail.
+    """
+    if _fast_loads is not None:
+        try:
+            return _fast_loads(data)
+        except ValueError:
+            pass
+    return json.loads(_to_text(data))
 
 
 class Response:
-    def __init__(self, status, data):
+    def __init__(self, status, data, json=None, headers=None):
         self.status = status
         self.data = data
-        self._json = None
+        self._json = _UNPARSED if json is None else json
+        # Header containers from the standard library match names in a case
+        # insensitive manner.
+        self.headers = headers or {}
 
     @property
     def json(self):
-        if self._json is None:
+        # Parse the body only once, even if it is not valid JSON.
+        if self._json is _UNPARSED:
             try:
-                self._json = json.loads(self.data)
-            except TypeError:  # Handle python 3.5 returning bytes
-                try:
-                    self._json = json.loads(self.data.decode('utf-8'))
-                except ValueError:
-                    self._json = None
-            except ValueError:  # Cannot use JSONDecodeError here (python 2)
+                self._json = parse_json(self.data)
+            except (TypeError, ValueError):
                 self._json = None
 
         return self._json
 
 
-def request(method, url, payload=None, data=None, headers=None, **kwargs):
+# Content encodings that we can decompress, in the order of preference.
+CONTENT_ENCODINGS = ("gzip", "deflate")
+ACCEPT_ENCODING = ", ".join(CONTENT_ENCODINGS)
+GZIP_MAGIC = b"\x1f\x8b"
+CHUNK_SIZE = 64 * 1024
+
+
+class Decompressor:
+    """
+    Incrementally decompresses gzip or deflate encoded response bodies.
+
+    The deflate encoding should wrap the compressed data in the zlib format,
+    but some servers send raw deflate data instead. We handle both.
+    """
+
+    def __init__(self, encoding):
+        self.encoding = encoding
+        if encoding == "gzip":
+            self._obj = zlib.decompressobj(16 + zlib.MAX_WBITS)
+        else:
+            self._obj = zlib.decompressobj()
+        self._started = False
+
+    def feed(self, chunk):
+        try:
+            data = self._obj.decompress(chunk)
+        except zlib.error:
+            if self.encoding != "deflate" or self._started:
+                raise
+            self._obj = zlib.decompressobj(-zlib.MAX_WBITS)
+            data = self._obj.decompress(chunk)
+        self._started = True
+        return data
+
+    def flush(self):
+        return self._obj.flush()
+
+
+def get_decompressor(encoding):
+    """
+    Return a decompressor for the Content-Encoding header value or None if
+    the body is not compressed.
+    """
+    encoding = (encoding or "").strip().lower()
+    if encoding not in CONTENT_ENCODINGS:
+        return None
+    return Decompressor(encoding)
+
+
+def decompress(body, encoding):
+    decompressor = get_decompressor(encoding)
+    if not body or decompressor is None:
+        return body
+    if decompressor.encoding == "gzip" and not body.startswith(GZIP_MAGIC):
+        # Recent versions of the open_url function decompress gzip encoded
+        # bodies on their own but keep the Content-Encoding header intact.
+        return body
+    return decompressor.feed(body) + decompressor.flush()
+
+
+class RetryPolicy:
+    """
+    Decides which failed requests to retry and how long to wait before that.
+
+    Requests that did not get through and requests that failed with one of
+    the retryable statuses are retried at most retries times. Delays grow
+    exponentially from the backoff value (in seconds) and are randomized if
+    jitter is enabled. Delays that the backend requests in the Retry-After
+    header take precedence.
+    """
+
+    IDEMPOTENT_METHODS = ("GET", "HEAD", "OPTIONS", "PUT", "DELETE")
+    MAX_DELAY = 60
+
+    def __init__(self, retries, backoff=1.0, jitter=True,
+                 statuses=(429, 500, 502, 503, 504), idempotent_only=True):
+        self.retries = retries
+        self.backoff = backoff
+        self.jitter = jitter
+        self.statuses = tuple(statuses)
+        self.idempotent_only = idempotent_only
+
+    def should_retry(self, method, attempt, status=None):
+        if attempt >= self.retries:
+            return False
+        if self.idempotent_only and method not in self.IDEMPOTENT_METHODS:
+            return False
+        return status is None or status in self.statuses
+
+    def delay(self, attempt, retry_after=None):
+        delay = self._parse_retry_after(retry_after)
+        if delay is None:
+            delay = self.backoff * 2 ** attempt
+            if self.jitter:
+                delay = random.uniform(0, delay)
+        return max(0, min(delay, self.MAX_DELAY))
+
+    @staticmethod
+    def _parse_retry_after(value):
+        # Retry-After contains either a number of seconds or a date.
+        if not value:
+            return None
+        try:
+            return float(value)
+        except ValueError:
+            pass
+        date = parsedate_tz(value)
+        if date is None:
+            return None
+        return mktime_tz(date) - time.time()
+
+
+class ConnectionPool:
+    """
+    Pool of keep-alive HTTP/1.1 connections.
+
+    The open_url function from Ansible creates a new connection (and performs
+    a new TLS handshake) for each request it sends. Pool keeps at most size
+    idle connections for each scheme, host, and port combination around and
+    reuses them for subsequent requests.
+
+    Pool decompresses gzip and deflate encoded response bodies while reading
+    them. The created and reused attributes count the connections that the
+    pool opened and reused, respectively.
+    """
+
+    def __init__(self, size, validate_certs=True, ca_path=None, timeout=10):
+        self.size = size
+        self.validate_certs = validate_certs
+        self.ca_path = ca_path
+        self.timeout = timeout
+
+        self.created = 0
+        self.reused = 0
+
+        self._idle = {}
+        self._lock = threading.Lock()
+        self._ssl_context = None
+
+    @property
+    def stats(self):
+        return dict(created=self.created, reused=self.reused)
+
+    def can_handle(self, url):
+        parts = urlparse(url)
+        if parts.scheme not in ("http", "https"):
+            return False
+        if parts.scheme == "https" and not HAS_SSL_CONTEXT:
+            return False
+        # Leave proxied requests to the open_url function since it already
+        # knows how to deal with all sorts of proxy configurations.
+        return not (
+            parts.scheme in getproxies() and not proxy_bypass(parts.hostname)
+        )
+
+    def request(self, method, url, data=None, headers=None, timings=None):
+        """
+        Send the request and return the status, reason, body, and headers of
+        the response. If the timings dict is set, the pool stores the
+        durations of the request phases in it.
+        """
+        timings = {} if timings is None else timings
+        parts = urlparse(url)
+        key = (parts.scheme, parts.hostname, parts.port)
+        target = parts.path or "/"
+        if parts.query:
+            target += "?" + parts.query
+
+        conn, reused = self._acquire(key)
+        timings["reused"] = reused
+        try:
+            raw_resp = self._send(conn, method, target, data, headers, timings)
+        except (http_client.HTTPException, socket.error) as e:
+            conn.close()
+            if not reused or not _is_closed_connection_error(e):
+                raise
+            # Backend closed the idle connection on us before it sent any
+            # response. This is how idle connections end, so we try one more
+            # time with a fresh connection.
+            conn, reused = self._new_connection(key), False
+            timings["reused"] = reused
+            timings["retries"] = timings.get("retries", 0) + 1
+            try:
+                raw_resp = self._send(
+                    conn, method, target, data, headers, timings,
+                )
+            except Exception:
+                conn.close()
+                raise
+
+        start = time.time()
+        try:
+            body = self._read(raw_resp)
+        except Exception:
+            conn.close()
+            raise
+        timings["body"] = time.time() - start
+
+        if raw_resp.will_close:
+            conn.close()
+        else:
+            self._release(key, conn)
+
+        return raw_resp.status, raw_resp.reason, body, raw_resp.msg
+
+    def close(self):
+        with self._lock:
+            for conns in self._idle.values():
+                for conn in conns:
+                    conn.close()
+            self._idle = {}
+
+    def _acquire(self, key):
+        with self._lock:
+            conns = self._idle.get(key)
+            if conns:
+                self.reused += 1
+                return conns.pop(), True
+        return self._new_connection(key), False
+
+    def _release(self, key, conn):
+        with self._lock:
+            conns = self._idle.setdefault(key, [])
+            if len(conns) < self.size:
+                conns.append(conn)
+                return
+        conn.close()
+
+    def _new_connection(self, key):
+        scheme, host, port = key
+        with self._lock:
+            self.created += 1
+
+        if scheme == "http":
+            return http_client.HTTPConnection(
+                host, port=port, timeout=self.timeout,
+            )
+        return http_client.HTTPSConnection(
+            host, port=port, timeout=self.timeout,
+            context=self._get_ssl_context(),
+        )
+
+    def _get_ssl_context(self):
+        if self._ssl_context is None:
+            if self.validate_certs:
+                context = ssl.create_default_context(cafile=self.ca_path)
+            else:
+                context = ssl.create_default_context()
+                context.check_hostname = False
+                context.verify_mode = ssl.CERT_NONE
+            self._ssl_context = context
+        return self._ssl_context
+
+    @staticmethod
+    def _read(raw_resp):
+        decompressor = get_decompressor(raw_resp.msg.get("Content-Encoding"))
+        if decompressor is None:
+            return raw_resp.read()
+
+        chunks = []
+        while True:
+            chunk = raw_resp.read(CHUNK_SIZE)
+            if not chunk:
+                break
+            chunks.append(decompressor.feed(chunk))
+        chunks.append(decompressor.flush())
+        return b"".join(chunks)
+
+    @staticmethod
+    def _send(conn, method, target, data, headers, timings):
+        start = time.time()
+        if conn.sock is None:
+            # Connect explicitly so that we can tell connection setup and
+            # request processing apart.
+            conn.connect()
+            timings["connect"] = time.time() - start
+            start = time.time()
+        conn.request(method, target, body=data, headers=headers or {})
+        resp = conn.getresponse()
+        timings["first_byte"] = time.time() - start
+        return resp
+
+
+# Python 3 raises this one when the server closes the connection without
+# sending a response. Python 2 raises BadStatusLine with an empty line.
+_REMOTE_DISCONNECTED = getattr(http_client, "RemoteDisconnected", ())
+_CLOSED_CONNECTION_ERRNOS = (errno.ECONNRESET, errno.EPIPE, errno.ECONNABORTED)
+
+
+def _is_closed_connection_error(e):
+    """
+    Return True if the error means that the peer closed the connection
+    before responding. Timeouts and other errors are not retried, since the
+    backend might have processed the request already.
+    """
+    if isinstance(e, socket.timeout):
+        return False
+    if isinstance(e, _REMOTE_DISCONNECTED):
+        return True
+    if isinstance(e, http_client.BadStatusLine):
+        return e.line in ("", "''")
+    return getattr(e, "errno", None) in _CLOSED_CONNECTION_ERRNOS
+
+
+def _basic_auth_header(username, password):
+    credentials = to_bytes("{0}:{1}".format(username, password or ""))
+    return "Basic {0}".format(to_native(base64.b64encode(credentials)))
+
+
+def _pool_request(pool, method, url, data, headers, timings,
+                  force_basic_auth=False, url_username=None,
+                  url_password=None, **kwargs):
+    # Parameters that are relevant for the open_url function only (e.g.
+    # validate_certs and ca_path) are already part of the pool configuration.
+    headers = dict(headers or {})
+    if force_basic_auth and url_username is not None:
+        headers["Authorization"] = _basic_auth_header(url_username, url_password)
+    if data is not None:
+        data = to_bytes(data)
+
+    status, reason, body, resp_headers = pool.request(
+        method, url, data, headers, timings=timings,
+    )
+    if status >= 400:
+        # Mimic the open_url behavior that raises HTTPError on such statuses.
+        return Response(status, reason, headers=resp_headers)
+    return Response(status, body, headers=resp_headers)
+
+
+@contextlib.contextmanager
+def _unthrottled():
+    yield
+
+
+def request(method, url, payload=None, data=None, headers=None, pool=None,
+            retry=None, throttle=None, **kwargs):
     if payload is not None:
         data = json.dumps(payload, separators=(",", ":"))
         headers = dict(headers or {}, **{"content-type": "application/json"})
+    headers = dict(headers or {}, **{"accept-encoding": ACCEPT_ENCODING})
+
+    timings = {}
+    started = time.time()
+    attempt = 0
+    while True:
+        try:
+            with throttle.slot() if throttle else _unthrottled():
+                resp = _request(
+                    method, url, payload, data, headers, pool, timings,
+                    **kwargs
+                )
+        except errors.HttpError as e:
+            retry_request = (
+                retry is not None
+                and isinstance(e, errors.HttpConnectionError)
+                and retry.should_retry(method, attempt)
+            )
+            if not retry_request:
+                metrics.record(
+                    method, url, None, started, timings, data, None,
+                    error=str(e),
+                )
+                raise
+            delay = retry.delay(attempt)
+        else:
+            if retry is None or not retry.should_retry(
+                method, attempt, resp.status,
+            ):
+                metrics.record(
+                    method, url, resp.status, started, timings, data,
+                    resp.data,
+                )
+                return resp
+            delay = retry.delay(attempt, resp.headers.get("Retry-After"))
+
+        debug.log("Retrying {0} {1} in {2:.2f} s", method, url, delay)
+        attempt += 1
+        timings["retries"] = timings.get("retries", 0) + 1
+        time.sleep(delay)
+
+
+def _request(method, url, payload, data, headers, pool, timings, **kwargs):
+    if pool and pool.can_handle(url):
+        try:
+            resp = _pool_request(
+                pool, method, url, data, headers, timings, **kwargs
+            )
+            debug.log_request(method, url, payload, resp)
+            return resp
+        except CertificateError as e:
+            raise errors.HttpError("Certificate error: {0}".format(e))
+        except zlib.error as e:
+            raise errors.HttpError(
+                "Cannot decompress response body: {0}".format(e),
+            )
+        except (http_client.HTTPException, socket.error) as e:
+            debug.log_request(method, url, payload, comment=str(e))
+            raise errors.HttpConnectionError(
+                "{0} request failed: {1}".format(method, e),
+            )
 
     try:
+        start = time.time()
         raw_resp = open_url(
             method=method, url=url, data=data, headers=headers, **kwargs
         )
-        resp = Response(raw_resp.getcode(), raw_resp.read())
+        # The open_url function hides the connection setup from us.
+        timings["first_byte"] = time.time() - start
+        start = time.time()
+        headers = raw_resp.info()
+        body = decompress(
+            raw_resp.read(), headers and headers.get("Content-Encoding"),
+        )
+        timings["body"] = time.time() - start
+        resp = Response(raw_resp.getcode(), body, headers=headers)
         debug.log_request(method, url, payload, resp)
         return resp
     except HTTPError as e:
         # This is not an error, since client consumers might be able to
         # work around/expect non 20x codes.
-        resp = Response(e.code, e.reason)
+        resp = Response(e.code, e.reason, headers=e.headers)
         debug.log_request(method, url, payload, resp)
         return resp
     except URLError as e:
         debug.log_request(method, url, payload, comment=e.reason)
-        raise errors.HttpError(
+        raise errors.HttpConnectionError(
             "{0} request failed: {1}".format(method, e.reason),
         )
     except CertificateError as e:
         raise errors.HttpError("Certificate error: {0}".format(e))
+    except zlib.error as e:
+        raise errors.HttpError(
+            "Cannot decompress response body: {0}".format(e),
+        )
@@ -0,0 +1,42 @@
+# -*- coding: utf-8 -*-
+# Copyright: (c) 2019, XLAB Steampunk <steampunk@xlab.si>
+#
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+__metaclass__ = type
+
+from . import utils
+
+
+def get_namespaces(client, params):
+    if params.get("all_namespaces"):
+        path = utils.build_core_v2_path(None, "namespaces")
+        return [n["name"] for n in utils.iter_objects(client, path)]
+    if params.get("namespaces"):
+        return params["namespaces"]
+    return [params["namespace"]]
+
+
+def list_objects(client, paths, params, convert=None):
+    """
+    Fetch objects from all paths and return them in a single list.
+
+    Paths are processed concurrently if the concurrency parameter is set.
+    Objects are converted using the convert function (if set) and trimmed down
+    to the requested fields as they arrive. The page_size, max_items, and
+    fields parameters are taken from the module parameters.
+    """
+    def fetch(path):
+        return [
+            utils.project(convert(o) if convert else o, params.get("fields"))
+            for o in utils.iter_objects(
+                client, path, params.get("page_size"), params.get("max_items"),
+            )
+        ]
+
+    chunks = utils.map_concurrently(fetch, paths, params.get("concurrency") or 1)
+    objects = [o for chunk in chunks for o in chunk]
+    if params.get("max_items"):
+        return objects[:params["max_items"]]
+    return objects
@@ -0,0 +1,129 @@
+# -*- coding: utf-8 -*-
+# Copyright: (c) 2019, XLAB Steampunk <steampunk@xlab.si>
+#
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+__metaclass__ = type
+
+import atexit
+import json
+import os
+import threading
+import time
+import uuid
+
+# Identifies the requests that belong to the same module run.
+RUN_ID = uuid.uuid4().hex
+
+PHASES = ("connect", "first_byte", "body", "total")
+
+
+class Recorder:
+    """
+    Write request metrics to a JSON lines file.
+
+    Each API request produces one entry with its status, body sizes, and the
+    time spent in each of the phases:
+
+      connect    - resolving the address and opening (TCP and TLS) a new
+                   connection; missing if the request reused a connection,
+      first_byte - sending the request and waiting for the response headers,
+      body       - reading the response body,
+      total      - the whole request, including retries.
+
+    When the process exits, the recorder appends a summary of all requests
+    from the module run. Writing is best-effort: failures to write the file
+    never fail the module.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.summary = dict(
+            requests=0, errors=0, retries=0, request_bytes=0,
+            response_bytes=0, timings=dict((p, 0.0) for p in PHASES),
+        )
+        self._lock = threading.Lock()
+
+    def record(self, method, url, status, started, timings, request_body,
+               response_body, error=None):
+        timings = dict(timings, total=time.time() - started)
+        entry = dict(
+            type="request", run=RUN_ID, time=started, method=method, url=url,
+            status=status, error=error, retries=timings.pop("retries", 0),
+            reused=timings.pop("reused", None),
+            request_bytes=len(request_body or ""),
+            response_bytes=len(response_body or ""),
+            timings=dict((k, round(v, 6)) for k, v in timings.items()),
+        )
+
+        with self._lock:
+            self.summary["requests"] += 1
+            self.summary["errors"] += int(error is not None)
+            self.summary["retries"] += entry["retries"]
+            self.summary["request_bytes"] += entry["request_bytes"]
+            self.summary["response_bytes"] += entry["response_bytes"]
+            for phase, duration in timings.items():
+                self.summary["timings"][phase] += duration
+            self._write(entry)
+
+    def write_summary(self):
+        with self._lock:
+            if self.summary["requests"]:
+                self._write(dict(
+                    self.summary, type="summary", run=RUN_ID, time=time.time(),
+                    timings=dict(
+                        (k, round(v, 6))
+                        for k, v in self.summary["timings"].items()
+                    ),
+                ))
+
+    def _write(self, entry):
+        try:
+            with open(self.path, "a") as f:
+                f.write(json.dumps(entry, sort_keys=True) + "\n")
+        except (IOError, OSError):
+            pass
+
+
+RECORDER = None
+
+
+def configure():
+    """
+    Start a new module run and read the settings from the environment.
+
+    Modules read the settings once they are imported. Modules that run
+    in-process on the controller call this function at the start and at the
+    end of each run, since every run can have a different environment. The
+    SENSU_ANSIBLE_METRICS environment variable holds the path to the JSON
+    lines file that receives request metrics.
+    """
+    global RECORDER, RUN_ID
+
+    finish()
+    RUN_ID = uuid.uuid4().hex
+    path = os.environ.get("SENSU_ANSIBLE_METRICS")
+    RECORDER = Recorder(path) if path else None
+
+
+def finish():
+    """Write the summary of the current module run."""
+    global RECORDER
+
+    if RECORDER is not None:
+        RECORDER.write_summary()
+        RECORDER = None
+
+
+configure()
+atexit.register(finish)
+
+
+def record(method, url, status, started, timings, request_body,
+           response_body, error=None):
+    if RECORDER is not None:
+        RECORDER.record(
+            method, url, status, started, timings, request_body,
+            response_body, error,
+        )
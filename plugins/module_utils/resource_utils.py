@@ -0,0 +1,227 @@
+# -*- coding: utf-8 -*-
+# Copyright: (c) 2019, XLAB Steampunk <steampunk@xlab.si>
+#
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+__metaclass__ = type
+
+from . import arguments, role_utils, utils
+
+
+def do_sets_differ(current, desired, key):
+    return set(current.get(key) or []) != set(desired.get(key) or [])
+
+
+def do_proxy_requests_differ(current, desired):
+    if 'proxy_requests' not in desired:
+        return False
+
+    current = current.get('proxy_requests') or {}
+    desired = desired['proxy_requests']
+
+    return (
+        (
+            'entity_attributes' in desired and
+            do_sets_differ(current, desired, 'entity_attributes')
+        ) or
+        utils.do_differ(current, desired, 'entity_attributes')
+    )
+
+
+def do_check_hooks_differ(current, desired):
+    if 'check_hooks' not in desired:
+        return False
+
+    current = utils.single_item_dicts_to_dict(current.get('check_hooks') or [])
+    current = dict((k, set(v)) for k, v in current.items())
+
+    desired = utils.single_item_dicts_to_dict(desired['check_hooks'])
+    desired = dict((k, set(v)) for k, v in desired.items())
+
+    return current != desired
+
+
+# Check and entity keys that comparators treat as sets. Sync fingerprints
+# must ignore the order of their items as well.
+CHECK_SET_KEYS = (
+    'subscriptions', 'handlers', 'runtime_assets', 'output_metric_handlers',
+    'env_vars',
+)
+ENTITY_SET_KEYS = ('subscriptions',)
+
+
+def do_check_differ(current, desired):
+    return (
+        utils.do_differ(
+            current, desired, 'proxy_requests', 'check_hooks', 'secrets',
+            *CHECK_SET_KEYS
+        ) or
+        utils.do_secrets_differ(current, desired) or
+        do_proxy_requests_differ(current, desired) or
+        do_check_hooks_differ(current, desired) or
+        any(do_sets_differ(current, desired, k) for k in CHECK_SET_KEYS)
+    )
+
+
+def _build_set(builds):
+    return set((
+        b.get('sha512'),
+        b.get('url'),
+        frozenset((b.get('headers', {}) or {}).items()),
+        frozenset(b.get('filters', []) or []),
+    ) for b in builds)
+
+
+def _do_builds_differ(current, desired):
+    # Since Sensu Go 5.16, the web API returns builds: None if the asset
+    # in question is a deprecated, single-build asset.
+    if current is None:
+        return True
+
+    if len(current) != len(desired):
+        return True
+
+    return _build_set(current) != _build_set(desired)
+
+
+def do_asset_differ(current, desired):
+    # Single-build assets do not have builds.
+    if 'builds' not in desired:
+        return utils.do_differ(current, desired)
+
+    if _do_builds_differ(current.get('builds'), desired['builds']):
+        return True
+
+    return utils.do_differ(current, desired, 'builds')
+
+
+def do_entity_differ(current, desired):
+    system = desired.get('system')
+    if system and utils.do_differ(current.get('system'), system):
+        return True
+
+    subs = desired.get('subscriptions')
+    if subs is not None and set(subs) != set(current.get('subscriptions', [])):
+        return True
+
+    return utils.do_differ(current, desired, 'system', *ENTITY_SET_KEYS)
+
+
+def do_secrets_aware_differ(current, desired):
+    return (
+        utils.do_differ(current, desired, 'secrets') or
+        utils.do_secrets_differ(current, desired)
+    )
+
+
+# Resource kinds that can be managed in bulk. Keys are the types that Sensu Go
+# uses to identify resources (the same ones sensuctl uses). Comparators are the
+# same ones the dedicated modules use. Kinds with metadata set to False have
+# no metadata (and thus no labels and annotations), just a name.
+KINDS = dict(
+    Asset=dict(
+        api_group='core', api_version='v2', collection='assets',
+        namespaced=True, compare=do_asset_differ,
+    ),
+    CheckConfig=dict(
+        api_group='core', api_version='v2', collection='checks',
+        namespaced=True, compare=do_check_differ, set_keys=CHECK_SET_KEYS,
+    ),
+    ClusterRole=dict(
+        api_group='core', api_version='v2', collection='clusterroles',
+        namespaced=False, compare=role_utils.do_roles_differ,
+    ),
+    ClusterRoleBinding=dict(
+        api_group='core', api_version='v2', collection='clusterrolebindings',
+        namespaced=False, compare=role_utils.do_role_bindings_differ,
+    ),
+    Entity=dict(
+        api_group='core', api_version='v2', collection='entities',
+        namespaced=True, compare=do_entity_differ, set_keys=ENTITY_SET_KEYS,
+    ),
+    EventFilter=dict(
+        api_group='core', api_version='v2', collection='filters',
+        namespaced=True, compare=utils.do_differ,
+    ),
+    Handler=dict(
+        api_group='core', api_version='v2', collection='handlers',
+        namespaced=True, compare=do_secrets_aware_differ,
+    ),
+    HookConfig=dict(
+        api_group='core', api_version='v2', collection='hooks',
+        namespaced=True, compare=utils.do_differ,
+    ),
+    Mutator=dict(
+        api_group='core', api_version='v2', collection='mutators',
+        namespaced=True, compare=do_secrets_aware_differ,
+    ),
+    Namespace=dict(
+        api_group='core', api_version='v2', collection='namespaces',
+        namespaced=False, compare=utils.do_differ, metadata=False,
+    ),
+    Role=dict(
+        api_group='core', api_version='v2', collection='roles',
+        namespaced=True, compare=role_utils.do_roles_differ,
+    ),
+    RoleBinding=dict(
+        api_group='core', api_version='v2', collection='rolebindings',
+        namespaced=True, compare=role_utils.do_role_bindings_differ,
+    ),
+    Secret=dict(
+        api_group='enterprise', api_version='secrets/v1',
+        collection='secrets', namespaced=True, compare=utils.do_differ_v1,
+    ),
+    Silenced=dict(
+        api_group='core', api_version='v2', collection='silenced',
+        namespaced=True, compare=utils.do_differ,
+    ),
+)
+
+
+def is_v1(kind):
+    return KINDS[kind]['api_version'] != 'v2'
+
+
+def has_metadata(kind):
+    return KINDS[kind].get('metadata', True)
+
+
+def build_path(kind, namespace, name):
+    info = KINDS[kind]
+    return utils.build_url_path(
+        info['api_group'], info['api_version'],
+        namespace if info['namespaced'] else None, info['collection'], name,
+    )
+
+
+def build_payload(kind, name, namespace, spec, labels=None, annotations=None):
+    spec = spec or {}
+    if not has_metadata(kind):
+        return dict(spec, name=name)
+
+    source = dict(spec, name=name, labels=labels, annotations=annotations)
+    if KINDS[kind]['namespaced']:
+        source['namespace'] = namespace
+
+    if not is_v1(kind):
+        return arguments.get_mutation_payload(source, *spec.keys())
+
+    # Enterprise APIs expect resources in the sensuctl format.
+    return dict(
+        type=kind,
+        api_version=KINDS[kind]['api_version'],
+        metadata=arguments.get_mutation_payload(source)['metadata'],
+        spec=spec,
+    )
+
+
+def sync(state, client, kind, name, namespace, spec, check_mode,
+         labels=None, annotations=None, return_object='full'):
+    path = build_path(kind, namespace, name)
+    payload = build_payload(kind, name, namespace, spec, labels, annotations)
+    sync_func = utils.sync_v1 if is_v1(kind) else utils.sync
+    return sync_func(
+        state, client, path, payload, check_mode, KINDS[kind]['compare'],
+        return_object, set_keys=KINDS[kind].get('set_keys', ()),
+    )
@@ -0,0 +1,152 @@
+# -*- coding: utf-8 -*-
+# Copyright: (c) 2019, XLAB Steampunk <steampunk@xlab.si>
+#
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+__metaclass__ = type
+
+import contextlib
+import errno
+import hashlib
+import json
+import os
+import threading
+import time
+
+try:
+    import fcntl
+    HAS_FCNTL = True
+except ImportError:
+    HAS_FCNTL = False
+
+from ansible.module_utils._text import to_bytes
+
+# Fallback coordination for systems without fcntl. Limits only apply to
+# threads in the current process there.
+_LOCAL_LOCK = threading.Lock()
+_LOCAL_BUCKETS = {}
+_LOCAL_SLOTS = {}
+
+
+class Throttle:
+    """
+    Limits the rate of requests and the number of requests in flight.
+
+    All processes that use the same directory and key (backend address)
+    share the limits. Rate is limited using a token bucket that lives in a
+    file and allows for bursts of up to rate requests. Each request in
+    flight holds a lock on one of the max_in_flight slot files. The
+    operating system releases the locks of processes that die, so crashed
+    module runs never leak slots.
+
+    Throttling is best-effort: if the state files are not accessible,
+    requests are not limited.
+    """
+
+    POLL_INTERVAL = 0.05
+
+    def __init__(self, key, directory, rate=None, max_in_flight=None):
+        self.directory = directory
+        self.rate = rate
+        self.burst = max(1.0, rate or 0)
+        self.max_in_flight = max_in_flight
+
+        digest = hashlib.sha256(to_bytes(key)).hexdigest()[:16]
+        self.prefix = os.path.join(directory, "throttle-" + digest)
+
+    @contextlib.contextmanager
+    def slot(self):
+        """
+        Wait until the limits allow for one more request and hold on to the
+        in-flight slot until the block ends.
+        """
+        delay = self._reserve_token()
+        if delay > 0:
+            time.sleep(delay)
+        release = self._acquire_slot()
+        try:
+            yield
+        finally:
+            release()
+
+    def _reserve_token(self):
+        """
+        Take a token from the bucket and return the time to wait before the
+        token becomes valid.
+        """
+        if not self.rate:
+            return 0
+
+        now = time.time()
+        try:
+            with self._locked_state() as state:
+                tokens = min(
+                    self.burst,
+                    state.get("tokens", self.burst)
+                    + (now - state.get("updated", now)) * self.rate,
+                ) - 1
+                state.update(tokens=tokens, updated=now)
+        except (IOError, OSError):
+            return 0
+        return max(0, -tokens / self.rate)
+
+    @contextlib.contextmanager
+    def _locked_state(self):
+        if not HAS_FCNTL:
+            with _LOCAL_LOCK:
+                yield _LOCAL_BUCKETS.setdefault(self.prefix, {})
+            return
+
+        self._ensure_directory()
+        with open(self.prefix + ".bucket", "a+") as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            f.seek(0)
+            try:
+                state = json.loads(f.read() or "{}")
+            except ValueError:
+                state = {}  # Start over if the state file is corrupted
+            yield state
+            f.seek(0)
+            f.truncate()
+            f.write(json.dumps(state))
+
+    def _acquire_slot(self):
+        """
+        Wait for a free slot and return a function that releases it.
+        """
+        if not self.max_in_flight:
+            return lambda: None
+
+        if not HAS_FCNTL:
+            with _LOCAL_LOCK:
+                semaphore = _LOCAL_SLOTS.setdefault(
+                    self.prefix, threading.Semaphore(self.max_in_flight),
+                )
+            semaphore.acquire()
+            return semaphore.release
+
+        try:
+            self._ensure_directory()
+        except OSError:
+            return lambda: None
+
+        while True:
+            for i in range(self.max_in_flight):
+                try:
+                    f = open("{0}.slot{1}".format(self.prefix, i), "a")
+                except (IOError, OSError):
+                    return lambda: None
+                try:
+                    fcntl.flock(f, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                    return f.close  # Closing the file releases the lock
+                except (IOError, OSError):
+                    f.close()
+            time.sleep(self.POLL_INTERVAL)
+
+    def _ensure_directory(self):
+        try:
+            os.makedirs(self.directory, 0o700)
+        except OSError as e:
+            if e.errno != errno.EEXIST:
+                raise
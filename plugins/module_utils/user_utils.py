@@ -0,0 +1,235 @@
+# -*- coding: utf-8 -*-
+# Copyright: (c) 2019, Paul Arthur <paul.arthur@flowerysong.com>
+# Copyright: (c) 2019, XLAB Steampunk <steampunk@xlab.si>
+#
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+__metaclass__ = type
+
+import time
+import traceback
+
+from ansible.module_utils.basic import missing_required_lib
+
+from . import arguments, errors, utils
+
+try:
+    import bcrypt
+    HAS_BCRYPT = True
+    BCRYPT_IMPORT_ERROR = None
+except ImportError:
+    HAS_BCRYPT = False
+    BCRYPT_IMPORT_ERROR = traceback.format_exc()
+
+
+def build_payload(params):
+    payload = arguments.get_spec_payload(
+        params, 'password', 'password_hash', 'groups',
+    )
+    payload['username'] = params['name']
+    payload['disabled'] = params['state'] == 'disabled'
+    return payload
+
+
+def _simulate_backend_response(payload):
+    # Backend does not return back any password-related information for now.
+    masked_keys = ('password', 'password_hash')
+    return dict(
+        (k, v) for k, v in payload.items() if k not in masked_keys
+    )
+
+
+def hash_password(password):
+    # Raise exception if BCRYPT library is not present on host.
+    if not HAS_BCRYPT:
+        raise errors.RequirementsError(missing_required_lib('bcrypt'))
+    return bcrypt.hashpw(
+        password.encode('utf-8'), bcrypt.gensalt(),
+    ).decode('ascii')
+
+
+def password_cache_key(cache, address, username, password):
+    """
+    Return the cache key for the password that is known to be valid. Keys
+    contain the HMAC of the password and not the password itself.
+    """
+    return (
+        'verified_password', address.rstrip('/'), username,
+        cache.digest(password),
+    )
+
+
+def remember_password(client, username, password, cache_ttl):
+    if cache_ttl and client.cache is not None:
+        client.cache.set(
+            True, time.time() + cache_ttl,
+            *password_cache_key(
+                client.cache, client.address, username, password,
+            )
+        )
+
+
+def update_password(client, path, username, password, check_mode,
+                    password_hash=None, cache_ttl=0):
+    # Passwords that we verified recently are most likely still valid. This
+    # saves us from an expensive bcrypt check on the backend.
+    if cache_ttl and client.cache is not None and client.cache.get(
+        *password_cache_key(
+            client.cache, client.address, username, password,
+        )
+    ):
+        return False
+
+    # Hit the auth testing API and try to validate the credentials. If the API
+    # says they are invalid, we need to update them.
+    if client.validate_auth_data(username, password):
+        remember_password(client, username, password, cache_ttl)
+        return False
+
+    if not check_mode:
+        if client.version < "5.21.0":
+            utils.put(client, path + '/password', dict(
+                username=username, password=password,
+            ))
+        else:
+            # The action plugin hashes the password on the controller if it
+            # can. Otherwise, we need to hash it here.
+            utils.put(client, path + '/reset_password', dict(
+                username=username,
+                password_hash=password_hash or hash_password(password),
+            ))
+        remember_password(client, username, password, cache_ttl)
+
+    return True
+
+
+def update_password_hash(client, path, username, password_hash, check_mode):
+    # Some older Sensu Go versions do not have support for password hashes.
+    if client.version < "5.21.0":
+        raise errors.SensuError(
+            "Sensu Go < 5.21.0 does not support password hashes"
+        )
+
+    # Insert change detection here once we can receive password hash from the
+    # backend. Up until then, we always update passwords.
+
+    if not check_mode:
+        utils.put(client, path + '/reset_password', dict(
+            username=username, password_hash=password_hash,
+        ))
+
+    return True
+
+
+def update_groups(client, path, old_groups, new_groups, check_mode,
+                  concurrency=1):
+    to_delete = set(old_groups).difference(new_groups)
+    to_add = set(new_groups).difference(old_groups)
+
+    def apply(change):
+        add, group = change
+        if add:
+            utils.put(client, path + '/groups/' + group, None)
+        else:
+            utils.delete(client, path + '/groups/' + group)
+
+    if not check_mode:
+        # Group changes are independent of each other, so we apply them in
+        # parallel. This is far from atomic, which means that we can leave a
+        # user in any of the intermediate states, but this is the best we can
+        # do given the API limitations.
+        utils.map_concurrently(
+            apply,
+            [(True, g) for g in sorted(to_add)]
+            + [(False, g) for g in sorted(to_delete)],
+            concurrency,
+        )
+
+    return len(to_delete) + len(to_add) > 0
+
+
+def update_state(client, path, old_disabled, new_disabled, check_mode):
+    changed = old_disabled != new_disabled
+
+    if not check_mode and changed:
+        if new_disabled:  # `state: disabled` input parameter
+            utils.delete(client, path)
+        else:  # `state: enabled` input parameter
+            utils.put(client, path + '/reinstate', None)
+
+    return changed
+
+
+def _get_result(return_object, client, path, remote_object, payload):
+    if return_object == 'none':
+        return None
+    if return_object == 'payload':
+        return dict(remote_object or {}, **_simulate_backend_response(payload))
+    return utils.get(client, path)
+
+
+def sync(remote_object, client, path, payload, check_mode,
+         return_object='full', concurrency=1, password_cache_ttl=0):
+    # Create new user (either enabled or disabled)
+    if remote_object is None:
+        if check_mode:
+            return True, _simulate_backend_response(payload)
+        utils.put(client, path, payload)
+        if password_cache_ttl and 'password' in payload:
+            remember_password(
+                client, payload['username'], payload['password'],
+                password_cache_ttl,
+            )
+        return True, _get_result(return_object, client, path, None, payload)
+
+    # Update existing user. We do this on a field-by-field basis because the
+    # upsteam API for updating users requires a password field to be set. Of
+    # course, we do not want to force users to specify an existing password
+    # just for the sake of updating the group membership, so this is why we
+    # use field-specific API endpoints to update the user data.
+
+    changed = False
+
+    # If we have a password, we use it for change detection and only use the
+    # password hash to update the password. This is how the user action plugin
+    # supplies passwords that it hashed on the controller (the plugin drops
+    # the hashes that users set alongside the passwords). Why? Because
+    # installing bcrypt on control node is way friendlier compared to
+    # installing bcrypt on every host that runs our user module.
+    #
+    # It is true that most of the time, control node == target node in our
+    # cases, but not always.
+    if 'password' in payload:
+        changed = update_password(
+            client, path, payload['username'], payload['password'],
+            check_mode, payload.get('password_hash'), password_cache_ttl,
+        ) or changed
+    elif 'password_hash' in payload:
+        changed = update_password_hash(
+            client, path, payload['username'], payload['password_hash'],
+            check_mode,
+        ) or changed
+
+    if 'groups' in payload:
+        changed = update_groups(
+            client, path, remote_object.get('groups') or [],
+            payload['groups'], check_mode, concurrency,
+        ) or changed
+
+    if 'disabled' in payload:
+        changed = update_state(
+            client, path, remote_object['disabled'], payload['disabled'],
+            check_mode,
+        ) or changed
+
+    if check_mode:
+        # Backend does not return back passwords, so we should follow the
+        # example set by the backend API.
+        return changed, dict(
+            remote_object, **_simulate_backend_response(payload)
+        )
+
+    return changed, _get_result(
+        return_object, client, path, remote_object, payload,
+    )
@@ -6,7 +6,13 @@
 from __future__ import absolute_import, division, print_function
 __metaclass__ = type
 
-from ansible.module_utils.six.moves.urllib.parse import quote
+import hashlib
+import json
+import threading
+import time
+
+from ansible.module_utils._text import to_bytes
+from ansible.module_utils.six.moves.urllib.parse import quote, urlencode
 
 from . import errors
 
@@ -51,8 +57,92 @@ def do_differ_v1(current, desired, *ignored_keys):
     return False
 
 
-def sync(state, client, path, payload, check_mode, compare=do_differ):
-    remote_object = get(client, path)
+def merge_remote_metadata(remote_object, payload):
+    # Backend manages some metadata fields (created_by, for example) on its
+    # own. Labels and annotations are always replaced by what we send.
+    if not remote_object or "metadata" not in payload:
+        return payload
+
+    metadata = dict(
+        (k, v) for k, v in (remote_object.get("metadata") or {}).items()
+        if k not in ("labels", "annotations")
+    )
+    metadata.update(payload["metadata"])
+    return dict(payload, metadata=metadata)
+
+
+def get_result(return_object, client, path, remote_object, payload):
+    """
+    Construct the result for an object that was just updated.
+
+    The full return_object value fetches the updated object from the backend,
+    payload constructs the result locally, and none skips the result
+    altogether.
+    """
+    if return_object == "none":
+        return None
+    if return_object == "payload":
+        return merge_remote_metadata(remote_object, payload)
+    return get(client, path)
+
+
+def fingerprint(obj, set_keys=()):
+    """
+    Return a stable hash of a JSON-serializable object. Lists stored under
+    set_keys are treated as sets, which makes the fingerprint ignore the
+    order of their items (comparators do the same for such keys).
+    """
+    if set_keys and isinstance(obj, dict):
+        normalized = dict(obj)
+        for key in set_keys:
+            try:
+                normalized[key] = sorted(set(obj.get(key) or []))
+            except TypeError:
+                pass  # Unhashable or unsortable items stay as they are
+        obj = normalized
+    return hashlib.sha256(to_bytes(
+        json.dumps(obj, sort_keys=True, separators=(",", ":")),
+    )).hexdigest()
+
+
+def _get_synced_object(client, path, desired):
+    # Return the remote object if we saw it in the desired state recently.
+    if client.force_refresh:
+        return None
+    entry = client.cache.get(*client.sync_cache_key(path))
+    if not isinstance(entry, dict) or entry.get("desired") != desired:
+        return None
+    obj = entry.get("object")
+    if obj is None or fingerprint(obj) != entry.get("remote"):
+        return None
+    return obj
+
+
+def _remember_synced_object(client, path, desired, remote_object):
+    client.cache.set(
+        dict(
+            desired=desired, remote=fingerprint(remote_object),
+            object=remote_object,
+        ),
+        time.time() + client.sync_cache_ttl, *client.sync_cache_key(path)
+    )
+
+
+def sync(state, client, path, payload, check_mode, compare=do_differ,
+         return_object="full", set_keys=()):
+    # Most runs change nothing. If the client keeps a sync cache, we can skip
+    # both the request and the comparison for payloads that matched the remote
+    # object within the last sync_cache_ttl seconds.
+    desired = None
+    if state == "present" and client.sync_cache_ttl:
+        desired = fingerprint(payload, set_keys)
+        remote_object = _get_synced_object(client, path, desired)
+        if remote_object is not None:
+            if return_object == "none":
+                return False, None
+            return False, remote_object
+
+    remote_object = get(client, path, cache_object=True)
 
     if state == "absent" and remote_object is None:
         return False, None
@@ -66,15 +156,28 @@ def sync(state, client, path, payload, check_mode, compare=do_differ):
 
     if remote_object is None or compare(remote_object, payload):
         if check_mode:
+            if return_object == "none":
+                return True, None
             return True, payload
         put(client, path, payload)
-        return True, get(client, path)
+        return True, get_result(
+            return_object, client, path, remote_object, payload,
+        )
+
+    if desired is not None:
+        _remember_synced_object(client, path, desired, remote_object)
 
+    if return_object == "none":
+        return False, None
     return False, remote_object
 
 
-def sync_v1(state, client, path, payload, check_mode, compare=do_differ_v1):
-    changed, result = sync(state, client, path, payload, check_mode, compare)
+def sync_v1(state, client, path, payload, check_mode, compare=do_differ_v1,
+            return_object="full", set_keys=()):
+    changed, result = sync(
+        state, client, path, payload, check_mode, compare, return_object,
+        set_keys,
+    )
     return changed, convert_v1_to_v2_response(result)
 
 
@@ -82,15 +185,108 @@ def _abort(msg, *args, **kwargs):
     raise errors.SyncError(msg.format(*args, **kwargs))
 
 
-def get(client, path):
-    resp = client.get(path)
+def _get_response(client, path, cache_object=False):
+    if cache_object:
+        resp = client.get(path, cache_object=True)
+    else:
+        resp = client.get(path)
     if resp.status not in (200, 404):
         _abort(
             "GET {0} failed with status {1}: {2}", path, resp.status, resp.data,
         )
     if resp.status == 200 and resp.json is None:
         _abort("Server returned invalid JSON {0}", resp.data)
-    return resp.json
+    return resp
+
+
+def get(client, path, cache_object=False):
+    """
+    Fetch the object or collection at path. Set cache_object for single
+    objects that the client may serve from its object cache once the backend
+    confirms that they did not change.
+    """
+    return _get_response(client, path, cache_object).json
+
+
+def iter_objects(client, path, page_size=None, max_items=None):
+    """
+    Generate objects from the collection at path.
+
+    Without page_size and max_items, the whole collection is fetched with a
+    single request. Otherwise, objects are fetched in chunks of at most
+    page_size objects, following the continue tokens that the backend
+    returns, until max_items objects are generated or the collection runs
+    out of objects. Paths of single objects generate zero or one object.
+    """
+    if page_size is not None and page_size < 1:
+        _abort("Page size must be a positive number, not {0}", page_size)
+    if max_items is not None and max_items < 1:
+        _abort("Max items must be a positive number, not {0}", max_items)
+
+    if not page_size and not max_items:
+        for obj in prepare_result_list(get(client, path)):
+            yield obj
+        return
+
+    remaining = max_items
+    continue_token = None
+    while True:
+        limit = page_size or remaining
+        if remaining is not None:
+            limit = min(limit, remaining)
+        resp = _get_response(
+            client, add_query(path, limit=limit, **{"continue": continue_token}),
+        )
+
+        objects = prepare_result_list(resp.json)
+        # Backends that do not support pagination return all objects at once.
+        for obj in objects[:remaining]:
+            yield obj
+
+        if remaining is not None:
+            remaining -= len(objects)
+            if remaining <= 0:
+                return
+
+        continue_token = resp.headers.get("Sensu-Continue")
+        if not continue_token or not isinstance(resp.json, list):
+            return
+
+
+def project(obj, fields):
+    """
+    Return a copy of obj that only contains the values at the dotted paths
+    listed in fields (for example, metadata.name). Paths that do not exist
+    in obj are skipped. If fields is None, obj is returned as-is.
+    """
+    if fields is None:
+        return obj
+
+    result = {}
+    for field in fields:
+        keys = field.split(".")
+        value = obj
+        for key in keys:
+            if not isinstance(value, dict) or key not in value:
+                break
+            value = value[key]
+        else:
+            target = result
+            for key in keys[:-1]:
+                target = target.setdefault(key, {})
+            target[keys[-1]] = value
+    return result
+
+
+def prefetch(client, path):
+    """
+    Fetch all objects from the collection at path with a single request and
+    let the client answer subsequent get calls for those objects from memory.
+
+    Use this when reconciling many objects from the same collection, since one
+    list request is a lot cheaper than one request per object.
+    """
+    client.index_collection(path, get(client, path) or [])
 
 
 def delete(client, path):
@@ -113,6 +309,50 @@ def put(client, path, payload):
     return None
 
 
+def map_concurrently(func, items, concurrency):
+    """
+    Apply func to all items using at most concurrency threads and return the
+    results in the order of items.
+
+    The first exception that func raises stops the processing of the items
+    that are still waiting and is re-raised once the running calls finish.
+    """
+    items = list(items)
+    if concurrency <= 1 or len(items) <= 1:
+        return [func(item) for item in items]
+
+    results = [None] * len(items)
+    pending = list(enumerate(items))
+    failures = []
+    lock = threading.Lock()
+
+    def worker():
+        while True:
+            with lock:
+                if failures or not pending:
+                    return
+                index, item = pending.pop(0)
+            try:
+                results[index] = func(item)
+            except Exception as e:
+                with lock:
+                    failures.append(e)
+                return
+
+    threads = [
+        threading.Thread(target=worker)
+        for _i in range(min(concurrency, len(items)))
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    if failures:
+        raise failures[0]
+    return results
+
+
 def dict_to_single_item_dicts(data):
     return [{k: v} for k, v in data.items()]
 
@@ -129,15 +369,26 @@ def dict_to_key_value_strings(data):
     return ["{0}={1}".format(k, v) for k, v in data.items()]
 
 
-def build_url_path(api_group, api_version, namespace, *parts):
+def build_url_path(api_group, api_version, namespace, *parts, **query):
     prefix = "/api/{0}/{1}/".format(api_group, api_version)
     if namespace:
         prefix += "namespaces/{0}/".format(quote(namespace, safe=""))
-    return prefix + "/".join(quote(p, safe="") for p in parts if p)
+    path = prefix + "/".join(quote(p, safe="") for p in parts if p)
+    return add_query(path, **query)
+
+
+def build_core_v2_path(namespace, *parts, **query):
+    return build_url_path("core", "v2", namespace, *parts, **query)
 
 
-def build_core_v2_path(namespace, *parts):
-    return build_url_path("core", "v2", namespace, *parts)
+def add_query(path, **query):
+    # Parameters without a value are left out, which makes it easy to pass
+    # optional module parameters straight through.
+    query = sorted((k, v) for k, v in query.items() if v is not None)
+    if not query:
+        return path
+    separator = "&" if "?" in path else "?"
+    return "{0}{1}{2}".format(path, separator, urlencode(query))
 
 
 def prepare_result_list(result):
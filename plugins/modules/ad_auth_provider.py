@@ -37,6 +37,7 @@ extends_documentation_fragment:
   - sensu.sensu_go.auth
   - sensu.sensu_go.name
   - sensu.sensu_go.state
+  - sensu.sensu_go.return_object
 
 options:
   servers:
@@ -269,6 +270,7 @@ def main():
                 "auth",
                 "name",
                 "state",
+                "return_object",
             ),
             servers=dict(
                 type="list",
@@ -385,7 +387,8 @@ def main():
 
     try:
         changed, ad_provider = utils.sync_v1(
-            module.params["state"], client, path, payload, module.check_mode, do_differ
+            module.params["state"], client, path, payload, module.check_mode, do_differ,
+            return_object=module.params["return_object"],
         )
         module.exit_json(changed=changed, object=remove_item(ad_provider))
     except errors.Error as e:
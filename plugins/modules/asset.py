@@ -36,6 +36,7 @@ extends_documentation_fragment:
   - sensu.sensu_go.state
   - sensu.sensu_go.labels
   - sensu.sensu_go.annotations
+  - sensu.sensu_go.return_object
 seealso:
   - module: sensu.sensu_go.asset_info
   - module: sensu.sensu_go.bonsai_asset
@@ -111,7 +112,7 @@ object:
 
 from ansible.module_utils.basic import AnsibleModule
 
-from ..module_utils import arguments, errors, utils
+from ..module_utils import arguments, errors, resource_utils, utils
 
 
 def validate_module_params(params):
@@ -121,34 +122,6 @@ def validate_module_params(params):
     return None
 
 
-def _build_set(builds):
-    return set((
-        b.get('sha512'),
-        b.get('url'),
-        frozenset((b.get('headers', {}) or {}).items()),
-        frozenset(b.get('filters', []) or []),
-    ) for b in builds)
-
-
-def _do_builds_differ(current, desired):
-    # Since Sensu Go 5.16, the web API returns builds: None if the asset
-    # in question is a deprecated, single-build asset.
-    if current is None:
-        return True
-
-    if len(current) != len(desired):
-        return True
-
-    return _build_set(current) != _build_set(desired)
-
-
-def do_differ(current, desired):
-    if _do_builds_differ(current['builds'], desired['builds']):
-        return True
-
-    return utils.do_differ(current, desired, 'builds')
-
-
 def build_api_payload(params):
     payload = arguments.get_mutation_payload(params)
     if params['state'] == 'present':
@@ -167,6 +140,7 @@ def main():
         argument_spec=dict(
             arguments.get_spec(
                 "auth", "name", "namespace", "state", "labels", "annotations",
+                "return_object",
             ),
             builds=dict(
                 type="list",
@@ -202,7 +176,9 @@ def main():
 
     try:
         changed, asset = utils.sync(
-            module.params["state"], client, path, payload, module.check_mode, do_differ
+            module.params["state"], client, path, payload, module.check_mode,
+            resource_utils.do_asset_differ,
+            return_object=module.params["return_object"],
         )
         module.exit_json(changed=changed, object=asset)
     except errors.Error as e:
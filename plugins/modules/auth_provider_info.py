@@ -36,6 +36,8 @@ extends_documentation_fragment:
   - sensu.sensu_go.requirements
   - sensu.sensu_go.auth
   - sensu.sensu_go.info
+  - sensu.sensu_go.pagination
+  - sensu.sensu_go.fields
 
 seealso:
   - module: sensu.sensu_go.ad_auth_provider
@@ -94,7 +96,7 @@ objects:
 
 from ansible.module_utils.basic import AnsibleModule
 
-from ..module_utils import arguments, errors, utils
+from ..module_utils import arguments, errors, info_utils, utils
 
 API_GROUP = "enterprise"
 API_VERSION = "authentication/v2"
@@ -115,7 +117,7 @@ def main():
     module = AnsibleModule(
         supports_check_mode=True,
         argument_spec=dict(
-            arguments.get_spec("auth"),
+            arguments.get_spec("auth", "page_size", "max_items", "fields"),
             name=dict(),  # Name is not required in info modules.
         ),
     )
@@ -130,15 +132,15 @@ def main():
     )
 
     try:
-        providers = utils.prepare_result_list(utils.get(client, path))
+        # We simulate the behavior of v2 API here and only return the spec.
+        providers = info_utils.list_objects(
+            client, [path], module.params,
+            lambda p: remove_item(utils.convert_v1_to_v2_response(p)),
+        )
     except errors.Error as e:
         module.fail_json(msg=str(e))
 
-    # We simulate the behavior of v2 API here and only return the spec.
-    module.exit_json(
-        changed=False,
-        objects=[remove_item(utils.convert_v1_to_v2_response(p)) for p in providers],
-    )
+    module.exit_json(changed=False, objects=providers)
 
 
 if __name__ == "__main__":
@@ -37,6 +37,7 @@ extends_documentation_fragment:
   - sensu.sensu_go.labels
   - sensu.sensu_go.annotations
   - sensu.sensu_go.secrets
+  - sensu.sensu_go.return_object
 seealso:
   - module: sensu.sensu_go.check_info
 options:
@@ -246,7 +247,7 @@ object:
 
 from ansible.module_utils.basic import AnsibleModule
 
-from ..module_utils import arguments, errors, utils
+from ..module_utils import arguments, errors, resource_utils, utils
 
 
 def validate_module_params(module):
@@ -261,57 +262,6 @@ def validate_module_params(module):
         module.fail_json(msg='one of the following is required: interval, cron')
 
 
-def do_sets_differ(current, desired, key):
-    return set(current.get(key) or []) != set(desired.get(key) or [])
-
-
-def do_proxy_requests_differ(current, desired):
-    if 'proxy_requests' not in desired:
-        return False
-
-    current = current.get('proxy_requests') or {}
-    desired = desired['proxy_requests']
-
-    return (
-        (
-            'entity_attributes' in desired and
-            do_sets_differ(current, desired, 'entity_attributes')
-        ) or
-        utils.do_differ(current, desired, 'entity_attributes')
-    )
-
-
-def do_check_hooks_differ(current, desired):
-    if 'check_hooks' not in desired:
-        return False
-
-    current = utils.single_item_dicts_to_dict(current.get('check_hooks') or [])
-    current = dict((k, set(v)) for k, v in current.items())
-
-    desired = utils.single_item_dicts_to_dict(desired['check_hooks'])
-    desired = dict((k, set(v)) for k, v in desired.items())
-
-    return current != desired
-
-
-def do_differ(current, desired):
-    return (
-        utils.do_differ(
-            current, desired, 'proxy_requests', 'subscriptions', 'handlers',
-            'runtime_assets', 'check_hooks', 'output_metric_handlers',
-            'env_vars', 'secrets',
-        ) or
-        utils.do_secrets_differ(current, desired) or
-        do_proxy_requests_differ(current, desired) or
-        do_sets_differ(current, desired, 'subscriptions') or
-        do_sets_differ(current, desired, 'handlers') or
-        do_sets_differ(current, desired, 'runtime_assets') or
-        do_check_hooks_differ(current, desired) or
-        do_sets_differ(current, desired, 'output_metric_handlers') or
-        do_sets_differ(current, desired, 'env_vars')
-    )
-
-
 def build_api_payload(params):
     payload = arguments.get_mutation_payload(
         params,
@@ -363,6 +313,7 @@ def main():
             arguments.get_spec(
                 "auth", "name", "state", "labels", "annotations", "namespace",
                 "secrets",
+                "return_object",
             ),
             command=dict(),
             subscriptions=dict(
@@ -438,7 +389,9 @@ def main():
     try:
         changed, check = utils.sync(
             module.params['state'], client, path, payload, module.check_mode,
-            do_differ,
+            resource_utils.do_check_differ,
+            return_object=module.params['return_object'],
+            set_keys=resource_utils.CHECK_SET_KEYS,
         )
         module.exit_json(changed=changed, object=check)
     except errors.Error as e:
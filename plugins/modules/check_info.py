@@ -32,6 +32,10 @@ extends_documentation_fragment:
   - sensu.sensu_go.auth
   - sensu.sensu_go.info
   - sensu.sensu_go.namespace
+  - sensu.sensu_go.pagination
+  - sensu.sensu_go.selectors
+  - sensu.sensu_go.fields
+  - sensu.sensu_go.namespaces
 seealso:
   - module: sensu.sensu_go.check
 '''
@@ -45,6 +49,12 @@ EXAMPLES = '''
   sensu.sensu_go.check_info:
     name: my-check
   register: result
+
+- name: List Sensu checks from all namespaces, 8 namespaces at a time
+  sensu.sensu_go.check_info:
+    all_namespaces: true
+    concurrency: 8
+  register: result
 '''
 
 RETURN = '''
@@ -68,25 +78,34 @@ objects:
 
 from ansible.module_utils.basic import AnsibleModule
 
-from ..module_utils import arguments, errors, utils
+from ..module_utils import arguments, errors, info_utils, utils
 
 
 def main():
     module = AnsibleModule(
         supports_check_mode=True,
         argument_spec=dict(
-            arguments.get_spec("auth", "namespace"),
+            arguments.get_spec(
+                "auth", "namespace", "page_size", "max_items",
+                "label_selector", "field_selector", "fields", "namespaces",
+                "all_namespaces", "concurrency",
+            ),
             name=dict(),  # Name is not required in info modules.
         ),
     )
 
     client = arguments.get_sensu_client(module.params["auth"])
-    path = utils.build_core_v2_path(
-        module.params["namespace"], "checks", module.params["name"],
-    )
 
     try:
-        checks = utils.prepare_result_list(utils.get(client, path))
+        paths = [
+            utils.build_core_v2_path(
+                namespace, "checks", module.params["name"],
+                labelSelector=module.params["label_selector"],
+                fieldSelector=module.params["field_selector"],
+            )
+            for namespace in info_utils.get_namespaces(client, module.params)
+        ]
+        checks = info_utils.list_objects(client, paths, module.params)
     except errors.Error as e:
         module.fail_json(msg=str(e))
 
@@ -28,6 +28,7 @@ extends_documentation_fragment:
   - sensu.sensu_go.auth
   - sensu.sensu_go.name
   - sensu.sensu_go.state
+  - sensu.sensu_go.return_object
 seealso:
   - module: sensu.sensu_go.cluster_info
 options:
@@ -87,7 +88,7 @@ def main():
         required_if=required_if,
         supports_check_mode=True,
         argument_spec=dict(
-            arguments.get_spec("auth", "name", "state"),
+            arguments.get_spec("auth", "name", "state", "return_object"),
             api_urls=dict(type="list", elements="str"),
         ),
     )
@@ -106,6 +107,7 @@ def main():
     try:
         changed, cluster = utils.sync_v1(
             module.params["state"], client, path, payload, module.check_mode,
+            return_object=module.params["return_object"],
         )
         module.exit_json(changed=changed, object=cluster)
     except errors.Error as e:
@@ -32,6 +32,7 @@ extends_documentation_fragment:
   - sensu.sensu_go.auth
   - sensu.sensu_go.name
   - sensu.sensu_go.state
+  - sensu.sensu_go.return_object
 seealso:
   - module: sensu.sensu_go.cluster_role_info
   - module: sensu.sensu_go.cluster_role_binding
@@ -113,7 +114,7 @@ def main():
     module = AnsibleModule(
         supports_check_mode=True,
         argument_spec=dict(
-            arguments.get_spec("auth", "name", "state"),
+            arguments.get_spec("auth", "name", "state", "return_object"),
             rules=dict(
                 type="list",
                 elements="dict",
@@ -153,7 +154,8 @@ def main():
     try:
         changed, cluster_role = utils.sync(
             module.params['state'], client, path,
-            payload, module.check_mode, role_utils.do_roles_differ
+            payload, module.check_mode, role_utils.do_roles_differ,
+            return_object=module.params['return_object'],
         )
         module.exit_json(changed=changed, object=cluster_role)
     except errors.Error as e:
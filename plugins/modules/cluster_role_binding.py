@@ -32,6 +32,7 @@ extends_documentation_fragment:
   - sensu.sensu_go.auth
   - sensu.sensu_go.name
   - sensu.sensu_go.state
+  - sensu.sensu_go.return_object
 options:
   cluster_role:
     description:
@@ -111,7 +112,7 @@ def main():
         required_if=required_if,
         supports_check_mode=True,
         argument_spec=dict(
-            arguments.get_spec("auth", "name", "state"),
+            arguments.get_spec("auth", "name", "state", "return_object"),
             cluster_role=dict(),
             users=dict(
                 type="list", elements="str",
@@ -134,7 +135,8 @@ def main():
 
     try:
         changed, cluster_role_binding = utils.sync(
-            module.params["state"], client, path, payload, module.check_mode, role_utils.do_role_bindings_differ
+            module.params["state"], client, path, payload, module.check_mode, role_utils.do_role_bindings_differ,
+            return_object=module.params["return_object"],
         )
         module.exit_json(changed=changed, object=cluster_role_binding)
     except errors.Error as e:
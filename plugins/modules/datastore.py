@@ -29,6 +29,7 @@ extends_documentation_fragment:
   - sensu.sensu_go.auth
   - sensu.sensu_go.name
   - sensu.sensu_go.state
+  - sensu.sensu_go.return_object
 seealso:
   - module: sensu.sensu_go.datastore_info
 options:
@@ -137,12 +138,10 @@ API_GROUP = "enterprise"
 API_VERSION = "store/v1"
 
 
-def _get(client, path):
-    return utils.convert_v1_to_v2_response(utils.get(client, path))
-
-
-def sync(state, client, list_path, resource_path, payload, check_mode):
-    datastore = _get(client, resource_path)
+def sync(state, client, list_path, resource_path, payload, check_mode,
+         return_object="full"):
+    remote_object = utils.get(client, resource_path)
+    datastore = utils.convert_v1_to_v2_response(remote_object)
 
     # When we are deleting stores, we do not care if there is more than one
     # datastore present. We just make sure the currently manipulated store is
@@ -160,11 +159,11 @@ def sync(state, client, list_path, resource_path, payload, check_mode):
     # more than one present.
     if datastore:
         if utils.do_differ(datastore, payload["spec"]):
-            if check_mode:
-                return True, payload["spec"]
-            utils.put(client, resource_path, payload)
-            return True, _get(client, resource_path)
-        return False, datastore
+            return True, _update(
+                client, resource_path, remote_object, payload, check_mode,
+                return_object,
+            )
+        return False, None if return_object == "none" else datastore
 
     # When adding a new datastore, we first make sure there is no other
     # datastore present because we do not want to be the ones who brought
@@ -172,10 +171,21 @@ def sync(state, client, list_path, resource_path, payload, check_mode):
     if utils.get(client, list_path):
         raise errors.Error("Some other external datastore is already active.")
 
+    return True, _update(
+        client, resource_path, None, payload, check_mode, return_object,
+    )
+
+
+def _update(client, path, remote_object, payload, check_mode, return_object):
+    if not check_mode:
+        utils.put(client, path, payload)
+    if return_object == "none":
+        return None
     if check_mode:
-        return True, payload["spec"]
-    utils.put(client, resource_path, payload)
-    return True, _get(client, resource_path)
+        return payload["spec"]
+    return utils.convert_v1_to_v2_response(utils.get_result(
+        return_object, client, path, remote_object, payload,
+    ))
 
 
 def main():
@@ -186,7 +196,7 @@ def main():
         required_if=required_if,
         supports_check_mode=True,
         argument_spec=dict(
-            arguments.get_spec("auth", "name", "state"),
+            arguments.get_spec("auth", "name", "state", "return_object"),
             dsn=dict(),
             pool_size=dict(
                 type="int",
@@ -235,7 +245,7 @@ def main():
     try:
         changed, datastore = sync(
             module.params["state"], client, list_path, resource_path, payload,
-            module.check_mode,
+            module.check_mode, return_object=module.params["return_object"],
         )
         module.exit_json(changed=changed, object=datastore)
     except errors.Error as e:
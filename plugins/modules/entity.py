@@ -35,6 +35,7 @@ extends_documentation_fragment:
   - sensu.sensu_go.state
   - sensu.sensu_go.labels
   - sensu.sensu_go.annotations
+  - sensu.sensu_go.return_object
 seealso:
   - module: sensu.sensu_go.entity_info
 options:
@@ -166,19 +167,7 @@ object:
 
 from ansible.module_utils.basic import AnsibleModule
 
-from ..module_utils import arguments, errors, utils
-
-
-def do_differ(current, desired):
-    system = desired.get('system')
-    if system and utils.do_differ(current.get('system'), system):
-        return True
-
-    subs = desired.get('subscriptions')
-    if subs is not None and set(subs) != set(current.get('subscriptions', [])):
-        return True
-
-    return utils.do_differ(current, desired, 'system', 'subscriptions')
+from ..module_utils import arguments, errors, resource_utils, utils
 
 
 def main():
@@ -191,6 +180,7 @@ def main():
         argument_spec=dict(
             arguments.get_spec(
                 "auth", "name", "state", "labels", "annotations", "namespace",
+                "return_object",
             ),
             entity_class=dict(),
             subscriptions=dict(
@@ -250,7 +240,9 @@ def main():
     try:
         changed, entity = utils.sync(
             module.params['state'], client, path, payload, module.check_mode,
-            do_differ,
+            resource_utils.do_entity_differ,
+            return_object=module.params['return_object'],
+            set_keys=resource_utils.ENTITY_SET_KEYS,
         )
         module.exit_json(changed=changed, object=entity)
     except errors.Error as e:
@@ -28,6 +28,7 @@ extends_documentation_fragment:
   - sensu.sensu_go.auth
   - sensu.sensu_go.name
   - sensu.sensu_go.state
+  - sensu.sensu_go.return_object
 seealso:
   - module: sensu.sensu_go.etcd_replicator_info
 options:
@@ -158,7 +159,7 @@ def main():
         required_if=required_if,
         supports_check_mode=True,
         argument_spec=dict(
-            arguments.get_spec("auth", "name", "state"),
+            arguments.get_spec("auth", "name", "state", "return_object"),
             ca_cert=dict(type="str"),
             cert=dict(type="str"),
             key=dict(type="str", no_log=False),
@@ -208,6 +209,7 @@ def main():
     try:
         changed, replicator = utils.sync_v1(
             module.params["state"], client, path, payload, module.check_mode,
+            return_object=module.params["return_object"],
         )
         module.exit_json(changed=changed, object=replicator)
     except errors.Error as e:
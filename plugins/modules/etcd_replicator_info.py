@@ -27,6 +27,8 @@ extends_documentation_fragment:
   - sensu.sensu_go.requirements
   - sensu.sensu_go.auth
   - sensu.sensu_go.info
+  - sensu.sensu_go.pagination
+  - sensu.sensu_go.fields
 seealso:
   - module: sensu.sensu_go.etcd_replicator
 """
@@ -69,7 +71,7 @@ objects:
 
 from ansible.module_utils.basic import AnsibleModule
 
-from ..module_utils import arguments, errors, utils
+from ..module_utils import arguments, errors, info_utils, utils
 
 API_GROUP = "enterprise"
 API_VERSION = "federation/v1"
@@ -79,7 +81,7 @@ def main():
     module = AnsibleModule(
         supports_check_mode=True,
         argument_spec=dict(
-            arguments.get_spec("auth"),
+            arguments.get_spec("auth", "page_size", "max_items", "fields"),
             name=dict(),  # Name is not required in info modules.
         ),
     )
@@ -90,14 +92,14 @@ def main():
     )
 
     try:
-        replicators = utils.prepare_result_list(utils.get(client, path))
+        # We simulate the behavior of v2 API here and only return the spec.
+        replicators = info_utils.list_objects(
+            client, [path], module.params, utils.convert_v1_to_v2_response,
+        )
     except errors.Error as e:
         module.fail_json(msg=str(e))
 
-    # We simulate the behavior of v2 API here and only return the spec.
-    module.exit_json(changed=False, objects=[
-        utils.convert_v1_to_v2_response(s) for s in replicators
-    ])
+    module.exit_json(changed=False, objects=replicators)
 
 
 if __name__ == "__main__":
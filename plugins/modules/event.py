@@ -44,12 +44,14 @@ options:
     type: int
   entity:
     description:
-      - Name of the entity associated with this event. It must exist before event creation.
+      - Name of the entity associated with this event. It must exist before
+        event creation unless I(lean) is set.
     type: str
     required: true
   check:
     description:
-      - Name of the check associated with this event. It must exist before event creation.
+      - Name of the check associated with this event. It must exist before
+        event creation unless I(lean) is set.
     type: str
     required: true
   check_attributes:
@@ -114,6 +116,16 @@ options:
           - Metric data points including a name, timestamp, value, and tags.
         type: list
         elements: dict
+  lean:
+    description:
+      - Send a minimal event that references the entity and the check by name
+        and only contains the attributes set in the task.
+      - The module does not fetch the entity and the check from the backend
+        in this mode. The backend fills in the rest of the event and creates
+        a proxy entity if the entity does not exist yet.
+    type: bool
+    default: false
+    version_added: 1.15.0
 '''
 
 EXAMPLES = '''
@@ -152,6 +164,15 @@ EXAMPLES = '''
               value: 57
           timestamp: 1552506033
           value: 0.004
+
+- name: Report a failure without fetching the entity and the check first
+  sensu.sensu_go.event:
+    entity: awesome_entity
+    check: awesome_check
+    lean: true
+    check_attributes:
+      output: Service is down
+      status: critical
 '''
 
 RETURN = '''
@@ -200,61 +221,18 @@ object:
 
 from ansible.module_utils.basic import AnsibleModule
 
-from ..module_utils import arguments, errors, utils
-
-STATUS_MAP = {
-    'ok': 0,
-    'warning': 1,
-    'critical': 2,
-    'unknown': 3,
-}
-
-
-def get_check(client, namespace, check):
-    check_path = utils.build_core_v2_path(namespace, 'checks', check)
-    resp = client.get(check_path)
-    if resp.status != 200:
-        raise errors.SyncError("Check with name '{0}' does not exist on remote.".format(check))
-    return resp.json
-
-
-def get_entity(client, namespace, entity):
-    entity_path = utils.build_core_v2_path(namespace, 'entities', entity)
-    resp = client.get(entity_path)
-    if resp.status != 200:
-        raise errors.SyncError("Entity with name '{0}' does not exist on remote.".format(entity))
-    return resp.json
-
-
-def _update_payload_with_metric_attributes(payload, metric_attributes):
-    if not metric_attributes:
-        return
-
-    payload['metrics'] = arguments.get_spec_payload(metric_attributes, *metric_attributes.keys())
-
-
-def _update_payload_with_check_attributes(payload, check_attributes):
-    if not check_attributes:
-        return
-
-    if check_attributes['status']:
-        check_attributes['status'] = STATUS_MAP[check_attributes['status']]
-
-    filtered_attributes = arguments.get_spec_payload(check_attributes, *check_attributes.keys())
-    payload['check'].update(filtered_attributes)
+from ..module_utils import arguments, errors, event_utils, utils
 
 
 def _build_api_payload(client, params):
-    payload = arguments.get_spec_payload(params, 'timestamp')
-    payload['metadata'] = dict(
-        namespace=params['namespace']
+    namespace = params['namespace']
+    if params['lean']:
+        return event_utils.build_lean_payload(namespace, params)
+    return event_utils.build_payload(
+        namespace, params,
+        event_utils.get_entity(client, namespace, params['entity']),
+        event_utils.get_check(client, namespace, params['check']),
     )
-    payload['entity'] = get_entity(client, params['namespace'], params['entity'])
-    payload['check'] = get_check(client, params['namespace'], params['check'])
-
-    _update_payload_with_check_attributes(payload, params['check_attributes'])
-    _update_payload_with_metric_attributes(payload, params['metric_attributes'])
-    return payload
 
 
 def send_event(client, path, payload, check_mode):
@@ -273,53 +251,22 @@ def main():
             check=dict(required=True),
             check_attributes=dict(
                 type='dict',
-                options=dict(
-                    duration=dict(
-                        type='float'
-                    ),
-                    executed=dict(
-                        type='int'
-                    ),
-                    history=dict(
-                        type='list', elements='dict',
-                    ),
-                    issued=dict(
-                        type='int'
-                    ),
-                    last_ok=dict(
-                        type='int'
-                    ),
-                    output=dict(),
-                    state=dict(
-                        choices=['passing', 'failing', 'flapping']
-                    ),
-                    status=dict(
-                        choices=['ok', 'warning', 'critical', 'unknown']
-                    ),
-                    total_state_change=dict(
-                        type='int'
-                    )
-                )
+                options=event_utils.CHECK_ATTRIBUTES_SPEC,
             ),
             metric_attributes=dict(
                 type='dict',
-                options=dict(
-                    handlers=dict(
-                        type='list',
-                        elements='str'
-                    ),
-                    points=dict(
-                        type='list',
-                        elements='dict'
-                    )
-                )
-            )
-        )
+                options=event_utils.METRIC_ATTRIBUTES_SPEC,
+            ),
+            lean=dict(
+                type='bool',
+                default=False,
+            ),
+        ),
     )
 
     client = arguments.get_sensu_client(module.params['auth'])
-    path = utils.build_core_v2_path(
-        module.params['namespace'], 'events', module.params['entity'],
+    path = event_utils.build_path(
+        module.params['namespace'], module.params['entity'],
         module.params['check'],
     )
 
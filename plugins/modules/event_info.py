@@ -31,6 +31,10 @@ extends_documentation_fragment:
   - sensu.sensu_go.requirements
   - sensu.sensu_go.auth
   - sensu.sensu_go.namespace
+  - sensu.sensu_go.pagination
+  - sensu.sensu_go.selectors
+  - sensu.sensu_go.fields
+  - sensu.sensu_go.namespaces
 seealso:
   - module: sensu.sensu_go.event
 options:
@@ -60,6 +64,18 @@ EXAMPLES = '''
     entity: api.example.com
     check: check-cpu
   register: result
+
+- name: List critical events for entities with the linux subscription
+  sensu.sensu_go.event_info:
+    field_selector: >-
+      event.check.status == "2" && linux in event.entity.subscriptions
+  register: result
+
+- name: List at most 1000 Sensu events, 500 events per request
+  sensu.sensu_go.event_info:
+    page_size: 500
+    max_items: 1000
+  register: result
 '''
 
 RETURN = '''
@@ -109,7 +125,7 @@ objects:
 
 from ansible.module_utils.basic import AnsibleModule
 
-from ..module_utils import arguments, errors, utils
+from ..module_utils import arguments, errors, info_utils, utils
 
 
 def main():
@@ -118,20 +134,29 @@ def main():
         supports_check_mode=True,
         required_by=required_by,
         argument_spec=dict(
-            arguments.get_spec("auth", "namespace"),
+            arguments.get_spec(
+                "auth", "namespace", "page_size", "max_items",
+                "label_selector", "field_selector", "fields", "namespaces",
+                "all_namespaces", "concurrency",
+            ),
             check=dict(),
             entity=dict(),
         ),
     )
 
     client = arguments.get_sensu_client(module.params['auth'])
-    path = utils.build_core_v2_path(
-        module.params['namespace'], 'events', module.params['entity'],
-        module.params['check'],
-    )
 
     try:
-        events = utils.prepare_result_list(utils.get(client, path))
+        paths = [
+            utils.build_core_v2_path(
+                namespace, 'events', module.params['entity'],
+                module.params['check'],
+                labelSelector=module.params['label_selector'],
+                fieldSelector=module.params['field_selector'],
+            )
+            for namespace in info_utils.get_namespaces(client, module.params)
+        ]
+        events = info_utils.list_objects(client, paths, module.params)
     except errors.Error as e:
         module.fail_json(msg=str(e))
 
@@ -0,0 +1,328 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+# Copyright: (c) 2019, XLAB Steampunk <steampunk@xlab.si>
+#
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+__metaclass__ = type
+
+ANSIBLE_METADATA = {
+    "metadata_version": "1.1",
+    "status": ["preview"],
+    "supported_by": "certified",
+}
+
+DOCUMENTATION = '''
+module: events
+author:
+  - Tadej Borovsak (@tadeboro)
+short_description: Send multiple Sensu events at once
+description:
+  - Send a list of synthetic events to Sensu in a single module run.
+  - Each entity and check is fetched from the backend only once, no matter
+    how many events refer to it. Events are sent to the backend in
+    parallel.
+  - If I(lean) is set, entities and checks are not fetched at all.
+  - For more information, refer to the Sensu documentation at
+    U(https://docs.sensu.io/sensu-go/latest/reference/events/).
+version_added: 1.15.0
+extends_documentation_fragment:
+  - sensu.sensu_go.requirements
+  - sensu.sensu_go.auth
+  - sensu.sensu_go.namespace
+seealso:
+  - module: sensu.sensu_go.event
+  - module: sensu.sensu_go.event_info
+options:
+  events:
+    description:
+      - List of events to send.
+      - Event parameters have the same meaning as the parameters of the
+        M(sensu.sensu_go.event) module.
+    type: list
+    elements: dict
+    required: true
+    suboptions:
+      entity:
+        description:
+          - Name of the entity associated with this event. It must exist
+            before event creation unless I(lean) is set.
+        type: str
+        required: true
+      check:
+        description:
+          - Name of the check associated with this event. It must exist
+            before event creation unless I(lean) is set.
+        type: str
+        required: true
+      namespace:
+        description:
+          - RBAC namespace of the event. If not set, the value of the
+            top-level I(namespace) parameter is used.
+        type: str
+      timestamp:
+        description:
+          - UNIX time at which the event occurred.
+        type: int
+      check_attributes:
+        description:
+          - Additional check parameters. Find out more at
+            U(https://docs.sensu.io/sensu-go/latest/reference/events/#check-attributes).
+        type: dict
+        suboptions:
+          duration:
+            description:
+              - Command execution time in seconds.
+            type: float
+          executed:
+            description:
+              - Time that the check request was executed.
+            type: int
+          history:
+            description:
+              - Check status history for the last 21 check executions.
+            type: list
+            elements: dict
+          issued:
+            description:
+              - Time that the check request was issued in seconds since the
+                Unix epoch.
+            type: int
+          last_ok:
+            description:
+              - The last time that the check returned an OK status (0) in
+                seconds since the Unix epoch.
+            type: int
+          output:
+            description:
+              - The output from the execution of the check command.
+            type: str
+          state:
+            description:
+              - The state of the check.
+            choices: [ "passing", "failing", "flapping" ]
+            type: str
+          status:
+            description:
+              - Exit status code produced by the check.
+            choices: [ "ok", "warning", "critical", "unknown" ]
+            type: str
+          total_state_change:
+            description:
+              - The total state change percentage for the check's history.
+            type: int
+      metric_attributes:
+        description:
+          - Metric attributes. Find out more at
+            U(https://docs.sensu.io/sensu-go/latest/reference/events/#metric-attributes).
+        type: dict
+        suboptions:
+          handlers:
+            description:
+              - An array of Sensu handlers to use for events created by the
+                check. Each array item must be a string.
+            type: list
+            elements: str
+          points:
+            description:
+              - Metric data points including a name, timestamp, value, and
+                tags.
+            type: list
+            elements: dict
+  concurrency:
+    description:
+      - Maximum number of requests that the module sends to the backend in
+        parallel.
+    type: int
+    default: 4
+  lean:
+    description:
+      - Send minimal events that reference their entities and checks by name.
+      - Has the same meaning as the I(lean) parameter of the
+        M(sensu.sensu_go.event) module.
+    type: bool
+    default: false
+'''
+
+EXAMPLES = '''
+- name: Send events for all web servers
+  sensu.sensu_go.events:
+    events:
+      - entity: web01
+        check: check-http
+        check_attributes:
+          status: ok
+          output: HTTP OK
+      - entity: web02
+        check: check-http
+        check_attributes:
+          status: critical
+          output: Connection refused
+
+- name: Send a large number of prepared events, 16 at a time
+  sensu.sensu_go.events:
+    concurrency: 16
+    events: "{{ canary_events }}"
+
+- name: Send events without fetching entities and checks
+  sensu.sensu_go.events:
+    lean: true
+    events:
+      - entity: web01
+        check: check-http
+        check_attributes:
+          status: ok
+'''
+
+RETURN = '''
+results:
+  description:
+    - Results for each of the events, in the order of the I(events)
+      parameter.
+    - Failed events contain an error message in the I(msg) key.
+  returned: always
+  type: list
+  elements: dict
+  sample:
+    - entity: web01
+      check: check-http
+      namespace: default
+      changed: true
+      failed: false
+    - entity: web02
+      check: check-http
+      namespace: default
+      changed: false
+      failed: true
+      msg: Entity with name 'web02' does not exist on remote.
+'''
+
+from ansible.module_utils.basic import AnsibleModule
+
+from ..module_utils import arguments, errors, event_utils, utils
+
+
+def fetch_objects(client, getter, keys, concurrency):
+    """
+    Fetch all objects identified by the (namespace, name) keys and return a
+    mapping from keys to (object, error message) tuples.
+    """
+    def fetch(key):
+        try:
+            return getter(client, *key), None
+        except errors.Error as e:
+            return None, str(e)
+
+    keys = sorted(set(keys))
+    return dict(zip(keys, utils.map_concurrently(fetch, keys, concurrency)))
+
+
+def send_event(client, item, entities, checks, check_mode):
+    """
+    Send a single event and return its result. If entities and checks are
+    None, the module sends a lean event.
+    """
+    result = dict(
+        entity=item["entity"], check=item["check"],
+        namespace=item["namespace"], changed=False, failed=False,
+    )
+
+    if entities is None or checks is None:
+        payload = event_utils.build_lean_payload(item["namespace"], item)
+    else:
+        entity, msg = entities[(item["namespace"], item["entity"])]
+        if msg is None:
+            check, msg = checks[(item["namespace"], item["check"])]
+        if msg is not None:
+            result.update(failed=True, msg=msg)
+            return result
+        payload = event_utils.build_payload(
+            item["namespace"], item, entity, check,
+        )
+
+    try:
+        if not check_mode:
+            utils.put(client, event_utils.build_path(
+                item["namespace"], item["entity"], item["check"],
+            ), payload)
+        result["changed"] = True
+    except errors.Error as e:
+        result.update(failed=True, msg=str(e))
+    return result
+
+
+def main():
+    module = AnsibleModule(
+        supports_check_mode=True,
+        argument_spec=dict(
+            arguments.get_spec("auth", "namespace", "concurrency"),
+            events=dict(
+                type="list",
+                elements="dict",
+                required=True,
+                options=dict(
+                    entity=dict(
+                        required=True,
+                    ),
+                    check=dict(
+                        required=True,
+                    ),
+                    namespace=dict(),
+                    timestamp=dict(
+                        type="int",
+                    ),
+                    check_attributes=dict(
+                        type="dict",
+                        options=event_utils.CHECK_ATTRIBUTES_SPEC,
+                    ),
+                    metric_attributes=dict(
+                        type="dict",
+                        options=event_utils.METRIC_ATTRIBUTES_SPEC,
+                    ),
+                ),
+            ),
+            lean=dict(
+                type="bool",
+                default=False,
+            ),
+        ),
+    )
+
+    items = [
+        dict(item, namespace=item["namespace"] or module.params["namespace"])
+        for item in module.params["events"]
+    ]
+
+    client = arguments.get_sensu_client(module.params["auth"])
+    concurrency = module.params["concurrency"]
+
+    entities = checks = None
+    if not module.params["lean"]:
+        entities = fetch_objects(
+            client, event_utils.get_entity,
+            [(i["namespace"], i["entity"]) for i in items], concurrency,
+        )
+        checks = fetch_objects(
+            client, event_utils.get_check,
+            [(i["namespace"], i["check"]) for i in items], concurrency,
+        )
+    results = utils.map_concurrently(
+        lambda i: send_event(client, i, entities, checks, module.check_mode),
+        items, concurrency,
+    )
+
+    changed = any(r["changed"] for r in results)
+    failed = [r for r in results if r["failed"]]
+    if failed:
+        module.fail_json(
+            msg="Failed to send {0} of {1} events".format(
+                len(failed), len(results),
+            ),
+            changed=changed, results=results,
+        )
+    module.exit_json(changed=changed, results=results)
+
+
+if __name__ == '__main__':
+    main()
@@ -35,6 +35,7 @@ extends_documentation_fragment:
   - sensu.sensu_go.state
   - sensu.sensu_go.labels
   - sensu.sensu_go.annotations
+  - sensu.sensu_go.return_object
 seealso:
   - module: sensu.sensu_go.filter_info
 options:
@@ -127,6 +128,7 @@ def main():
         argument_spec=dict(
             arguments.get_spec(
                 "auth", "name", "state", "labels", "annotations", "namespace",
+                "return_object",
             ),
             action=dict(choices=['allow', 'deny']),
             expressions=dict(
@@ -148,6 +150,7 @@ def main():
     try:
         changed, sensu_filter = utils.sync(
             module.params['state'], client, path, payload, module.check_mode,
+            return_object=module.params['return_object'],
         )
         module.exit_json(changed=changed, object=sensu_filter)
     except errors.Error as e:
@@ -33,6 +33,7 @@ extends_documentation_fragment:
   - sensu.sensu_go.state
   - sensu.sensu_go.labels
   - sensu.sensu_go.annotations
+  - sensu.sensu_go.return_object
 seealso:
   - module: sensu.sensu_go.socket_handler
   - module: sensu.sensu_go.pipe_handler
@@ -90,6 +91,7 @@ def main():
         argument_spec=dict(
             arguments.get_spec(
                 "auth", "name", "state", "labels", "annotations", "namespace",
+                "return_object",
             ),
             handlers=dict(
                 type='list', elements='str',
@@ -109,6 +111,7 @@ def main():
     try:
         changed, handler = utils.sync(
             module.params['state'], client, path, payload, module.check_mode,
+            return_object=module.params['return_object'],
         )
         module.exit_json(changed=changed, object=handler)
     except errors.Error as e:
@@ -35,6 +35,7 @@ extends_documentation_fragment:
   - sensu.sensu_go.state
   - sensu.sensu_go.labels
   - sensu.sensu_go.annotations
+  - sensu.sensu_go.return_object
 seealso:
   - module: sensu.sensu_go.hook_info
 options:
@@ -115,6 +116,7 @@ def main():
         argument_spec=dict(
             arguments.get_spec(
                 "auth", "name", "state", "labels", "annotations", "namespace",
+                "return_object",
             ),
             command=dict(),
             timeout=dict(
@@ -139,6 +141,7 @@ def main():
     try:
         changed, hook = utils.sync(
             module.params['state'], client, path, payload, module.check_mode,
+            return_object=module.params['return_object'],
         )
         module.exit_json(changed=changed, object=hook)
     except errors.Error as e:
@@ -36,6 +36,7 @@ extends_documentation_fragment:
   - sensu.sensu_go.auth
   - sensu.sensu_go.name
   - sensu.sensu_go.state
+  - sensu.sensu_go.return_object
 
 options:
   servers:
@@ -257,6 +258,7 @@ def main():
                 "auth",
                 "name",
                 "state",
+                "return_object",
             ),
             servers=dict(
                 type="list",
@@ -367,7 +369,8 @@ def main():
 
     try:
         changed, ldap_provider = utils.sync_v1(
-            module.params["state"], client, path, payload, module.check_mode, do_differ
+            module.params["state"], client, path, payload, module.check_mode, do_differ,
+            return_object=module.params["return_object"],
         )
         module.exit_json(changed=changed, object=remove_item(ldap_provider))
     except errors.Error as e:
@@ -36,6 +36,7 @@ extends_documentation_fragment:
   - sensu.sensu_go.labels
   - sensu.sensu_go.annotations
   - sensu.sensu_go.secrets
+  - sensu.sensu_go.return_object
 seealso:
   - module: sensu.sensu_go.mutator_info
 options:
@@ -117,6 +118,7 @@ def main():
             arguments.get_spec(
                 "auth", "name", "state", "labels", "annotations", "namespace",
                 "secrets",
+                "return_object",
             ),
             command=dict(),
             timeout=dict(
@@ -144,6 +146,7 @@ def main():
         changed, mutator = utils.sync(
             module.params['state'], client, path, payload, module.check_mode,
             do_differ,
+            return_object=module.params['return_object'],
         )
         module.exit_json(changed=changed, object=mutator)
     except errors.Error as e:
@@ -32,6 +32,7 @@ extends_documentation_fragment:
   - sensu.sensu_go.auth
   - sensu.sensu_go.name
   - sensu.sensu_go.state
+  - sensu.sensu_go.return_object
 seealso:
   - module: sensu.sensu_go.namespace_info
 '''
@@ -65,7 +66,7 @@ from ..module_utils import arguments, errors, utils
 def main():
     module = AnsibleModule(
         supports_check_mode=True,
-        argument_spec=arguments.get_spec("auth", "name", "state"),
+        argument_spec=arguments.get_spec("auth", "name", "state", "return_object"),
     )
     client = arguments.get_sensu_client(module.params['auth'])
     path = utils.build_core_v2_path(
@@ -77,6 +78,7 @@ def main():
     try:
         changed, namespace = utils.sync(
             module.params['state'], client, path, payload, module.check_mode,
+            return_object=module.params['return_object'],
         )
         module.exit_json(changed=changed, object=namespace)
     except errors.Error as e:
@@ -29,6 +29,9 @@ version_added: 1.0.0
 extends_documentation_fragment:
   - sensu.sensu_go.requirements
   - sensu.sensu_go.auth
+  - sensu.sensu_go.pagination
+  - sensu.sensu_go.selectors
+  - sensu.sensu_go.fields
 notes:
   - Currently, it is not possible to retrieve information about a single
     namespace because namespace is not much more than a name itself.
@@ -54,21 +57,28 @@ objects:
 
 from ansible.module_utils.basic import AnsibleModule
 
-from ..module_utils import arguments, errors, utils
+from ..module_utils import arguments, errors, info_utils, utils
 
 
 def main():
     module = AnsibleModule(
         supports_check_mode=True,
         argument_spec=dict(
-            arguments.get_spec("auth"),
+            arguments.get_spec(
+                "auth", "page_size", "max_items", "label_selector",
+                "field_selector", "fields",
+            ),
         ),
     )
     client = arguments.get_sensu_client(module.params['auth'])
-    path = utils.build_core_v2_path(None, 'namespaces')
+    path = utils.build_core_v2_path(
+        None, 'namespaces',
+        labelSelector=module.params['label_selector'],
+        fieldSelector=module.params['field_selector'],
+    )
 
     try:
-        namespaces = utils.get(client, path)
+        namespaces = info_utils.list_objects(client, [path], module.params)
     except errors.Error as e:
         module.fail_json(msg=str(e))
 
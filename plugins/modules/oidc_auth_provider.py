@@ -37,6 +37,7 @@ extends_documentation_fragment:
   - sensu.sensu_go.auth
   - sensu.sensu_go.name
   - sensu.sensu_go.state
+  - sensu.sensu_go.return_object
 
 options:
   additional_scopes:
@@ -171,6 +172,7 @@ def main():
                 "auth",
                 "name",
                 "state",
+                "return_object",
             ),
             additional_scopes=dict(
                 type="list",
@@ -235,7 +237,8 @@ def main():
 
     try:
         changed, oidc_provider = utils.sync_v1(
-            module.params["state"], client, path, payload, module.check_mode
+            module.params["state"], client, path, payload, module.check_mode,
+            return_object=module.params["return_object"],
         )
         module.exit_json(
             changed=changed, object=remove_item(oidc_provider)
@@ -34,6 +34,7 @@ extends_documentation_fragment:
   - sensu.sensu_go.labels
   - sensu.sensu_go.annotations
   - sensu.sensu_go.secrets
+  - sensu.sensu_go.return_object
 seealso:
   - module: sensu.sensu_go.socket_handler
   - module: sensu.sensu_go.handler_info
@@ -123,6 +124,7 @@ def main():
             arguments.get_spec(
                 "auth", "name", "state", "labels", "annotations", "namespace",
                 "secrets",
+                "return_object",
             ),
             command=dict(),
             filters=dict(
@@ -157,6 +159,7 @@ def main():
         changed, handler = utils.sync(
             module.params['state'], client, path, payload, module.check_mode,
             do_differ,
+            return_object=module.params['return_object'],
         )
         module.exit_json(changed=changed, object=handler)
     except errors.Error as e:
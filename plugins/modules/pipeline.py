@@ -33,6 +33,7 @@ extends_documentation_fragment:
   - sensu.sensu_go.namespace
   - sensu.sensu_go.state
   - sensu.sensu_go.labels
+  - sensu.sensu_go.return_object
 seealso:
   - module: sensu.sensu_go.socket_handler
   - module: sensu.sensu_go.handler_info
@@ -229,6 +230,7 @@ def main():
         argument_spec=dict(
             arguments.get_spec(
                 "auth", "name", "state", "namespace", "labels",
+                "return_object",
             ),
             workflows=dict(
                 type="list",
@@ -307,6 +309,7 @@ def main():
         changed, handler = utils.sync(
             module.params['state'], client, path, payload, module.check_mode,
             do_differ,
+            return_object=module.params['return_object'],
         )
         module.exit_json(changed=changed, object=handler)
     except errors.Error as e:
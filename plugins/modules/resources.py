@@ -0,0 +1,314 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+# Copyright: (c) 2019, XLAB Steampunk <steampunk@xlab.si>
+#
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+__metaclass__ = type
+
+ANSIBLE_METADATA = {
+    "metadata_version": "1.1",
+    "status": ["preview"],
+    "supported_by": "certified",
+}
+
+DOCUMENTATION = '''
+module: resources
+author:
+  - Tadej Borovsak (@tadeboro)
+short_description: Manage multiple Sensu resources at once
+description:
+  - Create, update or delete a list of Sensu Go resources of different kinds
+    in a single module run.
+  - Resources are compared with the backend state using the same rules as
+    the dedicated modules (for example, I(subscriptions) of a check are
+    compared as a set). Use this module instead of looping over the
+    dedicated modules when managing a large number of resources.
+  - Resources of the same kind from the same namespace are fetched from the
+    backend using a single request.
+  - Resource attributes are passed to the backend as-is, which means that
+    they must be in the format that Sensu Go API expects. Refer to the
+    Sensu Go API documentation at
+    U(https://docs.sensu.io/sensu-go/latest/api/) for more information.
+version_added: 1.15.0
+extends_documentation_fragment:
+  - sensu.sensu_go.requirements
+  - sensu.sensu_go.auth
+  - sensu.sensu_go.namespace
+  - sensu.sensu_go.return_object
+seealso:
+  - module: sensu.sensu_go.asset
+  - module: sensu.sensu_go.check
+  - module: sensu.sensu_go.entity
+options:
+  resources:
+    description:
+      - List of resources to manage.
+    type: list
+    elements: dict
+    required: true
+    suboptions:
+      kind:
+        description:
+          - Kind of the resource.
+        type: str
+        required: true
+        choices:
+          - Asset
+          - CheckConfig
+          - ClusterRole
+          - ClusterRoleBinding
+          - Entity
+          - EventFilter
+          - Handler
+          - HookConfig
+          - Mutator
+          - Namespace
+          - Role
+          - RoleBinding
+          - Secret
+          - Silenced
+      name:
+        description:
+          - The Sensu resource's name.
+        type: str
+        required: true
+      namespace:
+        description:
+          - RBAC namespace to operate in. If not set, the value of the
+            top-level I(namespace) parameter is used.
+          - Ignored for cluster-wide resources.
+        type: str
+      state:
+        description:
+          - Target state of the resource.
+        type: str
+        choices: [ present, absent ]
+        default: present
+      labels:
+        description:
+          - Custom metadata fields that can be accessed within Sensu, as
+            key/value pairs.
+          - Namespaces cannot have labels or annotations.
+        type: dict
+      annotations:
+        description:
+          - Custom metadata fields with fewer restrictions, as key/value
+            pairs.
+          - Namespaces cannot have labels or annotations.
+        type: dict
+      spec:
+        description:
+          - Attributes of the resource in the Sensu Go API format, without
+            the I(metadata).
+          - Required if I(state) is C(present).
+        type: dict
+'''
+
+EXAMPLES = '''
+- name: Make sure a handler and checks that use it are present
+  sensu.sensu_go.resources:
+    namespace: production
+    resources:
+      - kind: Handler
+        name: slack
+        spec:
+          type: pipe
+          command: sensu-slack-handler
+      - kind: CheckConfig
+        name: check-cpu
+        labels:
+          team: ops
+        spec:
+          command: check-cpu.sh -w 75 -c 90
+          subscriptions:
+            - linux
+          handlers:
+            - slack
+          interval: 30
+          publish: true
+      - kind: CheckConfig
+        name: check-memory
+        state: absent
+
+- name: Manage secrets and cluster-wide resources
+  sensu.sensu_go.resources:
+    resources:
+      - kind: Namespace
+        name: staging
+        spec: {}
+      - kind: Secret
+        name: slack-webhook
+        namespace: staging
+        spec:
+          provider: env
+          id: SLACK_WEBHOOK_URL
+'''
+
+RETURN = '''
+results:
+  description:
+    - Results for each of the resources, in the order of the I(resources)
+      parameter.
+    - The I(diff) key is only present when running in diff mode.
+  returned: success
+  type: list
+  elements: dict
+  sample:
+    - kind: CheckConfig
+      name: check-cpu
+      namespace: production
+      changed: true
+      object:
+        metadata:
+          name: check-cpu
+          namespace: production
+        command: check-cpu.sh -w 75 -c 90
+        interval: 30
+        publish: true
+        subscriptions:
+          - linux
+'''
+
+from ansible.module_utils.basic import AnsibleModule
+
+from ..module_utils import arguments, errors, resource_utils, utils
+
+
+def validate_module_params(params):
+    for item in params["resources"]:
+        if item["state"] == "present" and item["spec"] is None:
+            return "spec is required for present {0} {1}".format(
+                item["kind"], item["name"],
+            )
+        if "metadata" in (item["spec"] or {}):
+            return "{0} {1} should not have metadata in spec".format(
+                item["kind"], item["name"],
+            )
+        if not resource_utils.has_metadata(item["kind"]) and (
+            item.get("labels") or item.get("annotations")
+        ):
+            return "{0} {1} cannot have labels or annotations".format(
+                item["kind"], item["name"],
+            )
+    return None
+
+
+def get_namespace(item, default):
+    if not resource_utils.KINDS[item["kind"]]["namespaced"]:
+        return None
+    return item["namespace"] or default
+
+
+def prefetch_collections(client, items, default_namespace):
+    # Listing a collection only pays off if we need more than one object.
+    counts = {}
+    for item in items:
+        path = resource_utils.build_path(
+            item["kind"], get_namespace(item, default_namespace), None,
+        )
+        counts[path] = counts.get(path, 0) + 1
+
+    for path in sorted(counts):
+        if counts[path] > 1:
+            utils.prefetch(client, path)
+
+
+def get_current_object(client, item, namespace):
+    path = resource_utils.build_path(item["kind"], namespace, item["name"])
+    result = utils.get(client, path)
+    if resource_utils.is_v1(item["kind"]):
+        return utils.convert_v1_to_v2_response(result)
+    return result
+
+
+def sync_resource(client, item, default_namespace, check_mode, diff_mode,
+                  return_object):
+    namespace = get_namespace(item, default_namespace)
+    result = dict(kind=item["kind"], name=item["name"], namespace=namespace)
+
+    before = None
+    if diff_mode:
+        before = get_current_object(client, item, namespace)
+
+    result["changed"], result["object"] = resource_utils.sync(
+        item["state"], client, item["kind"], item["name"], namespace,
+        item["spec"], check_mode, item["labels"], item["annotations"],
+        return_object,
+    )
+
+    if diff_mode:
+        result["diff"] = dict(before=before or {}, after=result["object"] or {})
+    return result
+
+
+def main():
+    module = AnsibleModule(
+        supports_check_mode=True,
+        argument_spec=dict(
+            arguments.get_spec("auth", "namespace", "return_object"),
+            resources=dict(
+                type="list",
+                elements="dict",
+                required=True,
+                options=dict(
+                    kind=dict(
+                        required=True,
+                        choices=sorted(resource_utils.KINDS),
+                    ),
+                    name=dict(
+                        required=True,
+                    ),
+                    namespace=dict(),
+                    state=dict(
+                        default="present",
+                        choices=["present", "absent"],
+                    ),
+                    labels=dict(
+                        type="dict",
+                    ),
+                    annotations=dict(
+                        type="dict",
+                    ),
+                    spec=dict(
+                        type="dict",
+                    ),
+                ),
+            ),
+        ),
+    )
+
+    msg = validate_module_params(module.params)
+    if msg:
+        module.fail_json(msg=msg)
+
+    client = arguments.get_sensu_client(module.params["auth"])
+
+    try:
+        prefetch_collections(
+            client, module.params["resources"], module.params["namespace"],
+        )
+    except errors.Error as e:
+        module.fail_json(msg=str(e))
+
+    results = []
+    for item in module.params["resources"]:
+        try:
+            results.append(sync_resource(
+                client, item, module.params["namespace"], module.check_mode,
+                module._diff, module.params["return_object"],
+            ))
+        except errors.Error as e:
+            module.fail_json(
+                msg="{0} {1}: {2}".format(item["kind"], item["name"], e),
+                changed=any(r["changed"] for r in results), results=results,
+            )
+
+    module.exit_json(
+        changed=any(r["changed"] for r in results), results=results,
+    )
+
+
+if __name__ == '__main__':
+    main()
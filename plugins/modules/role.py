@@ -33,6 +33,7 @@ extends_documentation_fragment:
   - sensu.sensu_go.name
   - sensu.sensu_go.namespace
   - sensu.sensu_go.state
+  - sensu.sensu_go.return_object
 seealso:
   - module: sensu.sensu_go.role_info
   - module: sensu.sensu_go.cluster_role
@@ -114,7 +115,7 @@ def main():
     module = AnsibleModule(
         supports_check_mode=True,
         argument_spec=dict(
-            arguments.get_spec("auth", "name", "state", "namespace"),
+            arguments.get_spec("auth", "name", "state", "namespace", "return_object"),
             rules=dict(
                 type="list",
                 elements="dict",
@@ -154,7 +155,8 @@ def main():
     try:
         changed, role = utils.sync(
             module.params['state'], client, path,
-            payload, module.check_mode, role_utils.do_roles_differ
+            payload, module.check_mode, role_utils.do_roles_differ,
+            return_object=module.params['return_object'],
         )
         module.exit_json(changed=changed, object=role)
     except errors.Error as e:
@@ -33,6 +33,7 @@ extends_documentation_fragment:
   - sensu.sensu_go.name
   - sensu.sensu_go.namespace
   - sensu.sensu_go.state
+  - sensu.sensu_go.return_object
 seealso:
   - module: sensu.sensu_go.role_binding_info
   - module: sensu.sensu_go.role
@@ -141,7 +142,7 @@ def main():
         mutually_exclusive=mutually_exclusive,
         supports_check_mode=True,
         argument_spec=dict(
-            arguments.get_spec("auth", "name", "state", "namespace"),
+            arguments.get_spec("auth", "name", "state", "namespace", "return_object"),
             role=dict(),
             cluster_role=dict(),
             users=dict(
@@ -165,7 +166,8 @@ def main():
 
     try:
         changed, role_binding = utils.sync(
-            module.params["state"], client, path, payload, module.check_mode, role_utils.do_role_bindings_differ
+            module.params["state"], client, path, payload, module.check_mode, role_utils.do_role_bindings_differ,
+            return_object=module.params["return_object"],
         )
         module.exit_json(changed=changed, object=role_binding)
     except errors.Error as e:
@@ -32,6 +32,7 @@ extends_documentation_fragment:
   - sensu.sensu_go.name
   - sensu.sensu_go.namespace
   - sensu.sensu_go.state
+  - sensu.sensu_go.return_object
 seealso:
   - module: sensu.sensu_go.secret_info
   - module: sensu.sensu_go.secrets_provider_env
@@ -98,7 +99,7 @@ def main():
         required_if=required_if,
         supports_check_mode=True,
         argument_spec=dict(
-            arguments.get_spec("auth", "name", "state", "namespace"),
+            arguments.get_spec("auth", "name", "state", "namespace", "return_object"),
             provider=dict(type="str"),
             id=dict(type="str"),
         ),
@@ -121,6 +122,7 @@ def main():
     try:
         changed, secret = utils.sync_v1(
             module.params["state"], client, path, payload, module.check_mode,
+            return_object=module.params["return_object"],
         )
         module.exit_json(changed=changed, object=secret)
     except errors.Error as e:
@@ -31,6 +31,9 @@ extends_documentation_fragment:
   - sensu.sensu_go.auth
   - sensu.sensu_go.info
   - sensu.sensu_go.namespace
+  - sensu.sensu_go.pagination
+  - sensu.sensu_go.fields
+  - sensu.sensu_go.namespaces
 seealso:
   - module: sensu.sensu_go.secret
   - module: sensu.sensu_go.secrets_provider_env
@@ -74,7 +77,7 @@ objects:
 
 from ansible.module_utils.basic import AnsibleModule
 
-from ..module_utils import arguments, errors, utils
+from ..module_utils import arguments, errors, info_utils, utils
 
 API_GROUP = "enterprise"
 API_VERSION = "secrets/v1"
@@ -84,26 +87,32 @@ def main():
     module = AnsibleModule(
         supports_check_mode=True,
         argument_spec=dict(
-            arguments.get_spec("auth", "namespace"),
+            arguments.get_spec(
+                "auth", "namespace", "page_size", "max_items", "fields",
+                "namespaces", "all_namespaces", "concurrency",
+            ),
             name=dict(),  # Name is not required in info modules.
         ),
     )
 
     client = arguments.get_sensu_client(module.params["auth"])
-    path = utils.build_url_path(
-        API_GROUP, API_VERSION, module.params["namespace"], "secrets",
-        module.params["name"],
-    )
 
     try:
-        secrets = utils.prepare_result_list(utils.get(client, path))
+        paths = [
+            utils.build_url_path(
+                API_GROUP, API_VERSION, namespace, "secrets",
+                module.params["name"],
+            )
+            for namespace in info_utils.get_namespaces(client, module.params)
+        ]
+        # We simulate the behavior of v2 API here and only return the spec.
+        secrets = info_utils.list_objects(
+            client, paths, module.params, utils.convert_v1_to_v2_response,
+        )
     except errors.Error as e:
         module.fail_json(msg=str(e))
 
-    # We simulate the behavior of v2 API here and only return the spec.
-    module.exit_json(changed=False, objects=[
-        utils.convert_v1_to_v2_response(s) for s in secrets
-    ])
+    module.exit_json(changed=False, objects=secrets)
 
 
 if __name__ == "__main__":
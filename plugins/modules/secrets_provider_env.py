@@ -31,6 +31,7 @@ extends_documentation_fragment:
   - sensu.sensu_go.requirements
   - sensu.sensu_go.auth
   - sensu.sensu_go.state
+  - sensu.sensu_go.return_object
 seealso:
   - module: sensu.sensu_go.secrets_provider_vault
   - module: sensu.sensu_go.secrets_provider_info
@@ -70,7 +71,7 @@ def main():
         supports_check_mode=True,
         argument_spec=dict(
             arguments.get_spec(
-                "auth", "state",
+                "auth", "state", "return_object",
             ),
         )
     )
@@ -88,6 +89,7 @@ def main():
     try:
         changed, env_provider = utils.sync_v1(
             module.params['state'], client, path, payload, module.check_mode,
+            return_object=module.params['return_object'],
         )
         module.exit_json(changed=changed, object=env_provider)
     except errors.Error as e:
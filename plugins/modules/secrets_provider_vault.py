@@ -31,6 +31,7 @@ extends_documentation_fragment:
   - sensu.sensu_go.auth
   - sensu.sensu_go.name
   - sensu.sensu_go.state
+  - sensu.sensu_go.return_object
 options:
   address:
     description:
@@ -202,7 +203,7 @@ def main():
         required_if=required_if,
         argument_spec=dict(
             arguments.get_spec(
-                "auth", "name", "state",
+                "auth", "name", "state", "return_object",
             ),
             address=dict(),
             token=dict(no_log=True),
@@ -247,7 +248,8 @@ def main():
 
     try:
         changed, vault_provider = utils.sync_v1(
-            module.params['state'], client, path, payload, module.check_mode, do_differ
+            module.params['state'], client, path, payload, module.check_mode, do_differ,
+            return_object=module.params['return_object'],
         )
         module.exit_json(changed=changed, object=vault_provider)
     except errors.Error as e:
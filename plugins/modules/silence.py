@@ -34,6 +34,7 @@ extends_documentation_fragment:
   - sensu.sensu_go.state
   - sensu.sensu_go.labels
   - sensu.sensu_go.annotations
+  - sensu.sensu_go.return_object
 seealso:
   - module: sensu.sensu_go.silence_info
 options:
@@ -132,6 +133,7 @@ def main():
         argument_spec=dict(
             arguments.get_spec(
                 'auth', 'state', 'labels', 'annotations', 'namespace',
+                'return_object',
             ),
             subscription=dict(),
             check=dict(),
@@ -162,6 +164,7 @@ def main():
     try:
         changed, silence = utils.sync(
             module.params['state'], client, path, payload, module.check_mode,
+            return_object=module.params['return_object'],
         )
         module.exit_json(changed=changed, object=silence)
     except errors.Error as e:
@@ -31,6 +31,10 @@ extends_documentation_fragment:
   - sensu.sensu_go.requirements
   - sensu.sensu_go.auth
   - sensu.sensu_go.namespace
+  - sensu.sensu_go.pagination
+  - sensu.sensu_go.selectors
+  - sensu.sensu_go.fields
+  - sensu.sensu_go.namespaces
 seealso:
   - module: sensu.sensu_go.silence
 options:
@@ -81,14 +85,18 @@ objects:
 
 from ansible.module_utils.basic import AnsibleModule
 
-from ..module_utils import arguments, errors, utils
+from ..module_utils import arguments, errors, info_utils, utils
 
 
 def main():
     module = AnsibleModule(
         supports_check_mode=True,
         argument_spec=dict(
-            arguments.get_spec('auth', 'namespace'),
+            arguments.get_spec(
+                'auth', 'namespace', 'page_size', 'max_items',
+                'label_selector', 'field_selector', 'fields', 'namespaces',
+                'all_namespaces', 'concurrency',
+            ),
             subscription=dict(),
             check=dict(),
         ),
@@ -96,12 +104,17 @@ def main():
 
     name = '{0}:{1}'.format(module.params['subscription'] or '*', module.params['check'] or '*')
     client = arguments.get_sensu_client(module.params["auth"])
-    path = utils.build_core_v2_path(
-        module.params["namespace"], "silenced", None if name == "*:*" else name,
-    )
 
     try:
-        silences = utils.prepare_result_list(utils.get(client, path))
+        paths = [
+            utils.build_core_v2_path(
+                namespace, "silenced", None if name == "*:*" else name,
+                labelSelector=module.params["label_selector"],
+                fieldSelector=module.params["field_selector"],
+            )
+            for namespace in info_utils.get_namespaces(client, module.params)
+        ]
+        silences = info_utils.list_objects(client, paths, module.params)
     except errors.Error as e:
         module.fail_json(msg=str(e))
 
@@ -33,6 +33,7 @@ extends_documentation_fragment:
   - sensu.sensu_go.state
   - sensu.sensu_go.labels
   - sensu.sensu_go.annotations
+  - sensu.sensu_go.return_object
 seealso:
   - module: sensu.sensu_go.handler_info
   - module: sensu.sensu_go.pipe_handler
@@ -122,6 +123,7 @@ def main():
         argument_spec=dict(
             arguments.get_spec(
                 "auth", "name", "state", "labels", "annotations", "namespace",
+                "return_object",
             ),
             type=dict(choices=['tcp', 'udp']),
             filters=dict(
@@ -150,6 +152,7 @@ def main():
     try:
         changed, handler = utils.sync(
             module.params['state'], client, path, payload, module.check_mode,
+            return_object=module.params['return_object'],
         )
         module.exit_json(changed=changed, object=handler)
     except errors.Error as e:
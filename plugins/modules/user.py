@@ -30,10 +30,13 @@ extends_documentation_fragment:
   - sensu.sensu_go.requirements
   - sensu.sensu_go.auth
   - sensu.sensu_go.name
+  - sensu.sensu_go.return_object
 requirements:
-  - bcrypt (when managing Sensu Go 5.21.0 or newer)
+  - bcrypt on the Ansible controller or on the host that runs the module
+    (when managing Sensu Go 5.21.0 or newer)
 seealso:
   - module: sensu.sensu_go.user_info
+  - module: sensu.sensu_go.users
 options:
   state:
     description:
@@ -49,6 +52,9 @@ options:
         and I(password_hash) is not set.
       - If both I(password) and I(password_hash) are set, I(password_hash) is
         ignored and calculated from the I(password) if required.
+      - If I(password_cache_ttl) is set, passwords that need to be checked
+        are hashed on the Ansible controller if the I(bcrypt) Python library
+        is available there.
     type: str
   password_hash:
     description:
@@ -71,6 +77,29 @@ options:
       - List of groups user belongs to.
     type: list
     elements: str
+  concurrency:
+    description:
+      - Maximum number of group membership changes that the module sends to
+        the backend in parallel.
+    type: int
+    default: 4
+    version_added: 1.15.0
+  password_cache_ttl:
+    description:
+      - Number of seconds to remember that the I(password) is valid.
+      - The module does not validate remembered passwords with the backend,
+        which is an expensive operation, and the action plugin does not hash
+        them.
+      - Password changes made outside of Ansible go unnoticed until the
+        remembered passwords expire.
+      - Passwords are remembered in the I(auth.cache_dir) directory on the
+        host that runs the module and on the Ansible controller. Set
+        I(auth.cache_dir) or the C(SENSU_CACHE_DIR) environment variable on
+        the controller to enable this feature.
+      - Set to 0 to disable remembering passwords.
+    type: int
+    default: 0
+    version_added: 1.15.0
 '''
 
 EXAMPLES = '''
@@ -112,163 +141,16 @@ object:
     username: alice
 '''
 
-import traceback
-
-from ansible.module_utils.basic import AnsibleModule, missing_required_lib
-
-from ..module_utils import arguments, errors, utils
-
-try:
-    import bcrypt
-    HAS_BCRYPT = True
-    BCRYPT_IMPORT_ERROR = None
-except ImportError:
-    HAS_BCRYPT = False
-    BCRYPT_IMPORT_ERROR = traceback.format_exc()
-
-
-def _simulate_backend_response(payload):
-    # Backend does not return back any password-related information for now.
-    masked_keys = ('password', 'password_hash')
-    return dict(
-        (k, v) for k, v in payload.items() if k not in masked_keys
-    )
-
-
-def update_password(client, path, username, password, check_mode):
-    # Hit the auth testing API and try to validate the credentials. If the API
-    # says they are invalid, we need to update them.
-    if client.validate_auth_data(username, password):
-        return False
-
-    if not check_mode:
-        if client.version < "5.21.0":
-            utils.put(client, path + '/password', dict(
-                username=username, password=password,
-            ))
-        else:
-            # Raise exception if BCRYPT library is not present on host.
-            if HAS_BCRYPT:
-                hash = bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt())
-            else:
-                raise errors.RequirementsError(missing_required_lib('bcrypt'))
-            utils.put(client, path + '/reset_password', dict(
-                username=username, password_hash=hash.decode('ascii'),
-            ))
-
-    return True
-
-
-def update_password_hash(client, path, username, password_hash, check_mode):
-    # Some older Sensu Go versions do not have support for password hashes.
-    if client.version < "5.21.0":
-        raise errors.SensuError(
-            "Sensu Go < 5.21.0 does not support password hashes"
-        )
-
-    # Insert change detection here once we can receive password hash from the
-    # backend. Up until then, we always update passwords.
-
-    if not check_mode:
-        utils.put(client, path + '/reset_password', dict(
-            username=username, password_hash=password_hash,
-        ))
-
-    return True
-
+from ansible.module_utils.basic import AnsibleModule
 
-def update_groups(client, path, old_groups, new_groups, check_mode):
-    to_delete = set(old_groups).difference(new_groups)
-    to_add = set(new_groups).difference(old_groups)
-
-    if not check_mode:
-        # Next few lines are far from atomic, which means that we can leave a
-        # user in any of the intermediate states, but this is the best we can
-        # do given the API limitations.
-        for g in to_add:
-            utils.put(client, path + '/groups/' + g, None)
-        for g in to_delete:
-            utils.delete(client, path + '/groups/' + g)
-
-    return len(to_delete) + len(to_add) > 0
-
-
-def update_state(client, path, old_disabled, new_disabled, check_mode):
-    changed = old_disabled != new_disabled
-
-    if not check_mode and changed:
-        if new_disabled:  # `state: disabled` input parameter
-            utils.delete(client, path)
-        else:  # `state: enabled` input parameter
-            utils.put(client, path + '/reinstate', None)
-
-    return changed
-
-
-def sync(remote_object, client, path, payload, check_mode):
-    # Create new user (either enabled or disabled)
-    if remote_object is None:
-        if check_mode:
-            return True, _simulate_backend_response(payload)
-        utils.put(client, path, payload)
-        return True, utils.get(client, path)
-
-    # Update existing user. We do this on a field-by-field basis because the
-    # upsteam API for updating users requires a password field to be set. Of
-    # course, we do not want to force users to specify an existing password
-    # just for the sake of updating the group membership, so this is why we
-    # use field-specific API endpoints to update the user data.
-
-    changed = False
-
-    # We only use password hash if we do not have a password. In practice,
-    # this means that users should not set both password and password_hash. We
-    # do not enforce this by making those two parameters mutually exclusive
-    # because in the future (2.0.0 version of collection), we intend to move
-    # password hashing into action plugin and supply both the password and its
-    # hash. Why? Because installing bcrypt on control node is way friendlier
-    # compared to installing bcrypt on every host that runs our user module.
-    #
-    # It is true that most of the time, control node == target node in our
-    # cases, but not always.
-    if 'password' in payload:
-        changed = update_password(
-            client, path, payload['username'], payload['password'],
-            check_mode,
-        ) or changed
-    elif 'password_hash' in payload:
-        changed = update_password_hash(
-            client, path, payload['username'], payload['password_hash'],
-            check_mode,
-        ) or changed
-
-    if 'groups' in payload:
-        changed = update_groups(
-            client, path, remote_object.get('groups') or [],
-            payload['groups'], check_mode,
-        ) or changed
-
-    if 'disabled' in payload:
-        changed = update_state(
-            client, path, remote_object['disabled'], payload['disabled'],
-            check_mode,
-        ) or changed
-
-    if check_mode:
-        # Backend does not return back passwords, so we should follow the
-        # example set by the backend API.
-        return changed, dict(
-            remote_object, **_simulate_backend_response(payload)
-        )
-
-    return changed, utils.get(client, path)
+from ..module_utils import arguments, errors, user_utils, utils
 
 
 def main():
     module = AnsibleModule(
         supports_check_mode=True,
         argument_spec=dict(
-            arguments.get_spec("auth", "name"),
+            arguments.get_spec("auth", "name", "return_object", "concurrency"),
             state=dict(
                 default='enabled',
                 choices=['enabled', 'disabled'],
@@ -281,7 +163,12 @@ def main():
             ),
             groups=dict(
                 type='list', elements='str',
-            )
+            ),
+            password_cache_ttl=dict(
+                type='int',
+                default=0,
+                no_log=False,
+            ),
         ),
     )
 
@@ -302,15 +189,14 @@ def main():
             msg='Cannot create new user without a password or a hash'
         )
 
-    payload = arguments.get_spec_payload(
-        module.params, 'password', 'password_hash', 'groups',
-    )
-    payload['username'] = module.params['name']
-    payload['disabled'] = module.params['state'] == 'disabled'
+    payload = user_utils.build_payload(module.params)
 
     try:
-        changed, user = sync(
-            remote_object, client, path, payload, module.check_mode
+        changed, user = user_utils.sync(
+            remote_object, client, path, payload, module.check_mode,
+            return_object=module.params['return_object'],
+            concurrency=module.params['concurrency'],
+            password_cache_ttl=module.params['password_cache_ttl'],
         )
         module.exit_json(changed=changed, object=user)
     except errors.Error as e:
@@ -31,6 +31,9 @@ extends_documentation_fragment:
   - sensu.sensu_go.requirements
   - sensu.sensu_go.auth
   - sensu.sensu_go.info
+  - sensu.sensu_go.pagination
+  - sensu.sensu_go.selectors
+  - sensu.sensu_go.fields
 seealso:
   - module: sensu.sensu_go.user
 '''
@@ -64,22 +67,29 @@ objects:
 
 from ansible.module_utils.basic import AnsibleModule
 
-from ..module_utils import arguments, errors, utils
+from ..module_utils import arguments, errors, info_utils, utils
 
 
 def main():
     module = AnsibleModule(
         supports_check_mode=True,
         argument_spec=dict(
-            arguments.get_spec("auth"),
+            arguments.get_spec(
+                "auth", "page_size", "max_items", "label_selector",
+                "field_selector", "fields",
+            ),
             name=dict(),  # Name is not required in info modules.
         ),
     )
     client = arguments.get_sensu_client(module.params["auth"])
-    path = utils.build_core_v2_path(None, "users", module.params["name"])
+    path = utils.build_core_v2_path(
+        None, "users", module.params["name"],
+        labelSelector=module.params["label_selector"],
+        fieldSelector=module.params["field_selector"],
+    )
 
     try:
-        users = utils.prepare_result_list(utils.get(client, path))
+        users = info_utils.list_objects(client, [path], module.params)
     except errors.Error as e:
         module.fail_json(msg=str(e))
 
@@ -0,0 +1,226 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+# Copyright: (c) 2019, XLAB Steampunk <steampunk@xlab.si>
+#
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+__metaclass__ = type
+
+ANSIBLE_METADATA = {
+    "metadata_version": "1.1",
+    "status": ["preview"],
+    "supported_by": "certified",
+}
+
+DOCUMENTATION = '''
+module: users
+author:
+  - Tadej Borovsak (@tadeboro)
+short_description: Manage multiple Sensu users at once
+description:
+  - Create, update, activate or deactivate a list of Sensu users in a single
+    module run.
+  - Existing users are fetched from the backend with a single request.
+    Users are then updated in parallel.
+  - Users that are not listed are left alone.
+  - For more information, refer to the Sensu documentation at
+    U(https://docs.sensu.io/sensu-go/latest/reference/rbac/#users).
+version_added: 1.15.0
+extends_documentation_fragment:
+  - sensu.sensu_go.requirements
+  - sensu.sensu_go.auth
+requirements:
+  - bcrypt on the Ansible controller or on the host that runs the module
+    (when managing Sensu Go 5.21.0 or newer)
+seealso:
+  - module: sensu.sensu_go.user
+  - module: sensu.sensu_go.user_info
+options:
+  users:
+    description:
+      - List of users to manage.
+      - User parameters have the same meaning as the parameters of the
+        M(sensu.sensu_go.user) module.
+    type: list
+    elements: dict
+    required: true
+    suboptions:
+      name:
+        description:
+          - Name of the user.
+        type: str
+        required: true
+      state:
+        description:
+          - Desired state of the user.
+        type: str
+        choices: [ enabled, disabled ]
+        default: enabled
+      password:
+        description:
+          - Password for the user.
+        type: str
+      password_hash:
+        description:
+          - Bcrypt password hash for the user.
+        type: str
+      groups:
+        description:
+          - List of groups user belongs to.
+        type: list
+        elements: str
+  concurrency:
+    description:
+      - Maximum number of users that the module updates in parallel.
+    type: int
+    default: 4
+  password_cache_ttl:
+    description:
+      - Number of seconds to remember that user passwords are valid.
+      - Has the same meaning as the I(password_cache_ttl) parameter of the
+        M(sensu.sensu_go.user) module.
+    type: int
+    default: 0
+'''
+
+EXAMPLES = '''
+- name: Mirror users from the SSO directory
+  sensu.sensu_go.users:
+    concurrency: 16
+    users: "{{ sso_users }}"
+
+- name: Manage a few users
+  sensu.sensu_go.users:
+    users:
+      - name: alice
+        password: alice!?pass
+        groups:
+          - dev
+          - ops
+      - name: bob
+        state: disabled
+'''
+
+RETURN = '''
+results:
+  description:
+    - Results for each of the users, in the order of the I(users) parameter.
+    - Failed users contain an error message in the I(msg) key.
+  returned: always
+  type: list
+  elements: dict
+  sample:
+    - name: alice
+      changed: true
+      failed: false
+    - name: bob
+      changed: false
+      failed: true
+      msg: Cannot create new user without a password or a hash
+'''
+
+from ansible.module_utils.basic import AnsibleModule
+
+from ..module_utils import arguments, errors, user_utils, utils
+
+
+def sync_user(client, item, remote_users, check_mode, password_cache_ttl=0):
+    """
+    Bring a single user into the desired state and return its result.
+    """
+    result = dict(name=item["name"], changed=False, failed=False)
+    remote_object = remote_users.get(item["name"])
+    if (
+        remote_object is None
+        and item["password"] is None
+        and item["password_hash"] is None
+    ):
+        result.update(
+            failed=True,
+            msg="Cannot create new user without a password or a hash",
+        )
+        return result
+
+    path = utils.build_core_v2_path(None, "users", item["name"])
+    try:
+        result["changed"], _user = user_utils.sync(
+            remote_object, client, path, user_utils.build_payload(item),
+            check_mode, return_object="none",
+            password_cache_ttl=password_cache_ttl,
+        )
+    except errors.Error as e:
+        result.update(failed=True, msg=str(e))
+    return result
+
+
+def main():
+    module = AnsibleModule(
+        supports_check_mode=True,
+        argument_spec=dict(
+            arguments.get_spec("auth", "concurrency"),
+            users=dict(
+                type="list",
+                elements="dict",
+                required=True,
+                options=dict(
+                    name=dict(
+                        required=True,
+                    ),
+                    state=dict(
+                        default="enabled",
+                        choices=["enabled", "disabled"],
+                    ),
+                    password=dict(
+                        no_log=True,
+                    ),
+                    password_hash=dict(
+                        no_log=False,  # Showing hashes is perfectly OK
+                    ),
+                    groups=dict(
+                        type="list", elements="str",
+                    ),
+                ),
+            ),
+            password_cache_ttl=dict(
+                type="int",
+                default=0,
+                no_log=False,
+            ),
+        ),
+    )
+
+    client = arguments.get_sensu_client(module.params["auth"])
+    path = utils.build_core_v2_path(None, "users")
+
+    try:
+        remote_users = dict(
+            (u["username"], u) for u in utils.iter_objects(client, path)
+        )
+    except errors.Error as e:
+        module.fail_json(msg=str(e))
+
+    # Each user gets its own thread, so group changes of a single user do not
+    # need any additional parallelism.
+    results = utils.map_concurrently(
+        lambda i: sync_user(
+            client, i, remote_users, module.check_mode,
+            module.params["password_cache_ttl"],
+        ),
+        module.params["users"], module.params["concurrency"],
+    )
+
+    changed = any(r["changed"] for r in results)
+    failed = [r for r in results if r["failed"]]
+    if failed:
+        module.fail_json(
+            msg="Failed to update {0} of {1} users".format(
+                len(failed), len(results),
+            ),
+            changed=changed, results=results,
+        )
+    module.exit_json(changed=changed, results=results)
+
+
+if __name__ == '__main__':
+    main()
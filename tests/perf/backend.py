@@ -0,0 +1,205 @@
+from __future__ import absolute_import, division, print_function
+__metaclass__ = type
+
+import gzip
+import hashlib
+import json
+import threading
+import time
+
+from http import server
+from socketserver import ThreadingMixIn
+from urllib.parse import parse_qs, urlsplit
+
+VERSION = "6.2.0"
+TOKEN_LIFETIME = 300
+
+
+class Store:
+    """
+    In-memory stand-in for the backend storage.
+
+    Objects are grouped into collections. The collection path of an object is
+    the path of the object without the last component, which works for the
+    core/v2 and enterprise APIs, including the events API.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.collections = {}
+
+    def reset(self):
+        with self.lock:
+            self.collections = {}
+
+    def put(self, path, obj):
+        collection, _sep, name = path.rstrip("/").rpartition("/")
+        with self.lock:
+            self.collections.setdefault(collection, {})[name] = obj
+
+    def delete(self, path):
+        collection, _sep, name = path.rstrip("/").rpartition("/")
+        with self.lock:
+            return self.collections.get(collection, {}).pop(name, None)
+
+    def get(self, path):
+        """
+        Return the object or the list of objects at the path or None if there
+        is nothing there.
+        """
+        path = path.rstrip("/")
+        with self.lock:
+            if path in self.collections:
+                return list(self.collections[path].values())
+            collection, _sep, name = path.rpartition("/")
+            return self.collections.get(collection, {}).get(name)
+
+
+class Stats:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self.lock:
+            self.requests = {}
+            self.bytes_in = 0
+            self.bytes_out = 0
+
+    def record(self, method, bytes_in, bytes_out):
+        with self.lock:
+            self.requests[method] = self.requests.get(method, 0) + 1
+            self.bytes_in += bytes_in
+            self.bytes_out += bytes_out
+
+    def as_dict(self):
+        with self.lock:
+            return dict(
+                requests=sum(self.requests.values()),
+                requests_by_method=dict(self.requests),
+                bytes_in=self.bytes_in,
+                bytes_out=self.bytes_out,
+            )
+
+
+class Handler(server.BaseHTTPRequestHandler):
+    # Keep-alive connections, just like the real backend.
+    protocol_version = "HTTP/1.1"
+    # Headers and body are written separately. Without this, delayed ACKs
+    # add tens of milliseconds to each response.
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        self.handle_request("GET")
+
+    def do_PUT(self):
+        self.handle_request("PUT")
+
+    def do_POST(self):
+        self.handle_request("POST")
+
+    def do_DELETE(self):
+        self.handle_request("DELETE")
+
+    def handle_request(self, method):
+        url = urlsplit(self.path)
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length) if length else b""
+
+        if self.server.latency:
+            time.sleep(self.server.latency)
+
+        status, data, headers = self.dispatch(
+            method, url.path, parse_qs(url.query), body,
+        )
+        # Like the real backend, tag objects and skip unchanged ones.
+        if method == "GET" and status == 200 and isinstance(data, dict):
+            etag = '"{0}"'.format(hashlib.sha1(
+                json.dumps(data, sort_keys=True).encode("utf-8"),
+            ).hexdigest())
+            headers = dict(headers, ETag=etag)
+            if self.headers.get("If-None-Match") == etag:
+                status, data = 304, None
+        payload = b"" if data is None else json.dumps(data).encode("utf-8")
+        # Like the real backend, compress responses for clients that ask.
+        accept_encoding = self.headers.get("Accept-Encoding") or ""
+        if payload and "gzip" in accept_encoding:
+            payload = gzip.compress(payload)
+            headers = dict(headers, **{"Content-Encoding": "gzip"})
+
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(payload)
+
+        self.server.stats.record(method, len(body), len(payload))
+
+    def dispatch(self, method, path, query, body):
+        if path == "/version":
+            return 200, dict(sensu_backend=VERSION, etcd={}), {}
+        if path in ("/auth", "/auth/token"):
+            return 200, dict(
+                access_token="access", refresh_token="refresh",
+                expires_at=int(time.time()) + TOKEN_LIFETIME,
+            ), {}
+        if path == "/auth/test":
+            return 200, None, {}
+
+        store = self.server.store
+        if method == "PUT":
+            store.put(path, json.loads(body.decode("utf-8")))
+            return 201, None, {}
+        if method == "DELETE":
+            if store.delete(path) is None:
+                return 404, None, {}
+            return 204, None, {}
+        if method != "GET":
+            return 405, None, {}
+
+        data = store.get(path)
+        if data is None:
+            return 404, None, {}
+        if not isinstance(data, list) or "limit" not in query:
+            return 200, data, {}
+
+        limit = int(query["limit"][0])
+        start = int(query.get("continue", ["0"])[0])
+        headers = {}
+        if start + limit < len(data):
+            headers["Sensu-Continue"] = str(start + limit)
+        return 200, data[start:start + limit], headers
+
+
+class Backend(ThreadingMixIn, server.HTTPServer):
+    """
+    Local HTTP server that emulates the parts of the Sensu Go API that the
+    modules use. Latency (in seconds) is added to each request.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, latency=0.0):
+        server.HTTPServer.__init__(self, ("127.0.0.1", 0), Handler)
+        self.latency = latency
+        self.store = Store()
+        self.stats = Stats()
+        self.thread = None
+
+    @property
+    def url(self):
+        return "http://{0}:{1}".format(*self.server_address)
+
+    def start(self):
+        self.thread = threading.Thread(target=self.serve_forever)
+        self.thread.daemon = True
+        self.thread.start()
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
@@ -0,0 +1,293 @@
+from __future__ import absolute_import, division, print_function
+__metaclass__ = type
+
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import time
+
+# Make the collection importable. The collection must live in the
+# <WHATEVER>/ansible_collections/sensu/sensu_go directory (see Makefile).
+sys.path.insert(0, os.path.abspath(
+    os.path.join(os.path.dirname(__file__), *[".."] * 5)
+))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import backend  # noqa: E402
+
+ENTITY_SYSTEM = dict(
+    hostname="host", os="linux", platform="centos", platform_family="rhel",
+    platform_version="8.3", arch="amd64", libc="glibc",
+    network=dict(interfaces=[
+        dict(name="lo", addresses=["127.0.0.1/8", "::1/128"]),
+        dict(name="eth0", mac="52:54:00:20:1b:3c", addresses=["10.0.2.15/24"]),
+    ]),
+)
+
+
+def module_args(url, **kwargs):
+    return dict(
+        kwargs, auth=dict(url=url),
+        _ansible_remote_tmp="/tmp", _ansible_keep_remote_files=False,
+        # Do not flood the system log with module invocations.
+        _ansible_no_log=True,
+    )
+
+
+def run_module(name, args):
+    from ansible_collections.sensu.sensu_go.plugins.action import controller
+
+    result = controller.run_module(name, args)
+    if result.get("failed"):
+        raise RuntimeError("{0} failed: {1}".format(name, result["msg"]))
+    return result
+
+
+def check(i):
+    return dict(
+        name="check-{0}".format(i), command="check-cpu.sh -w 75 -c 90",
+        subscriptions=["linux", "web"], handlers=["slack"], interval=30,
+        publish=True, labels=dict(team="ops"),
+    )
+
+
+def entity(i):
+    name = "entity-{0}".format(i)
+    return dict(
+        metadata=dict(name=name, namespace="default", labels=dict(dc="eu")),
+        entity_class="agent", subscriptions=["linux", "entity:" + name],
+        system=dict(ENTITY_SYSTEM, hostname=name), last_seen=1600000000,
+    )
+
+
+def setup_nothing(store, scale):
+    pass
+
+
+def run_check_sync(url, scale):
+    # Mimic a loop that runs with controller execution enabled.
+    from ansible_collections.sensu.sensu_go.plugins.module_utils import (
+        arguments,
+    )
+    arguments.enable_client_reuse()
+
+    count = int(1000 * scale)
+    for i in range(count):
+        run_module("check", module_args(url, **check(i)))
+    return count
+
+
+def run_resources_sync(url, scale):
+    count = int(1000 * scale)
+    resources = []
+    for i in range(count):
+        spec = check(i)
+        resources.append(dict(
+            kind="CheckConfig", name=spec.pop("name"),
+            labels=spec.pop("labels"), spec=spec,
+        ))
+    run_module("resources", module_args(url, resources=resources))
+    return count
+
+
+def setup_entity_info(store, scale):
+    for i in range(int(50000 * scale)):
+        obj = entity(i)
+        store.put(
+            "/api/core/v2/namespaces/default/entities/" +
+            obj["metadata"]["name"], obj,
+        )
+
+
+def run_entity_info(url, scale):
+    result = run_module("entity_info", module_args(url, page_size=500))
+    return len(result["objects"])
+
+
+def setup_bulk_events(store, scale):
+    for i in range(100):
+        obj = entity(i)
+        store.put(
+            "/api/core/v2/namespaces/default/entities/" +
+            obj["metadata"]["name"], obj,
+        )
+    for i in range(10):
+        spec = check(i)
+        store.put(
+            "/api/core/v2/namespaces/default/checks/" + spec["name"], dict(
+                metadata=dict(name=spec["name"], namespace="default"),
+                command=spec["command"], interval=spec["interval"],
+            ),
+        )
+
+
+def run_bulk_events(url, scale):
+    count = int(1000 * scale)
+    events = [
+        dict(
+            entity="entity-{0}".format(i % 100),
+            check="check-{0}".format(i // 100 % 10),
+            check_attributes=dict(status="ok", output="All good"),
+        ) for i in range(count)
+    ]
+    run_module("events", module_args(url, events=events, concurrency=8))
+    return count
+
+
+SCENARIOS = dict(
+    check_sync=(setup_nothing, run_check_sync),
+    resources_sync=(setup_nothing, run_resources_sync),
+    entity_info=(setup_entity_info, run_entity_info),
+    bulk_events=(setup_bulk_events, run_bulk_events),
+)
+
+
+def peak_rss_kib():
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kibibytes, macOS bytes.
+    return rss // 1024 if sys.platform == "darwin" else rss
+
+
+def child(name, url, scale):
+    """
+    Run the scenario and report the measurements on the standard output.
+    """
+    start = time.time()
+    objects = SCENARIOS[name][1](url, scale)
+    print(json.dumps(dict(
+        objects=objects, wall_time=time.time() - start,
+        peak_rss_kib=peak_rss_kib(),
+    )))
+
+
+def run_scenario(server, name, scale):
+    """
+    Prepare the backend state and run the scenario in a separate process so
+    that scenarios do not affect each other's memory usage.
+    """
+    server.store.reset()
+    server.store.put("/api/core/v2/namespaces/default", dict(name="default"))
+    SCENARIOS[name][0](server.store, scale)
+    server.stats.reset()
+
+    output = subprocess.check_output([
+        sys.executable, __file__, "--child", name, "--url", server.url,
+        "--scale", str(scale),
+    ])
+    result = dict(json.loads(output.decode("utf-8").splitlines()[-1]))
+    result.update(server.stats.as_dict())
+    result["name"] = name
+    result["requests_per_object"] = (
+        float(result["requests"]) / max(result["objects"], 1)
+    )
+    return result
+
+
+def find_regressions(results, baseline, tolerance):
+    """
+    Compare the results with the baseline results and return a list of
+    problems. Request counts and transfer sizes must not grow at all, while
+    wall time and memory usage may grow by the tolerance factor.
+    """
+    old_results = dict((r["name"], r) for r in baseline)
+    problems = []
+    for result in results:
+        old = old_results.get(result["name"])
+        if old is None:
+            continue
+        for key, allowed in (
+            ("requests_per_object", 0), ("bytes_in", 0), ("bytes_out", 0),
+            ("wall_time", tolerance), ("peak_rss_kib", tolerance),
+        ):
+            if result[key] > old[key] * (1 + allowed):
+                problems.append("{0}: {1} grew from {2} to {3}".format(
+                    result["name"], key, old[key], result[key],
+                ))
+    return problems
+
+
+def print_table(results):
+    row = "{0:<16}{1:>9}{2:>10}{3:>10}{4:>10}{5:>10}{6:>12}{7:>12}"
+    print(row.format(
+        "scenario", "objects", "requests", "req/obj", "wall [s]",
+        "RSS [MiB]", "sent [KiB]", "recv [KiB]",
+    ))
+    for r in results:
+        print(row.format(
+            r["name"], r["objects"], r["requests"],
+            "{0:.2f}".format(r["requests_per_object"]),
+            "{0:.2f}".format(r["wall_time"]), r["peak_rss_kib"] // 1024,
+            r["bytes_in"] // 1024, r["bytes_out"] // 1024,
+        ))
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Run Sensu Go collection benchmarks against a local "
+        "stand-in for the Sensu Go backend.",
+    )
+    parser.add_argument(
+        "scenarios", nargs="*", metavar="scenario",
+        help="Scenarios to run: {0} (default: all of them)".format(
+            ", ".join(sorted(SCENARIOS)),
+        ),
+    )
+    parser.add_argument(
+        "--scale", type=float, default=1.0,
+        help="Scale the number of objects in scenarios by this factor",
+    )
+    parser.add_argument(
+        "--latency", type=float, default=0.0,
+        help="Latency in milliseconds that the backend adds to each request",
+    )
+    parser.add_argument("--json", help="Store results in this JSON file")
+    parser.add_argument(
+        "--baseline", help="Fail if results are worse than the ones stored "
+        "in this JSON file",
+    )
+    parser.add_argument(
+        "--tolerance", type=float, default=0.2,
+        help="Allowed relative growth of wall time and memory usage when "
+        "comparing results with the baseline",
+    )
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    parser.add_argument("--url", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child(args.child, args.url, args.scale)
+        return 0
+
+    unknown = set(args.scenarios) - set(SCENARIOS)
+    if unknown:
+        parser.error("unknown scenarios: {0}".format(", ".join(unknown)))
+
+    server = backend.Backend(args.latency / 1000)
+    server.start()
+    try:
+        results = [
+            run_scenario(server, name, args.scale)
+            for name in args.scenarios or sorted(SCENARIOS)
+        ]
+    finally:
+        server.stop()
+
+    print_table(results)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            problems = find_regressions(results, json.load(f), args.tolerance)
+        for problem in problems:
+            print(problem)
+        return 1 if problems else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
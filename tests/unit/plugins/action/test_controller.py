@@ -0,0 +1,223 @@
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import importlib
+import os
+import sys
+
+import pytest
+
+from ansible.module_utils import common
+from ansible.module_utils.common import warnings
+from ansible.playbook.task import Task
+
+from ansible_collections.sensu.sensu_go.plugins import action as actions
+from ansible_collections.sensu.sensu_go.plugins.action import controller
+from ansible_collections.sensu.sensu_go.plugins.module_utils import (
+    arguments, debug, utils,
+)
+
+pytestmark = pytest.mark.skipif(
+    sys.version_info < (2, 7), reason="requires python2.7 or higher"
+)
+
+
+class TestGetModuleName:
+    @pytest.mark.parametrize("action", [
+        "check", "sensu.sensu_go.check",
+    ])
+    def test_module_name(self, action):
+        assert "check" == controller.get_module_name(action)
+
+
+class TestImport:
+    def test_without_global_warnings(self, monkeypatch):
+        # Ansible 2.9 does not have the ansible.module_utils.common.warnings
+        # module.
+        monkeypatch.delattr(common, "warnings")
+        monkeypatch.setitem(sys.modules, warnings.__name__, None)
+        for name in ("controller", "user", "users"):
+            monkeypatch.delattr(actions, name, raising=False)
+            monkeypatch.delitem(
+                sys.modules, "{0}.{1}".format(actions.__name__, name),
+                raising=False,
+            )
+
+        for name in ("controller", "user", "users"):
+            importlib.import_module("{0}.{1}".format(actions.__name__, name))
+
+        assert sys.modules[controller.__name__].warnings is None
+
+
+class TestRunModule:
+    def test_success(self, mocker):
+        mocker.patch.object(arguments, "get_sensu_client")
+        mocker.patch.object(utils, "get").return_value = [
+            dict(metadata=dict(name="default")),
+        ]
+
+        result = controller.run_module("namespace_info", dict(
+            _ansible_remote_tmp="/tmp", _ansible_keep_remote_files=False,
+        ))
+
+        assert result["changed"] is False
+        assert result["objects"] == [dict(metadata=dict(name="default"))]
+
+    def test_failure(self, mocker):
+        mocker.patch.object(arguments, "get_sensu_client")
+
+        result = controller.run_module("namespace_info", dict(
+            _ansible_remote_tmp="/tmp", _ansible_keep_remote_files=False,
+            invalid="param",
+        ))
+
+        assert result["failed"] is True
+        assert "invalid" in result["msg"]
+
+    def test_restore_process_state(self, mocker):
+        mocker.patch.object(arguments, "get_sensu_client")
+        mocker.patch.object(utils, "get").return_value = []
+        stdout = sys.stdout
+
+        controller.run_module("namespace_info", dict(
+            _ansible_remote_tmp="/tmp", _ansible_keep_remote_files=False,
+        ))
+
+        assert stdout is sys.stdout
+
+    def test_task_environment(self, mocker, monkeypatch):
+        monkeypatch.delenv("SENSU_URL", raising=False)
+        get_sensu_client = mocker.patch.object(arguments, "get_sensu_client")
+        mocker.patch.object(utils, "get").return_value = []
+
+        controller.run_module("namespace_info", dict(
+            _ansible_remote_tmp="/tmp", _ansible_keep_remote_files=False,
+        ), dict(SENSU_URL="http://env:8080"))
+
+        auth = get_sensu_client.call_args[0][0]
+        assert ["http://env:8080"] == auth["url"]
+        assert "SENSU_URL" not in os.environ
+
+    def test_debug_settings_from_task_environment(self, mocker, tmpdir):
+        mocker.patch.object(arguments, "get_sensu_client")
+        loggers = []
+        mocker.patch.object(utils, "get").side_effect = (
+            lambda *_args: loggers.append(debug.LOGGER) or []
+        )
+        path = str(tmpdir.join("debug.log"))
+
+        controller.run_module("namespace_info", dict(
+            _ansible_remote_tmp="/tmp", _ansible_keep_remote_files=False,
+        ), dict(SENSU_ANSIBLE_DEBUG="yes", SENSU_ANSIBLE_DEBUG_LOG=path))
+
+        assert path == loggers[0].path
+        assert debug.LOGGER is None
+
+    def test_reset_warnings(self, mocker):
+        mocker.patch.object(arguments, "get_sensu_client")
+        mocker.patch.object(utils, "get").return_value = []
+        warnings.warn("Leftover warning")
+
+        result = controller.run_module("namespace_info", dict(
+            _ansible_remote_tmp="/tmp", _ansible_keep_remote_files=False,
+        ))
+
+        assert "Leftover warning" not in result.get("warnings", [])
+
+
+class TestRun:
+    @staticmethod
+    def get_action(mocker, async_val=0):
+        task = mocker.MagicMock(
+            Task, async_val=async_val, action="sensu.sensu_go.namespace_info",
+            args=dict(name="ns"), check_mode=False,
+        )
+        action = controller.ActionModule(
+            task, mocker.MagicMock(), mocker.MagicMock(), loader=None,
+            templar=None, shared_loader_obj=None,
+        )
+        action._execute_module = mocker.MagicMock(return_value=dict(a=3))
+        action._update_module_args = mocker.MagicMock()
+        return action
+
+    def test_execute_module_by_default(self, mocker):
+        run_module = mocker.patch.object(controller, "run_module")
+        action = self.get_action(mocker)
+
+        result = action.run(task_vars={})
+
+        assert result == dict(a=3)
+        assert "sensu.sensu_go.namespace_info" == \
+            action._execute_module.call_args[1]["module_name"]
+        run_module.assert_not_called()
+
+    def test_run_on_controller(self, mocker):
+        run_module = mocker.patch.object(controller, "run_module")
+        run_module.return_value = dict(b=4)
+        mocker.patch.object(arguments, "_CLIENTS", None)
+        action = self.get_action(mocker)
+
+        result = action.run(task_vars=dict(
+            sensu_go_controller_execution=True,
+        ))
+
+        assert result == dict(b=4)
+        run_module.assert_called_once_with(
+            "namespace_info", dict(name="ns"), {},
+        )
+        action._execute_module.assert_not_called()
+        assert arguments._CLIENTS == {}
+
+    def test_pass_task_environment(self, mocker):
+        run_module = mocker.patch.object(controller, "run_module")
+        run_module.return_value = dict(b=4)
+        mocker.patch.object(arguments, "_CLIENTS", None)
+        action = self.get_action(mocker)
+        action._task.environment = [
+            dict(SENSU_URL="http://a:8080"), dict(SENSU_USER="user"),
+        ]
+        action._templar = mocker.MagicMock()
+        action._templar.template.side_effect = lambda value: value
+
+        action.run(task_vars=dict(sensu_go_controller_execution=True))
+
+        assert dict(
+            SENSU_URL="http://a:8080", SENSU_USER="user",
+        ) == run_module.call_args[0][2]
+
+    def test_run_on_target_without_global_warnings(self, mocker):
+        run_module = mocker.patch.object(controller, "run_module")
+        mocker.patch.object(controller, "warnings", None)
+        action = self.get_action(mocker)
+
+        result = action.run(task_vars=dict(
+            sensu_go_controller_execution=True,
+        ))
+
+        assert result == dict(a=3)
+        run_module.assert_not_called()
+
+    def test_async_task_runs_on_target(self, mocker):
+        run_module = mocker.patch.object(controller, "run_module")
+        action = self.get_action(mocker, async_val=10)
+
+        result = action.run(task_vars=dict(
+            sensu_go_controller_execution="yes",
+        ))
+
+        assert result == dict(a=3)
+        run_module.assert_not_called()
+
+    def test_unexpected_error(self, mocker):
+        run_module = mocker.patch.object(controller, "run_module")
+        run_module.side_effect = Exception("bad")
+        mocker.patch.object(arguments, "_CLIENTS", None)
+        action = self.get_action(mocker)
+
+        result = action.run(task_vars=dict(
+            sensu_go_controller_execution=True,
+        ))
+
+        assert result["failed"] is True
+        assert "bad" in result["msg"]
@@ -0,0 +1,280 @@
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import sys
+
+import pytest
+
+from ansible.playbook.task import Task
+
+from ansible_collections.sensu.sensu_go.plugins.action import (
+    controller, user, users,
+)
+from ansible_collections.sensu.sensu_go.plugins.module_utils import (
+    arguments, cache, user_utils,
+)
+
+pytestmark = pytest.mark.skipif(
+    sys.version_info < (2, 7), reason="requires python2.7 or higher"
+)
+
+
+def get_action(mocker, plugin, module, args, result, check_mode=False):
+    task = mocker.MagicMock(
+        Task, async_val=0, action="sensu.sensu_go." + module, args=args,
+        check_mode=check_mode,
+    )
+    action = plugin.ActionModule(
+        task, mocker.MagicMock(), mocker.MagicMock(), loader=None,
+        templar=None, shared_loader_obj=None,
+    )
+    action._execute_module = mocker.MagicMock(return_value=result)
+    action._update_module_args = mocker.MagicMock()
+    return action
+
+
+def module_args(action):
+    return action._execute_module.call_args[1]["module_args"]
+
+
+class TestGetAddress:
+    @pytest.mark.parametrize("auth,address", [
+        (dict(url=["http://a:8080", "http://b:8080"]), "http://a:8080"),
+        (dict(url="http://a:8080,http://b:8080"), "http://a:8080"),
+        (dict(), "http://env:8080"),
+    ])
+    def test_address(self, auth, address):
+        assert address == user.get_address(
+            dict(auth=auth), dict(SENSU_URL="http://env:8080"),
+        )
+
+    def test_default(self):
+        assert "http://localhost:8080" == user.get_address(
+            {}, {}, "http://localhost:8080",
+        )
+
+    def test_unknown(self):
+        assert user.get_address({}, {}) is None
+
+
+class TestGetPasswordCache:
+    def test_disabled(self, tmpdir):
+        assert user.get_password_cache(dict(
+            auth=dict(cache_dir=str(tmpdir)), password_cache_ttl=0,
+        ), {}) is None
+
+    def test_without_cache_dir(self):
+        assert user.get_password_cache(dict(password_cache_ttl=60), {}) is None
+
+    def test_cache_dir_from_env(self, tmpdir):
+        password_cache = user.get_password_cache(
+            dict(password_cache_ttl=60), dict(SENSU_CACHE_DIR=str(tmpdir)),
+        )
+
+        assert str(tmpdir) == password_cache.directory
+
+
+class TestUserActionModule:
+    @staticmethod
+    def args(tmpdir, **kwargs):
+        return dict(
+            dict(
+                auth=dict(url="http://a:8080", cache_dir=str(tmpdir)),
+                name="alice", password="pass", password_cache_ttl=60,
+            ), **kwargs
+        )
+
+    def test_hash_password_on_controller(self, mocker, tmpdir):
+        mocker.patch.object(user_utils, "HAS_BCRYPT", True)
+        mocker.patch.object(
+            user_utils, "hash_password", return_value="hash",
+        )
+        action = get_action(
+            mocker, user, "user", self.args(tmpdir), dict(changed=True),
+        )
+
+        action.run(task_vars={})
+
+        assert "hash" == module_args(action)["password_hash"]
+        assert "password_hash" not in action._task.args
+
+    def test_do_not_hash_without_cache(self, mocker, tmpdir):
+        mocker.patch.object(user_utils, "HAS_BCRYPT", True)
+        hash_password = mocker.patch.object(user_utils, "hash_password")
+        action = get_action(
+            mocker, user, "user", self.args(tmpdir, password_cache_ttl=0),
+            dict(changed=True),
+        )
+
+        action.run(task_vars={})
+
+        hash_password.assert_not_called()
+        assert "password_hash" not in module_args(action)
+
+    def test_do_not_hash_for_unknown_backend(self, mocker, tmpdir):
+        mocker.patch.object(user_utils, "HAS_BCRYPT", True)
+        hash_password = mocker.patch.object(user_utils, "hash_password")
+        args = self.args(tmpdir)
+        del args["auth"]["url"]
+        action = get_action(mocker, user, "user", args, dict(changed=False))
+
+        action.run(task_vars={})
+
+        hash_password.assert_not_called()
+        assert [] == tmpdir.listdir()
+
+    def test_address_from_task_environment(self, mocker, tmpdir):
+        mocker.patch.object(user_utils, "HAS_BCRYPT", False)
+        mocker.patch.dict(user.os.environ, SENSU_URL="http://controller:80")
+        args = self.args(tmpdir)
+        del args["auth"]["url"]
+        action = get_action(mocker, user, "user", args, dict(changed=False))
+        action._task.environment = [dict(SENSU_URL="http://task:8080")]
+        action._templar = mocker.MagicMock()
+        action._templar.template.side_effect = lambda value: value
+
+        action.run(task_vars={})
+
+        password_cache = cache.FileCache(str(tmpdir))
+        assert password_cache.get(*user_utils.password_cache_key(
+            password_cache, "http://task:8080", "alice", "pass",
+        )) is True
+
+    @pytest.mark.parametrize("password_cache_ttl", [0, 60])
+    def test_ignore_user_hash_with_password(
+        self, mocker, tmpdir, password_cache_ttl,
+    ):
+        mocker.patch.object(user_utils, "HAS_BCRYPT", False)
+        action = get_action(
+            mocker, user, "user", self.args(
+                tmpdir, password_hash="mine",
+                password_cache_ttl=password_cache_ttl,
+            ), dict(changed=True),
+        )
+
+        action.run(task_vars={})
+
+        assert "password_hash" not in module_args(action)
+
+    def test_keep_user_hash_without_password(self, mocker, tmpdir):
+        mocker.patch.object(user_utils, "HAS_BCRYPT", True)
+        hash_password = mocker.patch.object(user_utils, "hash_password")
+        action = get_action(
+            mocker, user, "user",
+            self.args(tmpdir, password=None, password_hash="mine"),
+            dict(changed=True),
+        )
+
+        action.run(task_vars={})
+
+        assert "mine" == module_args(action)["password_hash"]
+        hash_password.assert_not_called()
+
+    def test_no_bcrypt_on_controller(self, mocker, tmpdir):
+        mocker.patch.object(user_utils, "HAS_BCRYPT", False)
+        action = get_action(
+            mocker, user, "user", self.args(tmpdir), dict(changed=True),
+        )
+
+        action.run(task_vars={})
+
+        assert "password_hash" not in module_args(action)
+
+    def test_do_not_hash_when_running_on_controller(self, mocker, tmpdir):
+        mocker.patch.object(user_utils, "HAS_BCRYPT", True)
+        hash_password = mocker.patch.object(user_utils, "hash_password")
+        run_module = mocker.patch.object(controller, "run_module")
+        run_module.return_value = dict(changed=False)
+        mocker.patch.object(arguments, "_CLIENTS", None)
+        action = get_action(mocker, user, "user", self.args(tmpdir), None)
+
+        action.run(task_vars=dict(sensu_go_controller_execution=True))
+
+        hash_password.assert_not_called()
+        assert "password_hash" not in run_module.call_args[0][1]
+
+    def test_remember_verified_password(self, mocker, tmpdir):
+        mocker.patch.object(user_utils, "HAS_BCRYPT", False)
+        action = get_action(
+            mocker, user, "user", self.args(tmpdir, password_cache_ttl=60),
+            dict(changed=False),
+        )
+
+        action.run(task_vars={})
+
+        password_cache = cache.FileCache(str(tmpdir))
+        assert password_cache.get(*user_utils.password_cache_key(
+            password_cache, "http://a:8080", "alice", "pass",
+        )) is True
+
+    def test_skip_hashing_verified_password(self, mocker, tmpdir):
+        mocker.patch.object(user_utils, "HAS_BCRYPT", True)
+        hash_password = mocker.patch.object(user_utils, "hash_password")
+        password_cache = cache.FileCache(str(tmpdir))
+        password_cache.set(True, None, *user_utils.password_cache_key(
+            password_cache, "http://a:8080", "alice", "pass",
+        ))
+        action = get_action(
+            mocker, user, "user", self.args(tmpdir, password_cache_ttl=60),
+            dict(changed=False),
+        )
+
+        action.run(task_vars={})
+
+        hash_password.assert_not_called()
+        assert "password_hash" not in module_args(action)
+
+    @pytest.mark.parametrize("result,check_mode", [
+        (dict(failed=True, msg="bad"), False),
+        (dict(changed=True), True),
+    ])
+    def test_do_not_remember_unverified_password(
+        self, mocker, tmpdir, result, check_mode,
+    ):
+        mocker.patch.object(user_utils, "HAS_BCRYPT", False)
+        action = get_action(
+            mocker, user, "user", self.args(tmpdir, password_cache_ttl=60),
+            result, check_mode,
+        )
+
+        action.run(task_vars={})
+
+        assert [cache.FileCache.KEY_FILE] == [
+            p.basename for p in tmpdir.listdir()
+        ]
+
+
+class TestUsersActionModule:
+    def test_hash_and_remember_each_password(self, mocker, tmpdir):
+        mocker.patch.object(user_utils, "HAS_BCRYPT", True)
+        mocker.patch.object(
+            user_utils, "hash_password", side_effect=lambda p: p + "-hash",
+        )
+        args = dict(
+            auth=dict(url="http://a:8080", cache_dir=str(tmpdir)),
+            password_cache_ttl=60, users=[
+                dict(name="alice", password="a"), dict(name="bob"),
+                dict(name="carol", password="c"),
+            ],
+        )
+        action = get_action(mocker, users, "users", args, dict(results=[
+            dict(name="alice", failed=False), dict(name="bob", failed=False),
+            dict(name="carol", failed=True),
+        ]))
+
+        action.run(task_vars={})
+
+        assert [
+            dict(name="alice", password="a", password_hash="a-hash"),
+            dict(name="bob"),
+            dict(name="carol", password="c", password_hash="c-hash"),
+        ] == module_args(action)["users"]
+        assert dict(name="bob") == args["users"][1]
+        password_cache = cache.FileCache(str(tmpdir))
+        assert password_cache.get(*user_utils.password_cache_key(
+            password_cache, "http://a:8080", "alice", "a",
+        )) is True
+        assert password_cache.get(*user_utils.password_cache_key(
+            password_cache, "http://a:8080", "carol", "c",
+        )) is None
@@ -156,3 +156,85 @@ class TestGetMutationPayload:
                 ),
             ),
         )
+
+
+class TestGetSensuClient:
+    @staticmethod
+    def auth(**kwargs):
+        auth = dict(
+            url=["http://localhost:8080"], user="admin", password="pass",
+            api_key=None, verify=True, ca_path=None, pool_size=4,
+            cache_dir=None, backend_version=None, retries=0,
+            retry_backoff=1.0, retry_jitter=True,
+            retry_statuses=[429, 500, 502, 503, 504],
+            retry_idempotent_only=True, max_requests_per_second=None,
+            max_in_flight=None, backend_selection="round_robin",
+            cache_objects=False, sync_cache_ttl=0, force_refresh=False,
+        )
+        auth.update(kwargs)
+        return auth
+
+    def test_new_client_for_each_call(self, mocker):
+        mocker.patch.object(arguments, "_CLIENTS", None)
+
+        assert arguments.get_sensu_client(self.auth()) is not \
+            arguments.get_sensu_client(self.auth())
+
+    def test_no_retry_policy_by_default(self, mocker):
+        mocker.patch.object(arguments, "_CLIENTS", None)
+
+        assert arguments.get_sensu_client(self.auth()).retry is None
+
+    def test_retry_policy(self, mocker):
+        mocker.patch.object(arguments, "_CLIENTS", None)
+
+        retry = arguments.get_sensu_client(self.auth(
+            retries=3, retry_statuses=[503],
+        )).retry
+
+        assert 3 == retry.retries
+        assert (503,) == retry.statuses
+
+    def test_throttle(self, mocker, tmpdir):
+        mocker.patch.object(arguments, "_CLIENTS", None)
+
+        sensu_client = arguments.get_sensu_client(self.auth(
+            cache_dir=str(tmpdir), max_in_flight=2,
+        ))
+
+        assert 2 == sensu_client.throttle.max_in_flight
+        assert sensu_client.throttle.rate is None
+        assert sensu_client.throttle.prefix.startswith(str(tmpdir))
+
+    def test_cache_objects(self, mocker, tmpdir):
+        mocker.patch.object(arguments, "_CLIENTS", None)
+
+        sensu_client = arguments.get_sensu_client(self.auth(
+            cache_dir=str(tmpdir), cache_objects=True,
+        ))
+
+        assert sensu_client.cache_objects is True
+
+    def test_sync_cache(self, mocker, tmpdir):
+        mocker.patch.object(arguments, "_CLIENTS", None)
+
+        sensu_client = arguments.get_sensu_client(self.auth(
+            cache_dir=str(tmpdir), sync_cache_ttl=60, force_refresh=True,
+        ))
+
+        assert 60 == sensu_client.sync_cache_ttl
+        assert sensu_client.force_refresh is True
+
+    def test_reuse_clients(self, mocker):
+        mocker.patch.object(arguments, "_CLIENTS", None)
+        arguments.enable_client_reuse()
+
+        sensu_client = arguments.get_sensu_client(self.auth())
+        sensu_client.index_collection("/checks", [])
+
+        assert sensu_client is arguments.get_sensu_client(self.auth())
+        # Prefetched collections do not outlive the module run.
+        assert {} == sensu_client._index
+        assert sensu_client is not arguments.get_sensu_client(
+            self.auth(user="other"),
+        )
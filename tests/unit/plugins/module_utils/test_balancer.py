@@ -0,0 +1,99 @@
+# -*- coding: utf-8 -*-
+# Copyright: (c) 2019, XLAB Steampunk <steampunk@xlab.si>
+#
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+__metaclass__ = type
+
+import sys
+
+import pytest
+
+from ansible_collections.sensu.sensu_go.plugins.module_utils import (
+    balancer, cache,
+)
+
+pytestmark = pytest.mark.skipif(
+    sys.version_info < (2, 7), reason="requires python2.7 or higher"
+)
+
+
+class TestCandidates:
+    def test_single_backend(self):
+        backends = balancer.Balancer(["a"])
+
+        assert ["a"] == backends.candidates()
+        assert ["a"] == backends.candidates()
+
+    def test_round_robin(self, mocker):
+        mocker.patch.object(balancer.random, "randrange", return_value=1)
+        backends = balancer.Balancer(["a", "b", "c"])
+
+        assert [
+            ["b", "c", "a"], ["c", "a", "b"], ["a", "b", "c"],
+        ] == [backends.candidates() for _i in range(3)]
+
+    def test_least_latency(self):
+        backends = balancer.Balancer(["a", "b", "c"], "least_latency")
+        backends.report_success("a", 0.3)
+        backends.report_success("b", 0.1)
+
+        # Backend c has no measurements yet.
+        assert ["c", "b", "a"] == backends.candidates()
+
+    def test_average_latency(self):
+        backends = balancer.Balancer(["a", "b"], "least_latency")
+        backends.report_success("a", 0.1)
+        backends.report_success("b", 0.2)
+        backends.report_success("a", 1.1)
+
+        assert ["b", "a"] == backends.candidates()
+
+    def test_ejected_backends_go_last(self, mocker):
+        mocker.patch.object(balancer.random, "randrange", return_value=0)
+        backends = balancer.Balancer(["a", "b", "c"])
+        backends.report_failure("a")
+
+        assert ["b", "c", "a"] == backends.candidates()
+
+    def test_readmit_after_eject_time(self, mocker):
+        time_mock = mocker.patch.object(balancer.time, "time")
+        time_mock.return_value = 100
+        backends = balancer.Balancer(["a", "b"], "least_latency")
+        backends.report_failure("a")
+        time_mock.return_value = 100 + backends.EJECT_TIME
+
+        assert "a" in backends.candidates()[0]
+
+    def test_success_readmits_backend(self):
+        backends = balancer.Balancer(["a", "b"], "least_latency")
+        backends.report_failure("a")
+        backends.report_success("a", 0.1)
+        backends.report_success("b", 0.2)
+
+        assert ["a", "b"] == backends.candidates()
+
+
+class TestSharedEjections:
+    def test_share_ejections(self, tmpdir):
+        file_cache = cache.FileCache(str(tmpdir))
+        balancer.Balancer(["a", "b"], cache=file_cache).report_failure("a")
+
+        backends = balancer.Balancer(["a", "b"], "least_latency", file_cache)
+
+        assert ["b", "a"] == backends.candidates()
+
+    def test_clear_ejection_on_success(self, tmpdir):
+        file_cache = cache.FileCache(str(tmpdir))
+        backends = balancer.Balancer(["a", "b"], cache=file_cache)
+        backends.report_failure("a")
+        backends.report_success("a", 0.1)
+
+        assert file_cache.get("ejected", "a") is None
+
+    def test_single_backend_is_never_ejected(self, tmpdir):
+        file_cache = cache.FileCache(str(tmpdir))
+        balancer.Balancer(["a"], cache=file_cache).report_failure("a")
+
+        assert file_cache.get("ejected", "a") is None
@@ -0,0 +1,127 @@
+# -*- coding: utf-8 -*-
+# Copyright: (c) 2019, XLAB Steampunk <steampunk@xlab.si>
+#
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+__metaclass__ = type
+
+import os
+import stat
+import sys
+
+import pytest
+
+from ansible_collections.sensu.sensu_go.plugins.module_utils import cache
+
+pytestmark = pytest.mark.skipif(
+    sys.version_info < (2, 7), reason="requires python2.7 or higher"
+)
+
+
+class TestFileCache:
+    def test_missing_value(self, tmpdir):
+        c = cache.FileCache(str(tmpdir))
+
+        assert c.get("missing", "key") is None
+
+    def test_set_and_get(self, tmpdir):
+        c = cache.FileCache(str(tmpdir))
+
+        c.set(dict(a=[1, 2]), None, "some", "key")
+
+        assert dict(a=[1, 2]) == c.get("some", "key")
+        assert c.get("some", "other") is None
+
+    def test_overwrite(self, tmpdir):
+        c = cache.FileCache(str(tmpdir))
+
+        c.set("old", None, "key")
+        c.set("new", None, "key")
+
+        assert "new" == c.get("key")
+
+    def test_expired_value(self, mocker, tmpdir):
+        mocker.patch.object(cache.time, "time", return_value=100)
+        c = cache.FileCache(str(tmpdir))
+
+        c.set("value", 100, "key")
+
+        assert c.get("key") is None
+        assert [] == tmpdir.listdir()
+
+    def test_valid_value(self, mocker, tmpdir):
+        mocker.patch.object(cache.time, "time", return_value=99)
+        c = cache.FileCache(str(tmpdir))
+
+        c.set("value", 100, "key")
+
+        assert "value" == c.get("key")
+
+    def test_delete(self, tmpdir):
+        c = cache.FileCache(str(tmpdir))
+        c.set("value", None, "key")
+
+        c.delete("key")
+        c.delete("missing")
+
+        assert c.get("key") is None
+
+    def test_keys_are_not_stored_in_plain_text(self, tmpdir):
+        c = cache.FileCache(str(tmpdir))
+
+        c.set("value", None, "secret-password")
+
+        entry, = tmpdir.listdir()
+        assert "secret-password" not in entry.basename
+        assert "secret-password" not in entry.read()
+
+    def test_digest(self, tmpdir):
+        c = cache.FileCache(str(tmpdir))
+
+        digest = c.digest("secret-password")
+
+        assert "secret-password" not in digest
+        assert digest == c.digest("secret-password")
+        assert digest != c.digest("other-password")
+
+    def test_digest_key_outlives_cache_object(self, tmpdir):
+        digest = cache.FileCache(str(tmpdir)).digest("secret-password")
+
+        assert digest == cache.FileCache(str(tmpdir)).digest("secret-password")
+        key_file = tmpdir.join(cache.FileCache.KEY_FILE)
+        assert 0o600 == stat.S_IMODE(os.stat(str(key_file)).st_mode)
+
+    def test_digest_ignores_readable_key(self, tmpdir):
+        key_file = tmpdir.join(cache.FileCache.KEY_FILE)
+        key_file.write("k" * 32)
+        key_file.chmod(0o644)
+
+        digest = cache.FileCache(str(tmpdir)).digest("secret-password")
+
+        assert digest != cache.FileCache(str(tmpdir)).digest("secret-password")
+
+    def test_create_private_directory(self, tmpdir):
+        directory = tmpdir.join("sub", "dir")
+        c = cache.FileCache(str(directory))
+
+        c.set("value", None, "key")
+
+        assert 0o700 == stat.S_IMODE(os.stat(str(directory)).st_mode)
+        entry, = directory.listdir()
+        assert 0o600 == stat.S_IMODE(os.stat(str(entry)).st_mode)
+
+    def test_invalid_content(self, tmpdir):
+        c = cache.FileCache(str(tmpdir))
+        c.set("value", None, "key")
+        tmpdir.listdir()[0].write("{ not a json")
+
+        assert c.get("key") is None
+
+    def test_unwritable_directory(self, tmpdir):
+        c = cache.FileCache(str(tmpdir.join("file")))
+        tmpdir.join("file").write("")
+
+        c.set("value", None, "key")
+
+        assert c.get("key") is None
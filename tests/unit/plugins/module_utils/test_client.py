@@ -11,7 +11,7 @@ import sys
 import pytest
 
 from ansible_collections.sensu.sensu_go.plugins.module_utils import (
-    client, errors, http
+    cache, client, errors, http
 )
 
 pytestmark = pytest.mark.skipif(
@@ -128,6 +128,51 @@ class TestVersion:
 
         assert c.version == c.BAD_VERSION
 
+    def test_pinned_version(self, mocker):
+        c = client.Client(
+            "http://example.com/", "u", "p", None, True, None,
+            backend_version="6.2.1",
+        )
+        get = mocker.patch.object(c, "get")
+
+        assert c.version == "6.2.1"
+        get.assert_not_called()
+
+    def test_store_version_in_cache(self, mocker, tmpdir):
+        c = client.Client(
+            "http://example.com/", "u", "p", None, True, None,
+            cache_dir=str(tmpdir),
+        )
+        mocker.patch.object(c, "get").return_value = http.Response(
+            200, '{"sensu_backend":"5.21.0#sha-here"}',
+        )
+
+        assert c.version == "5.21.0"
+        assert c.cache.get("version", "http://example.com") == "5.21.0#sha-here"
+
+    def test_use_cached_version(self, mocker, tmpdir):
+        c = client.Client(
+            "http://example.com/", "u", "p", None, True, None,
+            cache_dir=str(tmpdir),
+        )
+        c.cache.set("6.0.0", None, "version", "http://example.com")
+        get = mocker.patch.object(c, "get")
+
+        assert c.version == "6.0.0"
+        get.assert_not_called()
+
+    def test_cached_version_is_per_backend(self, mocker, tmpdir):
+        c = client.Client(
+            "http://other.com/", "u", "p", None, True, None,
+            cache_dir=str(tmpdir),
+        )
+        c.cache.set("6.0.0", None, "version", "http://example.com")
+        mocker.patch.object(c, "get").return_value = http.Response(
+            200, '{"sensu_backend":"5.21.0"}',
+        )
+
+        assert c.version == "5.21.0"
+
 
 class TestRequest:
     def test_request_payload_token(self, mocker):
@@ -229,6 +274,142 @@ class TestGet:
         c.request.assert_called_with("GET", "/path")
 
 
+class TestObjectCache:
+    @staticmethod
+    def client(tmpdir, cache_objects=True):
+        return client.Client(
+            "http://example.com/", None, None, "key", True, None,
+            cache_dir=str(tmpdir), cache_objects=cache_objects,
+        )
+
+    def test_disabled_by_default(self, tmpdir):
+        c = client.Client(
+            "http://example.com/", None, None, "key", True, None,
+            cache_dir=str(tmpdir),
+        )
+
+        assert c.cache_objects is False
+
+    def test_requires_cache_dir(self):
+        c = client.Client(
+            "http://example.com/", None, None, "key", True, None,
+            cache_objects=True,
+        )
+
+        assert c.cache_objects is False
+
+    def test_skip_collections(self, mocker, tmpdir):
+        c = self.client(tmpdir)
+        c.request = mocker.Mock(return_value=http.Response(
+            200, '[{"a": 1}]', headers=dict(ETag='"v1"'),
+        ))
+
+        c.get("/path")
+
+        c.request.assert_called_once_with("GET", "/path")
+        assert [] == tmpdir.listdir()
+
+    def test_store_object(self, tmpdir):
+        c = self.client(tmpdir)
+        c.request = lambda *_a, **_k: http.Response(
+            200, '{"a": 1}', headers=dict(ETag='"v1"'),
+        )
+
+        assert dict(a=1) == c.get("/path", cache_object=True).json
+        assert dict(etag='"v1"', object=dict(a=1)) == c.cache.get(
+            "object", "http://example.com", "/path",
+        )
+
+    def test_skip_objects_without_etag(self, tmpdir):
+        c = self.client(tmpdir)
+        c.request = lambda *_a, **_k: http.Response(200, '{"a": 1}')
+
+        c.get("/path", cache_object=True)
+
+        assert c.cache.get("object", "http://example.com", "/path") is None
+
+    def test_use_cached_object_if_not_modified(self, mocker, tmpdir):
+        c = self.client(tmpdir)
+        c.cache.set(
+            dict(etag='"v1"', object=dict(a=1)), None,
+            "object", "http://example.com", "/path",
+        )
+        c.request = mocker.Mock(return_value=http.Response(304, ""))
+
+        resp = c.get("/path", cache_object=True)
+
+        assert (200, dict(a=1)) == (resp.status, resp.json)
+        c.request.assert_called_once_with(
+            "GET", "/path", headers={"If-None-Match": '"v1"'},
+        )
+
+    def test_replace_modified_object(self, mocker, tmpdir):
+        c = self.client(tmpdir)
+        c.cache.set(
+            dict(etag='"v1"', object=dict(a=1)), None,
+            "object", "http://example.com", "/path",
+        )
+        c.request = mocker.Mock(return_value=http.Response(
+            200, '{"a": 2}', headers=dict(ETag='"v2"'),
+        ))
+
+        assert dict(a=2) == c.get("/path", cache_object=True).json
+        assert dict(etag='"v2"', object=dict(a=2)) == c.cache.get(
+            "object", "http://example.com", "/path",
+        )
+
+    def test_forget_deleted_object(self, mocker, tmpdir):
+        c = self.client(tmpdir)
+        c.cache.set(
+            dict(etag='"v1"', object=dict(a=1)), None,
+            "object", "http://example.com", "/path",
+        )
+        c.request = mocker.Mock(return_value=http.Response(404, ""))
+
+        assert 404 == c.get("/path", cache_object=True).status
+        assert c.cache.get("object", "http://example.com", "/path") is None
+
+    @pytest.mark.parametrize("method,args", [
+        ("put", ({},)), ("delete", ()),
+    ])
+    def test_forget_modified_object(self, mocker, tmpdir, method, args):
+        c = self.client(tmpdir)
+        c.cache.set(
+            dict(etag='"v1"', object=dict(a=1)), None,
+            "object", "http://example.com", "/path",
+        )
+        c.request = mocker.Mock()
+
+        getattr(c, method)("/path", *args)
+
+        assert c.cache.get("object", "http://example.com", "/path") is None
+
+    def test_objects_are_per_backend(self, mocker, tmpdir):
+        c = self.client(tmpdir)
+        c.cache.set(
+            dict(etag='"v1"', object=dict(a=1)), None,
+            "object", "http://other.com", "/path",
+        )
+        c.request = mocker.Mock(return_value=http.Response(200, "{}"))
+
+        c.get("/path", cache_object=True)
+
+        c.request.assert_called_once_with("GET", "/path")
+
+    def test_extra_request_headers(self, mocker):
+        request = mocker.patch.object(http, "request")
+        request.return_value = http.Response(200, "")
+        c = client.Client(
+            "http://example.com/", None, None, "key", True, None,
+        )
+
+        c.request("GET", "/path", headers={"If-None-Match": "tag"})
+
+        assert dict(
+            Authorization="Key key", **{"If-None-Match": "tag"}
+        ) == request.call_args[1]["headers"]
+
+
 class TestPut:
     def test_put(self, mocker):
         c = client.Client(
@@ -293,3 +474,363 @@ class TestValidateAuthData:
 
         with pytest.raises(errors.SensuError, match="500"):
             c.validate_auth_data("check_user", "check_pass")
+
+
+class TestConnectionPool:
+    def test_pool_disabled_by_default(self, mocker):
+        request = mocker.patch.object(http, "request")
+        request.return_value = http.Response(200, "data")
+        c = client.Client("http://example.com/", None, None, "key", True, None)
+
+        c.get("/path")
+
+        assert c.pool is None
+        assert "pool" not in request.call_args[1]
+        assert dict(created=0, reused=0) == c.connection_stats
+
+    def test_pool_is_passed_to_requests(self, mocker):
+        request = mocker.patch.object(http, "request")
+        request.side_effect = (
+            http.Response(200, '{"access_token": "token"}'),
+            http.Response(200, "data"),
+        )
+        c = client.Client(
+            "http://example.com/", "user", "pass", None, False, "/ca", 3,
+        )
+
+        c.get("/path")
+
+        assert 3 == c.pool.size
+        assert c.pool.validate_certs is False
+        assert "/ca" == c.pool.ca_path
+        for call in request.call_args_list:
+            assert c.pool is call[1]["pool"]
+
+
+class TestRetryPolicy:
+    def test_no_retries_by_default(self, mocker):
+        request = mocker.patch.object(http, "request")
+        request.return_value = http.Response(200, "data")
+        c = client.Client("http://example.com/", None, None, "key", True, None)
+
+        c.get("/path")
+
+        assert "retry" not in request.call_args[1]
+
+    def test_policy_is_passed_to_requests(self, mocker):
+        request = mocker.patch.object(http, "request")
+        request.side_effect = (
+            http.Response(200, '{"access_token": "token"}'),
+            http.Response(200, "data"),
+        )
+        policy = http.RetryPolicy(3)
+        c = client.Client(
+            "http://example.com/", "user", "pass", None, True, None,
+            retry=policy,
+        )
+
+        c.get("/path")
+
+        for call in request.call_args_list:
+            assert policy is call[1]["retry"]
+
+
+class TestFailover:
+    def test_fail_over_to_next_backend(self, mocker):
+        mocker.patch.object(client.balancer.random, "randrange", return_value=0)
+        request = mocker.patch.object(http, "request")
+        request.side_effect = (
+            errors.HttpConnectionError("refused"), http.Response(200, "data"),
+        )
+        c = client.Client(
+            ["http://a.com/", "http://b.com"], None, None, "key", True, None,
+        )
+
+        resp = c.get("/path")
+
+        assert "data" == resp.data
+        assert [
+            "http://a.com/path", "http://b.com/path",
+        ] == [call[0][1] for call in request.call_args_list]
+        # Backend a is skipped until it recovers.
+        assert ["http://b.com", "http://a.com"] == c.backends.candidates()
+
+    def test_all_backends_fail(self, mocker):
+        request = mocker.patch.object(http, "request")
+        request.side_effect = errors.HttpConnectionError("refused")
+        c = client.Client(
+            ["http://a.com", "http://b.com"], None, None, "key", True, None,
+        )
+
+        with pytest.raises(errors.HttpConnectionError):
+            c.get("/path")
+
+        assert 2 == request.call_count
+
+    def test_no_failover_for_post(self, mocker):
+        request = mocker.patch.object(http, "request")
+        request.side_effect = errors.HttpConnectionError("refused")
+        c = client.Client(
+            ["http://a.com", "http://b.com"], None, None, "key", True, None,
+        )
+
+        with pytest.raises(errors.HttpConnectionError):
+            c.request("POST", "/path")
+
+        assert 1 == request.call_count
+
+    def test_first_address_identifies_cluster(self):
+        c = client.Client(
+            ["http://a.com/", "http://b.com"], None, None, "key", True, None,
+        )
+
+        assert "http://a.com" == c.address
+
+
+class TestTokenCache:
+    @staticmethod
+    def token(access, expires_at=2000, refresh="refresh"):
+        return (
+            '{{"access_token": "{0}", "expires_at": {1}, '
+            '"refresh_token": "{2}"}}'.format(access, expires_at, refresh)
+        )
+
+    def test_cache_disabled(self, mocker):
+        c = client.Client("http://example.com/", "u", "p", None, True, None)
+
+        assert c.cache is None
+
+    def test_store_token_in_cache(self, mocker, tmpdir):
+        mocker.patch.object(client.time, "time", return_value=1000)
+        request = mocker.patch.object(http, "request")
+        request.return_value = http.Response(200, self.token("token"))
+        c = client.Client(
+            "http://example.com/", "u", "p", None, True, None,
+            cache_dir=str(tmpdir),
+        )
+
+        assert dict(Authorization="Bearer token") == c.auth_header
+        assert "token" == c.cache.get(
+            "token", "http://example.com", "u", c.cache.digest("p"),
+        )["access_token"]
+
+    def test_use_cached_token(self, mocker, tmpdir):
+        mocker.patch.object(client.time, "time", return_value=1000)
+        request = mocker.patch.object(http, "request")
+        request.return_value = http.Response(200, self.token("token"))
+        client.Client(
+            "http://example.com/", "u", "p", None, True, None,
+            cache_dir=str(tmpdir),
+        ).auth_header
+        request.reset_mock()
+
+        c = client.Client(
+            "http://example.com/", "u", "p", None, True, None,
+            cache_dir=str(tmpdir),
+        )
+
+        assert dict(Authorization="Bearer token") == c.auth_header
+        request.assert_not_called()
+
+    def test_cache_key_contains_credentials(self, mocker, tmpdir):
+        mocker.patch.object(client.time, "time", return_value=1000)
+        request = mocker.patch.object(http, "request")
+        request.side_effect = (
+            http.Response(200, self.token("first")),
+            http.Response(200, self.token("second")),
+        )
+        client.Client(
+            "http://example.com/", "u", "p", None, True, None,
+            cache_dir=str(tmpdir),
+        ).auth_header
+
+        c = client.Client(
+            "http://example.com/", "u", "other", None, True, None,
+            cache_dir=str(tmpdir),
+        )
+
+        assert dict(Authorization="Bearer second") == c.auth_header
+
+    def test_refresh_expired_token(self, mocker, tmpdir):
+        time = mocker.patch.object(client.time, "time", return_value=1000)
+        request = mocker.patch.object(http, "request")
+        request.side_effect = (
+            http.Response(200, self.token("old", 1100, "old-refresh")),
+            http.Response(200, self.token("new", 2000, "new-refresh")),
+        )
+        client.Client(
+            "http://example.com/", "u", "p", None, True, None,
+            cache_dir=str(tmpdir),
+        ).auth_header
+        time.return_value = 1090
+
+        c = client.Client(
+            "http://example.com/", "u", "p", None, True, None,
+            cache_dir=str(tmpdir),
+        )
+
+        assert dict(Authorization="Bearer new") == c.auth_header
+        request.assert_called_with(
+            "POST", "http://example.com/auth/token",
+            payload=dict(refresh_token="old-refresh"),
+            headers=dict(Authorization="Bearer old"),
+            validate_certs=True, ca_path=None,
+        )
+        assert "new" == c.cache.get(
+            "token", "http://example.com", "u", c.cache.digest("p"),
+        )["access_token"]
+
+    def test_login_if_refresh_fails(self, mocker, tmpdir):
+        time = mocker.patch.object(client.time, "time", return_value=1000)
+        request = mocker.patch.object(http, "request")
+        request.side_effect = (
+            http.Response(200, self.token("old", 1100)),
+            http.Response(401, ""),
+            http.Response(200, self.token("new", 3000)),
+        )
+        client.Client(
+            "http://example.com/", "u", "p", None, True, None,
+            cache_dir=str(tmpdir),
+        ).auth_header
+        time.return_value = 2000
+
+        c = client.Client(
+            "http://example.com/", "u", "p", None, True, None,
+            cache_dir=str(tmpdir),
+        )
+
+        assert dict(Authorization="Bearer new") == c.auth_header
+        assert ("GET", "http://example.com/auth") == request.call_args[0]
+
+    def test_do_not_cache_tokens_without_expiration(self, mocker, tmpdir):
+        request = mocker.patch.object(http, "request")
+        request.return_value = http.Response(200, '{"access_token": "token"}')
+        c = client.Client(
+            "http://example.com/", "u", "p", None, True, None,
+            cache_dir=str(tmpdir),
+        )
+
+        assert dict(Authorization="Bearer token") == c.auth_header
+        assert [cache.FileCache.KEY_FILE] == [
+            p.basename for p in tmpdir.listdir()
+        ]
+
+    def test_relogin_on_revoked_cached_token(self, mocker, tmpdir):
+        mocker.patch.object(client.time, "time", return_value=1000)
+        request = mocker.patch.object(http, "request")
+        request.side_effect = (
+            http.Response(200, self.token("revoked")),
+            http.Response(401, ""),
+            http.Response(200, self.token("fresh")),
+            http.Response(200, "data"),
+        )
+        client.Client(
+            "http://example.com/", "u", "p", None, True, None,
+            cache_dir=str(tmpdir),
+        ).auth_header
+
+        resp = client.Client(
+            "http://example.com/", "u", "p", None, True, None,
+            cache_dir=str(tmpdir),
+        ).get("/path")
+
+        assert 200 == resp.status
+        request.assert_called_with(
+            "GET", "http://example.com/path", payload=None,
+            headers=dict(Authorization="Bearer fresh"),
+            validate_certs=True, ca_path=None,
+        )
+
+    def test_do_not_relogin_with_fresh_token(self, mocker, tmpdir):
+        mocker.patch.object(client.time, "time", return_value=1000)
+        request = mocker.patch.object(http, "request")
+        request.side_effect = (
+            http.Response(200, self.token("token")),
+            http.Response(401, ""),
+        )
+
+        with pytest.raises(errors.SensuError, match="credentials"):
+            client.Client(
+                "http://example.com/", "u", "p", None, True, None,
+                cache_dir=str(tmpdir),
+            ).get("/path")
+
+        assert 2 == request.call_count
+
+
+class TestIndexCollection:
+    @staticmethod
+    def indexed_client(mocker):
+        c = client.Client("http://example.com/", None, None, "key", True, None)
+        c.request = mocker.Mock()
+        c.index_collection("/api/core/v2/namespaces/default/checks", [
+            dict(metadata=dict(name="a b"), command="a"),
+            dict(metadata=dict(name="c"), command="c"),
+        ])
+        return c
+
+    def test_index_objects_without_metadata(self, mocker):
+        c = client.Client("http://example.com/", None, None, "key", True, None)
+        c.request = mocker.Mock()
+        c.index_collection("/api/core/v2/namespaces", [
+            dict(name="a"), dict(name="b"),
+        ])
+
+        assert dict(name="b") == c.get("/api/core/v2/namespaces/b").json
+        c.request.assert_not_called()
+
+    def test_get_indexed_object(self, mocker):
+        c = self.indexed_client(mocker)
+
+        resp = c.get("/api/core/v2/namespaces/default/checks/a%20b")
+
+        assert 200 == resp.status
+        assert dict(metadata=dict(name="a b"), command="a") == resp.json
+        c.request.assert_not_called()
+
+    def test_get_missing_object(self, mocker):
+        c = self.indexed_client(mocker)
+
+        resp = c.get("/api/core/v2/namespaces/default/checks/missing")
+
+        assert 404 == resp.status
+        c.request.assert_not_called()
+
+    def test_get_object_from_other_collection(self, mocker):
+        c = self.indexed_client(mocker)
+
+        c.get("/api/core/v2/namespaces/other/checks/c")
+
+        c.request.assert_called_once_with(
+            "GET", "/api/core/v2/namespaces/other/checks/c",
+        )
+
+    def test_get_modified_object(self, mocker):
+        c = self.indexed_client(mocker)
+
+        c.put("/api/core/v2/namespaces/default/checks/c", dict(command="d"))
+        c.get("/api/core/v2/namespaces/default/checks/c")
+
+        c.request.assert_called_with(
+            "GET", "/api/core/v2/namespaces/default/checks/c",
+        )
+        assert 2 == c.request.call_count
+
+    def test_get_created_object(self, mocker):
+        c = self.indexed_client(mocker)
+
+        c.put("/api/core/v2/namespaces/default/checks/new", dict(command="d"))
+        c.get("/api/core/v2/namespaces/default/checks/new")
+
+        assert 2 == c.request.call_count
+
+    def test_get_deleted_object(self, mocker):
+        c = self.indexed_client(mocker)
+
+        c.delete("/api/core/v2/namespaces/default/checks/c")
+        resp = c.get("/api/core/v2/namespaces/default/checks/c")
+
+        assert 404 == resp.status
+        c.request.assert_called_once_with(
+            "DELETE", "/api/core/v2/namespaces/default/checks/c",
+        )
@@ -0,0 +1,210 @@
+# -*- coding: utf-8 -*-
+# Copyright: (c) 2019, XLAB Steampunk <steampunk@xlab.si>
+#
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+__metaclass__ = type
+
+import json
+import sys
+
+import pytest
+
+from ansible_collections.sensu.sensu_go.plugins.module_utils import (
+    debug, http, metrics,
+)
+
+pytestmark = pytest.mark.skipif(
+    sys.version_info < (2, 7), reason="requires python2.7 or higher"
+)
+
+
+def read_entries(path):
+    with open(path) as f:
+        return [json.loads(line) for line in f]
+
+
+class TestLevelFromEnv:
+    @pytest.mark.parametrize("value,level", [
+        ("yes", "debug"), ("True", "debug"), ("warning", "warning"),
+        ("", None), ("no", None),
+    ])
+    def test_level(self, value, level):
+        assert level == debug._level_from_env(value)
+
+
+class TestLogger:
+    def test_buffer_entries(self, tmpdir):
+        path = str(tmpdir.join("debug.log"))
+        logger = debug.Logger(path)
+
+        logger.log("info", "Message", a=1)
+
+        assert not tmpdir.join("debug.log").exists()
+        logger.flush()
+        entry, = read_entries(path)
+        assert "info" == entry["level"]
+        assert "Message" == entry["message"]
+        assert metrics.RUN_ID == entry["run"]
+        assert 1 == entry["a"]
+
+    def test_flush_full_buffer(self, mocker, tmpdir):
+        mocker.patch.object(debug.Logger, "BUFFER_SIZE", 1)
+        path = str(tmpdir.join("debug.log"))
+
+        debug.Logger(path).log("info", "Message")
+
+        assert 1 == len(read_entries(path))
+
+    def test_flush_errors(self, tmpdir):
+        path = str(tmpdir.join("debug.log"))
+
+        debug.Logger(path).log("error", "Message")
+
+        assert 1 == len(read_entries(path))
+
+    def test_skip_lower_levels(self, tmpdir):
+        path = str(tmpdir.join("debug.log"))
+        logger = debug.Logger(path, level="warning")
+
+        logger.log("info", "Skipped")
+        logger.log("warning", "Logged")
+        logger.flush()
+
+        assert ["Logged"] == [e["message"] for e in read_entries(path)]
+
+    def test_ignore_write_errors(self, tmpdir):
+        logger = debug.Logger(str(tmpdir.join("missing", "debug.log")))
+
+        logger.log("error", "Message")
+
+
+class TestLogRequest:
+    def test_log_request(self, tmpdir):
+        path = str(tmpdir.join("debug.log"))
+        logger = debug.Logger(path)
+
+        logger.log_request(
+            "PUT", "http://a/path", dict(a=1), http.Response(201, b"data"),
+        )
+        logger.flush()
+
+        entry, = read_entries(path)
+        assert "debug" == entry["level"]
+        assert "201 PUT http://a/path" == entry["message"]
+        assert ('{"a": 1}', "data") == (entry["payload"], entry["response"])
+
+    def test_truncate_bodies(self, tmpdir):
+        path = str(tmpdir.join("debug.log"))
+        logger = debug.Logger(path, max_body=4)
+
+        logger.log_request("GET", "http://a", None, http.Response(200, "a" * 10))
+        logger.flush()
+
+        entry, = read_entries(path)
+        assert entry["payload"] is None
+        assert "aaaa... (6 more characters)" == entry["response"]
+
+    def test_omit_bodies(self, tmpdir):
+        path = str(tmpdir.join("debug.log"))
+        logger = debug.Logger(path, max_body=0)
+
+        logger.log_request("GET", "http://a", None, http.Response(200, "a"))
+        logger.flush()
+
+        entry, = read_entries(path)
+        assert entry["response"] is None
+
+    def test_sample_successful_requests(self, mocker, tmpdir):
+        mocker.patch.object(debug.random, "random", return_value=0.5)
+        path = str(tmpdir.join("debug.log"))
+        logger = debug.Logger(path, sample_rate=0.1)
+
+        logger.log_request("GET", "http://a", None, http.Response(200, ""))
+        logger.log_request("GET", "http://b", None, http.Response(500, ""))
+        logger.log_request("GET", "http://c", None, comment="refused")
+        logger.flush()
+
+        assert [
+            ("warning", 500), ("error", None),
+        ] == [(e["level"], e["status"]) for e in read_entries(path)]
+
+
+class TestRotation:
+    def test_rotate_big_file(self, tmpdir):
+        path = str(tmpdir.join("debug.log"))
+        tmpdir.join("debug.log").write("x" * 100)
+        tmpdir.join("debug.log.1").write("old")
+        logger = debug.Logger(path, max_size=120, backups=2)
+
+        logger.log("error", "Message")
+
+        assert "x" * 100 == tmpdir.join("debug.log.1").read()
+        assert "old" == tmpdir.join("debug.log.2").read()
+        assert 1 == len(read_entries(path))
+
+    def test_keep_small_file(self, tmpdir):
+        path = str(tmpdir.join("debug.log"))
+        tmpdir.join("debug.log").write("")
+        logger = debug.Logger(path, max_size=1000)
+
+        logger.log("error", "Message")
+
+        assert not tmpdir.join("debug.log.1").exists()
+
+    def test_no_backups(self, tmpdir):
+        path = str(tmpdir.join("debug.log"))
+        tmpdir.join("debug.log").write("x" * 100)
+        logger = debug.Logger(path, max_size=10, backups=0)
+
+        logger.log("error", "Message")
+
+        assert 1 == len(read_entries(path))
+        assert ["debug.log"] == [p.basename for p in tmpdir.listdir()]
+
+
+class TestModuleFunctions:
+    def test_disabled(self, mocker):
+        mocker.patch.object(debug, "LOGGER", None)
+
+        debug.log("Message {0}", 1)
+        debug.log_request("GET", "http://a", None)
+        debug.flush()
+
+    def test_enabled(self, mocker):
+        logger = mocker.patch.object(debug, "LOGGER")
+
+        debug.log("Message {0}", 1)
+        debug.log_request("GET", "http://a", None)
+
+        logger.log.assert_called_once_with("info", "Message 1")
+        logger.log_request.assert_called_once_with(
+            "GET", "http://a", None, None, None,
+        )
+
+
+class TestConfigure:
+    def test_enable(self, mocker, monkeypatch, tmpdir):
+        mocker.patch.object(debug, "LOGGER", None)
+        mocker.patch.object(debug, "DEBUG", False)
+        path = str(tmpdir.join("debug.log"))
+        monkeypatch.setenv("SENSU_ANSIBLE_DEBUG", "warning")
+        monkeypatch.setenv("SENSU_ANSIBLE_DEBUG_LOG", path)
+
+        debug.configure()
+
+        assert path == debug.LOGGER.path
+        assert debug.LEVELS["warning"] == debug.LOGGER.level
+        assert debug.DEBUG is True
+
+    def test_flush_previous_logger(self, mocker, monkeypatch):
+        logger = mocker.patch.object(debug, "LOGGER")
+        mocker.patch.object(debug, "DEBUG", True)
+        monkeypatch.delenv("SENSU_ANSIBLE_DEBUG", raising=False)
+
+        debug.configure()
+
+        logger.flush.assert_called_once_with()
+        assert debug.LOGGER is None
+        assert debug.DEBUG is False
@@ -0,0 +1,118 @@
+# -*- coding: utf-8 -*-
+# Copyright: (c) 2019, XLAB Steampunk <steampunk@xlab.si>
+#
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+__metaclass__ = type
+
+import sys
+
+import pytest
+
+from ansible_collections.sensu.sensu_go.plugins.module_utils import (
+    errors, event_utils, http,
+)
+
+pytestmark = pytest.mark.skipif(
+    sys.version_info < (2, 7), reason="requires python2.7 or higher"
+)
+
+
+class TestGetObjects:
+    def test_get_entity(self, mocker):
+        client = mocker.Mock()
+        client.get.return_value = http.Response(200, '{"entity": "entity"}')
+        resp = event_utils.get_entity(client, 'default', 'entity')
+
+        assert resp == {'entity': 'entity'}
+
+    def test_get_entity_404(self, mocker):
+        client = mocker.Mock()
+        client.get.return_value = http.Response(404, '')
+
+        with pytest.raises(errors.SyncError,
+                           match="Entity with name 'entity' does not exist on remote."):
+            event_utils.get_entity(client, 'default', 'entity')
+
+    def test_get_check(self, mocker):
+        client = mocker.Mock()
+        client.get.return_value = http.Response(200, '{"check": "check"}')
+        resp = event_utils.get_check(client, 'default', 'check')
+
+        assert resp == {'check': 'check'}
+
+    def test_get_check_404(self, mocker):
+        client = mocker.Mock()
+        client.get.return_value = http.Response(404, '')
+
+        with pytest.raises(errors.SyncError,
+                           match="Check with name 'check' does not exist on remote."):
+            event_utils.get_check(client, 'default', 'check')
+
+
+class TestBuildPayload:
+    def test_minimal_payload(self):
+        params = dict(
+            timestamp=None, check_attributes=None, metric_attributes=None,
+        )
+
+        payload = event_utils.build_payload(
+            'ns', params, dict(entity='entity'), dict(check='check'),
+        )
+
+        assert payload == dict(
+            metadata=dict(namespace='ns'),
+            entity=dict(entity='entity'),
+            check=dict(check='check'),
+        )
+
+    def test_attributes(self):
+        check = dict(interval=10)
+        params = dict(
+            timestamp=123,
+            check_attributes=dict(status='critical', output='bad', state=None),
+            metric_attributes=dict(handlers=['h'], points=None),
+        )
+
+        payload = event_utils.build_payload('ns', params, {}, check)
+
+        assert payload['timestamp'] == 123
+        assert payload['check'] == dict(interval=10, status=2, output='bad')
+        assert payload['metrics'] == dict(handlers=['h'])
+        # Shared check object and parameters must stay intact.
+        assert check == dict(interval=10)
+        assert params['check_attributes']['status'] == 'critical'
+
+
+class TestBuildLeanPayload:
+    def test_reference_objects_by_name(self):
+        params = dict(
+            entity='e', check='c', timestamp=None,
+            check_attributes=dict(output='out'), metric_attributes=None,
+        )
+
+        payload = event_utils.build_lean_payload('ns', params)
+
+        assert payload == dict(
+            metadata=dict(namespace='ns'),
+            entity=dict(
+                metadata=dict(name='e', namespace='ns'),
+            ),
+            check=dict(
+                metadata=dict(name='c', namespace='ns'),
+                output='out',
+            ),
+        )
+
+    def test_do_not_assume_entity_class(self):
+        # Lean events can target existing agent entities, so the payload must
+        # not claim that the entity is a proxy entity.
+        params = dict(
+            entity='agent', check='c', timestamp=None, check_attributes=None,
+            metric_attributes=None,
+        )
+
+        payload = event_utils.build_lean_payload('ns', params)
+
+        assert 'entity_class' not in payload['entity']
@@ -6,8 +6,11 @@
 from __future__ import absolute_import, division, print_function
 __metaclass__ = type
 
+import gzip
+import io
 import ssl
 import sys
+import zlib
 
 import pytest
 
@@ -22,6 +25,13 @@ pytestmark = pytest.mark.skipif(
 )
 
 
+def gzip_compress(data):
+    buf = io.BytesIO()
+    with gzip.GzipFile(fileobj=buf, mode="wb") as f:
+        f.write(data)
+    return buf.getvalue()
+
+
 class TestResponse:
     def test_with_valid_json(self):
         resp = http.Response(201, '{"some": ["json", "data", 3]}')
@@ -37,12 +47,108 @@ class TestResponse:
         assert "" == resp.data
         assert resp.json is None
 
+    def test_with_bytes(self):
+        resp = http.Response(200, b'{"a": 1}')
+
+        assert {"a": 1} == resp.json
+
+    def test_parse_once(self, mocker):
+        parse_json = mocker.patch.object(http, "parse_json")
+        parse_json.return_value = {"a": 1}
+        resp = http.Response(200, '{"a": 1}')
+
+        assert resp.json is resp.json
+        parse_json.assert_called_once_with('{"a": 1}')
+
+    def test_remember_invalid_json(self, mocker):
+        parse_json = mocker.patch.object(http, "parse_json")
+        parse_json.side_effect = ValueError("invalid")
+        resp = http.Response(200, "{")
+
+        assert resp.json is None
+        assert resp.json is None
+        parse_json.assert_called_once_with("{")
+
+    def test_preparsed_json(self, mocker):
+        parse_json = mocker.patch.object(http, "parse_json")
+        resp = http.Response(200, None, json=[{"a": 1}])
+
+        assert [{"a": 1}] == resp.json
+        parse_json.assert_not_called()
+
+
+class TestParseJson:
+    @pytest.mark.parametrize("data", [
+        '{"a": [1, 2.5, null, true]}', b'{"a": [1, 2.5, null, true]}',
+    ])
+    def test_parse(self, data):
+        assert {"a": [1, 2.5, None, True]} == http.parse_json(data)
+
+    def test_fast_backend(self, mocker):
+        fast_loads = mocker.patch.object(http, "_fast_loads")
+        fast_loads.return_value = {"fast": True}
+
+        assert {"fast": True} == http.parse_json("{}")
+
+    def test_fall_back_to_stdlib(self, mocker):
+        fast_loads = mocker.patch.object(http, "_fast_loads")
+        fast_loads.side_effect = ValueError("Integer exceeds 64-bit range")
+
+        data = '{"a": 1180591620717411303424}'
+
+        assert {"a": 2 ** 70} == http.parse_json(data)
+
+    def test_invalid(self):
+        with pytest.raises(ValueError):
+            http.parse_json("{")
+
+
+class TestDecompress:
+    def test_gzip(self):
+        body = gzip_compress(b'{"a": 1}')
+
+        assert b'{"a": 1}' == http.decompress(body, "gzip")
+
+    def test_deflate(self):
+        body = zlib.compress(b'{"a": 1}')
+
+        assert b'{"a": 1}' == http.decompress(body, "Deflate")
+
+    def test_raw_deflate(self):
+        compressor = zlib.compressobj(9, zlib.DEFLATED, -zlib.MAX_WBITS)
+        body = compressor.compress(b'{"a": 1}') + compressor.flush()
+
+        assert b'{"a": 1}' == http.decompress(body, "deflate")
+
+    @pytest.mark.parametrize("encoding", [None, "", "identity", "br"])
+    def test_not_compressed(self, encoding):
+        assert b'{"a": 1}' == http.decompress(b'{"a": 1}', encoding)
+
+    def test_already_decompressed_gzip(self):
+        assert b'{"a": 1}' == http.decompress(b'{"a": 1}', "gzip")
+
+    def test_empty_body(self):
+        assert b"" == http.decompress(b"", "gzip")
+
+    def test_decompress_in_chunks(self):
+        data = b'{"a": 1}' * 10000
+        body = gzip_compress(data)
+        decompressor = http.get_decompressor("gzip")
+
+        result = b"".join(
+            decompressor.feed(body[i:i + 100])
+            for i in range(0, len(body), 100)
+        ) + decompressor.flush()
+
+        assert data == result
+
 
 class TestRequest:
     def test_ok_request(self, mocker):
         data_resp = mocker.Mock()
         data_resp.read.return_value = "data"
         data_resp.getcode.return_value = 200
+        data_resp.info.return_value = {"Sensu-Continue": "token"}
         open_url = mocker.patch.object(http, "open_url")
         open_url.return_value = data_resp
 
@@ -50,6 +156,7 @@ class TestRequest:
 
         assert 200 == resp.status
         assert "data" == resp.data
+        assert "token" == resp.headers["Sensu-Continue"]
         assert "GET" == open_url.call_args[1]["method"]
         assert "example.com/path" == open_url.call_args[1]["url"]
 
@@ -66,6 +173,27 @@ class TestRequest:
         assert "GET" == open_url.call_args[1]["method"]
         assert "example.com/bad" == open_url.call_args[1]["url"]
 
+    def test_compressed_response(self, mocker):
+        data_resp = mocker.Mock()
+        data_resp.read.return_value = gzip_compress(b'{"a": 1}')
+        data_resp.getcode.return_value = 200
+        data_resp.info.return_value = {"Content-Encoding": "gzip"}
+        mocker.patch.object(http, "open_url").return_value = data_resp
+
+        resp = http.request("GET", "example.com/path")
+
+        assert dict(a=1) == resp.json
+
+    def test_corrupted_compressed_response(self, mocker):
+        data_resp = mocker.Mock()
+        data_resp.read.return_value = b"\x1f\x8bgarbage"
+        data_resp.getcode.return_value = 200
+        data_resp.info.return_value = {"Content-Encoding": "gzip"}
+        mocker.patch.object(http, "open_url").return_value = data_resp
+
+        with pytest.raises(errors.HttpError, match="decompress"):
+            http.request("GET", "example.com/path")
+
     def test_url_error(self, mocker):
         open_url = mocker.patch.object(http, "open_url")
         open_url.side_effect = URLError("Invalid")
@@ -86,7 +214,10 @@ class TestRequest:
         assert "example.com/path" == open_url.call_args[1]["url"]
         assert '{"a":2}' == open_url.call_args[1]["data"]
         headers = open_url.call_args[1]["headers"]
-        assert {"content-type": "application/json"} == headers
+        assert {
+            "content-type": "application/json",
+            "accept-encoding": "gzip, deflate",
+        } == headers
 
     def test_payload_with_headers(self, mocker):
         data_resp = mocker.Mock()
@@ -103,7 +234,10 @@ class TestRequest:
         assert "example.com/path" == open_url.call_args[1]["url"]
         assert '{"b":4}' == open_url.call_args[1]["data"]
         headers = open_url.call_args[1]["headers"]
-        assert {"content-type": "application/json", "h": "v"} == headers
+        assert {
+            "content-type": "application/json", "h": "v",
+            "accept-encoding": "gzip, deflate",
+        } == headers
 
     def test_payload_overrides_data(self, mocker):
         data_resp = mocker.Mock()
@@ -120,7 +254,10 @@ class TestRequest:
         assert "example.com/path" == open_url.call_args[1]["url"]
         assert '{"a":2}' == open_url.call_args[1]["data"]
         headers = open_url.call_args[1]["headers"]
-        assert {"content-type": "application/json"} == headers
+        assert {
+            "content-type": "application/json",
+            "accept-encoding": "gzip, deflate",
+        } == headers
 
     def test_data(self, mocker):
         data_resp = mocker.Mock()
@@ -134,7 +271,9 @@ class TestRequest:
         assert "PUT" == open_url.call_args[1]["method"]
         assert "example.com/path" == open_url.call_args[1]["url"]
         assert "data" == open_url.call_args[1]["data"]
-        assert open_url.call_args[1]["headers"] is None
+        assert {
+            "accept-encoding": "gzip, deflate",
+        } == open_url.call_args[1]["headers"]
 
     def test_kwargs(self, mocker):
         data_resp = mocker.Mock()
@@ -167,3 +306,446 @@ class TestRequest:
 
         with pytest.raises(ssl.CertificateError):
             http.request("GET", "example.com/bad")
+
+
+class TestRetryPolicy:
+    @pytest.mark.parametrize("method,attempt,status,expected", [
+        ("GET", 0, None, True),
+        ("GET", 0, 503, True),
+        ("PUT", 1, 429, True),
+        ("DELETE", 1, 500, True),
+        ("GET", 0, 404, False),
+        ("GET", 2, 503, False),
+        ("POST", 0, 503, False),
+        ("POST", 0, None, False),
+    ])
+    def test_should_retry(self, method, attempt, status, expected):
+        policy = http.RetryPolicy(2)
+
+        assert expected is policy.should_retry(method, attempt, status)
+
+    def test_retry_non_idempotent_requests(self):
+        policy = http.RetryPolicy(2, idempotent_only=False)
+
+        assert policy.should_retry("POST", 0, 503) is True
+
+    def test_exponential_backoff(self):
+        policy = http.RetryPolicy(10, backoff=0.5, jitter=False)
+
+        assert [0.5, 1, 2, 4, 60] == [policy.delay(a) for a in (0, 1, 2, 3, 9)]
+
+    def test_jitter(self, mocker):
+        uniform = mocker.patch.object(http.random, "uniform", return_value=3)
+        policy = http.RetryPolicy(3, backoff=2)
+
+        assert 3 == policy.delay(1)
+        uniform.assert_called_once_with(0, 4)
+
+    def test_retry_after_seconds(self):
+        policy = http.RetryPolicy(3)
+
+        assert 7 == policy.delay(0, "7")
+
+    def test_retry_after_date(self, mocker):
+        mocker.patch.object(http.time, "time", return_value=1445412470)
+        policy = http.RetryPolicy(3)
+
+        assert 10 == policy.delay(0, "Wed, 21 Oct 2015 07:28:00 GMT")
+
+    def test_invalid_retry_after(self):
+        policy = http.RetryPolicy(3, jitter=False)
+
+        assert 1 == policy.delay(0, "soon")
+
+
+class TestRequestWithRetry:
+    def test_retry_status(self, mocker):
+        sleep = mocker.patch.object(http.time, "sleep")
+        pool = mocker.Mock()
+        pool.request.side_effect = (
+            (503, "Unavailable", "", {"Retry-After": "2"}),
+            (200, "OK", "data", {}),
+        )
+
+        resp = http.request(
+            "GET", "http://example.com/path", pool=pool,
+            retry=http.RetryPolicy(3),
+        )
+
+        assert 200 == resp.status
+        sleep.assert_called_once_with(2)
+
+    def test_retry_connection_error(self, mocker):
+        mocker.patch.object(http.time, "sleep")
+        pool = mocker.Mock()
+        pool.request.side_effect = (
+            http.socket.error("refused"), (200, "OK", "data", {}),
+        )
+
+        resp = http.request(
+            "PUT", "http://example.com/path", pool=pool,
+            retry=http.RetryPolicy(3),
+        )
+
+        assert 200 == resp.status
+
+    def test_throttle_each_attempt(self, mocker):
+        mocker.patch.object(http.time, "sleep")
+        pool = mocker.Mock()
+        pool.request.side_effect = (
+            (503, "Unavailable", "", {}), (200, "OK", "data", {}),
+        )
+        limits = mocker.MagicMock()
+
+        http.request(
+            "GET", "http://example.com/path", pool=pool,
+            retry=http.RetryPolicy(3), throttle=limits,
+        )
+
+        assert 2 == limits.slot.call_count
+
+    def test_give_up(self, mocker):
+        sleep = mocker.patch.object(http.time, "sleep")
+        pool = mocker.Mock()
+        pool.request.return_value = (500, "Error", "", {})
+
+        resp = http.request(
+            "GET", "http://example.com/path", pool=pool,
+            retry=http.RetryPolicy(2),
+        )
+
+        assert 500 == resp.status
+        assert 3 == pool.request.call_count
+        assert 2 == sleep.call_count
+
+    def test_do_not_retry_certificate_errors(self, mocker):
+        sleep = mocker.patch.object(http.time, "sleep")
+        pool = mocker.Mock()
+        pool.request.side_effect = http.CertificateError("bad cert")
+
+        with pytest.raises(errors.HttpError, match="Certificate"):
+            http.request(
+                "GET", "https://example.com/path", pool=pool,
+                retry=http.RetryPolicy(2),
+            )
+
+        sleep.assert_not_called()
+
+    def test_do_not_retry_post(self, mocker):
+        pool = mocker.Mock()
+        pool.request.return_value = (503, "Unavailable", "", {})
+
+        resp = http.request(
+            "POST", "http://example.com/path", pool=pool,
+            retry=http.RetryPolicy(2),
+        )
+
+        assert 503 == resp.status
+        pool.request.assert_called_once()
+
+
+class TestConnectionPool:
+    @staticmethod
+    def mock_connection(mocker, status=200, reason="OK", body="data",
+                        will_close=False):
+        resp = mocker.Mock(
+            status=status, reason=reason, will_close=will_close,
+            msg={"Sensu-Continue": "token"},
+        )
+        resp.read.return_value = body
+        conn = mocker.Mock()
+        conn.getresponse.return_value = resp
+        return conn
+
+    def test_reuse_connection(self, mocker):
+        conn = self.mock_connection(mocker)
+        connection_class = mocker.patch.object(
+            http.http_client, "HTTPConnection", return_value=conn,
+        )
+        pool = http.ConnectionPool(2)
+
+        for i in range(3):
+            status, reason, body, headers = pool.request(
+                "GET", "http://example.com:1234/path?a=b",
+            )
+
+        assert (200, "OK", "data") == (status, reason, body)
+        assert "token" == headers["Sensu-Continue"]
+        connection_class.assert_called_once_with(
+            "example.com", port=1234, timeout=10,
+        )
+        conn.request.assert_called_with("GET", "/path?a=b", body=None, headers={})
+        assert dict(created=1, reused=2) == pool.stats
+
+    def test_decompress_response(self, mocker):
+        body = gzip_compress(b'{"a": 1}' * 10000)
+        conn = self.mock_connection(mocker)
+        resp = conn.getresponse.return_value
+        resp.msg = {"Content-Encoding": "gzip"}
+        resp.read.side_effect = io.BytesIO(body).read
+        mocker.patch.object(
+            http.http_client, "HTTPConnection", return_value=conn,
+        )
+
+        _status, _reason, data, _headers = http.ConnectionPool(2).request(
+            "GET", "http://example.com/path",
+        )
+
+        assert b'{"a": 1}' * 10000 == data
+        resp.read.assert_called_with(http.CHUNK_SIZE)
+
+    def test_separate_connections_per_host(self, mocker):
+        mocker.patch.object(
+            http.http_client, "HTTPConnection",
+            side_effect=lambda *a, **kw: self.mock_connection(mocker),
+        )
+        pool = http.ConnectionPool(2)
+
+        pool.request("GET", "http://a.example.com/path")
+        pool.request("GET", "http://b.example.com/path")
+        pool.request("GET", "http://a.example.com/path")
+
+        assert dict(created=2, reused=1) == pool.stats
+
+    def test_do_not_reuse_closed_connection(self, mocker):
+        conn = self.mock_connection(mocker, will_close=True)
+        mocker.patch.object(
+            http.http_client, "HTTPConnection", return_value=conn,
+        )
+        pool = http.ConnectionPool(2)
+
+        pool.request("GET", "http://example.com/path")
+        pool.request("GET", "http://example.com/path")
+
+        assert dict(created=2, reused=0) == pool.stats
+        assert 2 == conn.close.call_count
+
+    def test_retry_stale_connection(self, mocker):
+        stale = self.mock_connection(mocker)
+        fresh = self.mock_connection(mocker, body="fresh")
+        mocker.patch.object(
+            http.http_client, "HTTPConnection", side_effect=(stale, fresh),
+        )
+        pool = http.ConnectionPool(2)
+        pool.request("GET", "http://example.com/path")
+        stale.getresponse.side_effect = http.http_client.BadStatusLine("")
+
+        status, reason, body, headers = pool.request(
+            "GET", "http://example.com/path",
+        )
+
+        assert "fresh" == body
+        stale.close.assert_called_once()
+        assert dict(created=2, reused=1) == pool.stats
+
+    @pytest.mark.parametrize("error", [
+        http.socket.error(http.errno.ECONNRESET, "Connection reset"),
+        http.socket.error(http.errno.EPIPE, "Broken pipe"),
+    ])
+    def test_retry_closed_connection(self, mocker, error):
+        stale = self.mock_connection(mocker)
+        fresh = self.mock_connection(mocker, body="fresh")
+        mocker.patch.object(
+            http.http_client, "HTTPConnection", side_effect=(stale, fresh),
+        )
+        pool = http.ConnectionPool(2)
+        pool.request("GET", "http://example.com/path")
+        stale.request.side_effect = error
+
+        status, reason, body, headers = pool.request(
+            "GET", "http://example.com/path",
+        )
+
+        assert "fresh" == body
+
+    @pytest.mark.parametrize("error", [
+        http.socket.timeout("timed out"),
+        http.http_client.BadStatusLine("garbage"),
+        http.http_client.IncompleteRead(b"partial"),
+    ])
+    def test_do_not_retry_other_errors(self, mocker, error):
+        stale = self.mock_connection(mocker)
+        mocker.patch.object(
+            http.http_client, "HTTPConnection",
+            side_effect=(stale, self.mock_connection(mocker)),
+        )
+        pool = http.ConnectionPool(2)
+        pool.request("POST", "http://example.com/auth/token")
+        stale.getresponse.side_effect = error
+
+        with pytest.raises(type(error)):
+            pool.request("POST", "http://example.com/auth/token")
+
+        assert dict(created=1, reused=1) == pool.stats
+
+    def test_record_timings(self, mocker):
+        conn = self.mock_connection(mocker)
+        conn.sock = None
+        mocker.patch.object(
+            http.http_client, "HTTPConnection", return_value=conn,
+        )
+        pool = http.ConnectionPool(2)
+        timings = {}
+
+        pool.request("GET", "http://example.com/path", timings=timings)
+
+        conn.connect.assert_called_once()
+        assert set(timings) == set(("reused", "connect", "first_byte", "body"))
+        assert timings["reused"] is False
+
+    def test_record_retries(self, mocker):
+        stale = self.mock_connection(mocker)
+        mocker.patch.object(
+            http.http_client, "HTTPConnection",
+            side_effect=(stale, self.mock_connection(mocker)),
+        )
+        pool = http.ConnectionPool(2)
+        pool.request("GET", "http://example.com/path")
+        stale.getresponse.side_effect = http.http_client.BadStatusLine("")
+        timings = {}
+
+        pool.request("GET", "http://example.com/path", timings=timings)
+
+        assert 1 == timings["retries"]
+        assert timings["reused"] is False
+
+    def test_fresh_connection_failure(self, mocker):
+        conn = self.mock_connection(mocker)
+        conn.getresponse.side_effect = http.socket.error("refused")
+        mocker.patch.object(
+            http.http_client, "HTTPConnection", return_value=conn,
+        )
+        pool = http.ConnectionPool(2)
+
+        with pytest.raises(http.socket.error):
+            pool.request("GET", "http://example.com/path")
+
+    def test_pool_size_limits_idle_connections(self, mocker):
+        conn = self.mock_connection(mocker)
+        mocker.patch.object(
+            http.http_client, "HTTPConnection", return_value=conn,
+        )
+        pool = http.ConnectionPool(0)
+
+        pool.request("GET", "http://example.com/path")
+
+        conn.close.assert_called_once()
+
+    def test_https_connection_without_verification(self, mocker):
+        connection_class = mocker.patch.object(
+            http.http_client, "HTTPSConnection",
+            return_value=self.mock_connection(mocker),
+        )
+        pool = http.ConnectionPool(2, validate_certs=False)
+
+        pool.request("GET", "https://example.com/path")
+
+        context = connection_class.call_args[1]["context"]
+        assert context.check_hostname is False
+        assert ssl.CERT_NONE == context.verify_mode
+
+    def test_cannot_handle_proxied_requests(self, mocker):
+        mocker.patch.object(
+            http, "getproxies", return_value=dict(http="http://proxy:3128"),
+        )
+        mocker.patch.object(http, "proxy_bypass", return_value=False)
+
+        assert http.ConnectionPool(2).can_handle("http://example.com") is False
+
+    def test_can_handle_direct_requests(self, mocker):
+        mocker.patch.object(http, "getproxies", return_value={})
+
+        assert http.ConnectionPool(2).can_handle("http://example.com") is True
+
+
+class TestRequestWithPool:
+    def test_ok_request(self, mocker):
+        pool = mocker.Mock()
+        pool.request.return_value = (
+            200, "OK", "data", {"Sensu-Continue": "token"},
+        )
+        open_url = mocker.patch.object(http, "open_url")
+
+        resp = http.request(
+            "PUT", "http://example.com/path", payload=dict(a=2), pool=pool,
+            validate_certs=True, ca_path=None,
+        )
+
+        assert 200 == resp.status
+        assert "data" == resp.data
+        assert "token" == resp.headers["Sensu-Continue"]
+        pool.request.assert_called_once_with(
+            "PUT", "http://example.com/path", b'{"a":2}',
+            {
+                "content-type": "application/json",
+                "accept-encoding": "gzip, deflate",
+            }, timings=mocker.ANY,
+        )
+        open_url.assert_not_called()
+
+    def test_non_20x_status(self, mocker):
+        pool = mocker.Mock()
+        pool.request.return_value = (404, "missing", "body", {})
+
+        resp = http.request("GET", "http://example.com/path", pool=pool)
+
+        assert 404 == resp.status
+        assert "missing" == resp.data
+
+    def test_basic_auth(self, mocker):
+        pool = mocker.Mock()
+        pool.request.return_value = (200, "OK", "data", {})
+
+        http.request(
+            "GET", "http://example.com/auth", pool=pool,
+            force_basic_auth=True, url_username="user", url_password="pass",
+        )
+
+        headers = pool.request.call_args[0][3]
+        assert "Basic dXNlcjpwYXNz" == headers["Authorization"]
+
+    def test_connection_error(self, mocker):
+        pool = mocker.Mock()
+        pool.request.side_effect = http.socket.error("refused")
+
+        with pytest.raises(errors.HttpError, match="refused"):
+            http.request("GET", "http://example.com/path", pool=pool)
+
+    def test_record_metrics(self, mocker):
+        record = mocker.patch.object(http.metrics, "record")
+        pool = mocker.Mock()
+        pool.request.return_value = (200, "OK", "data", {})
+
+        http.request("PUT", "http://example.com/path", data="abc", pool=pool)
+
+        method, url, status, _started, _timings, request_body, body = (
+            record.call_args[0]
+        )
+        assert ("PUT", "http://example.com/path", 200) == (method, url, status)
+        assert ("abc", "data") == (request_body, body)
+
+    def test_record_metrics_for_failed_requests(self, mocker):
+        record = mocker.patch.object(http.metrics, "record")
+        pool = mocker.Mock()
+        pool.request.side_effect = http.socket.error("refused")
+
+        with pytest.raises(errors.HttpError):
+            http.request("GET", "http://example.com/path", pool=pool)
+
+        assert record.call_args[0][2] is None
+        assert "refused" in record.call_args[1]["error"]
+
+    def test_fallback_to_open_url(self, mocker):
+        pool = mocker.Mock()
+        pool.can_handle.return_value = False
+        data_resp = mocker.Mock()
+        data_resp.read.return_value = "data"
+        data_resp.getcode.return_value = 200
+        open_url = mocker.patch.object(http, "open_url")
+        open_url.return_value = data_resp
+
+        resp = http.request("GET", "http://example.com/path", pool=pool)
+
+        assert "data" == resp.data
+        pool.request.assert_not_called()
+        assert "pool" not in open_url.call_args[1]
@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+# Copyright: (c) 2019, XLAB Steampunk <steampunk@xlab.si>
+#
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+__metaclass__ = type
+
+import sys
+
+import pytest
+
+from ansible_collections.sensu.sensu_go.plugins.module_utils import (
+    http, info_utils,
+)
+
+pytestmark = pytest.mark.skipif(
+    sys.version_info < (2, 7), reason="requires python2.7 or higher"
+)
+
+
+class TestGetNamespaces:
+    def test_single_namespace(self, mocker):
+        client = mocker.Mock()
+
+        result = info_utils.get_namespaces(client, dict(namespace="a"))
+
+        assert ["a"] == result
+        client.get.assert_not_called()
+
+    def test_namespace_list(self, mocker):
+        result = info_utils.get_namespaces(
+            mocker.Mock(), dict(namespace="a", namespaces=["b", "c"]),
+        )
+
+        assert ["b", "c"] == result
+
+    def test_all_namespaces(self, mocker):
+        client = mocker.Mock()
+        client.get.return_value = http.Response(
+            200, '[{"name": "x"}, {"name": "y"}]',
+        )
+
+        result = info_utils.get_namespaces(client, dict(
+            namespace="a", namespaces=["b"], all_namespaces=True,
+        ))
+
+        assert ["x", "y"] == result
+        client.get.assert_called_once_with("/api/core/v2/namespaces")
+
+
+class TestListObjects:
+    def test_merge_results(self, mocker):
+        client = mocker.Mock()
+        client.get.side_effect = lambda path: http.Response(
+            200, '[{"path": "%s"}]' % path,
+        )
+
+        result = info_utils.list_objects(
+            client, ["/a", "/b", "/c"], dict(concurrency=2),
+        )
+
+        assert [dict(path="/a"), dict(path="/b"), dict(path="/c")] == result
+
+    def test_convert_and_project(self, mocker):
+        client = mocker.Mock()
+        client.get.return_value = http.Response(
+            200, '[{"spec": {"a": 1, "b": 2}}]',
+        )
+
+        result = info_utils.list_objects(
+            client, ["/a"], dict(fields=["a"]), lambda o: o["spec"],
+        )
+
+        assert [dict(a=1)] == result
+
+    def test_max_items_applies_to_merged_results(self, mocker):
+        client = mocker.Mock()
+        client.get.return_value = http.Response(200, '[{"a": 1}, {"b": 2}]')
+
+        result = info_utils.list_objects(
+            client, ["/a", "/b"], dict(max_items=3),
+        )
+
+        assert [dict(a=1), dict(b=2), dict(a=1)] == result
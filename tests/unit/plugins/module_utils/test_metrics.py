@@ -0,0 +1,99 @@
+# -*- coding: utf-8 -*-
+# Copyright: (c) 2019, XLAB Steampunk <steampunk@xlab.si>
+#
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+__metaclass__ = type
+
+import json
+import sys
+import time
+
+import pytest
+
+from ansible_collections.sensu.sensu_go.plugins.module_utils import metrics
+
+pytestmark = pytest.mark.skipif(
+    sys.version_info < (2, 7), reason="requires python2.7 or higher"
+)
+
+
+def read_entries(path):
+    with open(path) as f:
+        return [json.loads(line) for line in f]
+
+
+class TestRecorder:
+    def test_record_request(self, tmpdir):
+        path = str(tmpdir.join("metrics.jsonl"))
+        recorder = metrics.Recorder(path)
+
+        recorder.record(
+            "GET", "http://example.com/path", 200, time.time(),
+            dict(reused=True, first_byte=0.25, body=0.5), None, "data",
+        )
+
+        entry, = read_entries(path)
+        assert entry["type"] == "request"
+        assert entry["run"] == metrics.RUN_ID
+        assert entry["method"] == "GET"
+        assert entry["status"] == 200
+        assert entry["reused"] is True
+        assert entry["retries"] == 0
+        assert (0, 4) == (entry["request_bytes"], entry["response_bytes"])
+        assert set(entry["timings"]) == set(("first_byte", "body", "total"))
+
+    def test_summary(self, tmpdir):
+        path = str(tmpdir.join("metrics.jsonl"))
+        recorder = metrics.Recorder(path)
+        for status in (200, None):
+            recorder.record(
+                "PUT", "http://example.com/path", status, time.time(),
+                dict(retries=1, body=0.5), "abc", None,
+                error=None if status else "refused",
+            )
+
+        recorder.write_summary()
+
+        summary = read_entries(path)[-1]
+        assert summary["type"] == "summary"
+        assert summary["requests"] == 2
+        assert summary["errors"] == 1
+        assert summary["retries"] == 2
+        assert summary["request_bytes"] == 6
+        assert summary["timings"]["body"] == 1.0
+
+    def test_no_summary_without_requests(self, tmpdir):
+        path = tmpdir.join("metrics.jsonl")
+
+        metrics.Recorder(str(path)).write_summary()
+
+        assert not path.exists()
+
+    def test_ignore_write_errors(self, tmpdir):
+        recorder = metrics.Recorder(str(tmpdir.join("missing", "metrics")))
+
+        recorder.record("GET", "/", 200, time.time(), {}, None, None)
+
+
+class TestConfigure:
+    def test_new_run(self, mocker, monkeypatch, tmpdir):
+        mocker.patch.object(metrics, "RECORDER", None)
+        path = str(tmpdir.join("metrics.jsonl"))
+        monkeypatch.setenv("SENSU_ANSIBLE_METRICS", path)
+        run_id = metrics.RUN_ID
+
+        metrics.configure()
+
+        assert path == metrics.RECORDER.path
+        assert run_id != metrics.RUN_ID
+
+    def test_finish_previous_run(self, mocker, monkeypatch, tmpdir):
+        recorder = mocker.patch.object(metrics, "RECORDER")
+        monkeypatch.delenv("SENSU_ANSIBLE_METRICS", raising=False)
+
+        metrics.configure()
+
+        recorder.write_summary.assert_called_once_with()
+        assert metrics.RECORDER is None
@@ -0,0 +1,491 @@
+# -*- coding: utf-8 -*-
+# Copyright: (c) 2019, XLAB Steampunk <steampunk@xlab.si>
+#
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+__metaclass__ = type
+
+import sys
+
+import pytest
+
+from ansible_collections.sensu.sensu_go.plugins.module_utils import (
+    http, resource_utils, utils,
+)
+
+pytestmark = pytest.mark.skipif(
+    sys.version_info < (2, 7), reason="requires python2.7 or higher"
+)
+
+
+class TestDoSetsDiffer:
+    @pytest.mark.parametrize("current,desired,diff", [
+        ([1, 2, 3], [1, 2, 3], False),
+        ([1, 2, 3], [3, 2, 1], False),
+        ([1, 2], [1, 2, 3], True),
+        ([1, 3], [2, 4], True),
+    ])
+    def test_comparison(self, current, desired, diff):
+        c = dict(k=current)
+        d = dict(k=desired)
+
+        assert resource_utils.do_sets_differ(c, d, "k") is diff
+
+    def test_missing_keys_are_treated_as_empty_sets(self):
+        current = dict(a=[])
+        desired = dict()
+
+        assert resource_utils.do_sets_differ(current, desired, "a") is False
+        assert resource_utils.do_sets_differ(desired, current, "a") is False
+
+    def test_nulls_are_treated_as_empty_sets(self):
+        current = dict(a=None)
+        desired = dict(a=[])
+
+        assert resource_utils.do_sets_differ(current, desired, "a") is False
+        assert resource_utils.do_sets_differ(desired, current, "a") is False
+
+
+class TestDoProxyRequestsDiffer:
+    def test_missing_proxy_requests_in_desired_is_ignored(self):
+        current = dict(proxy_requests=dict(entity_attributes=["a", "b"]))
+        desired = dict()
+
+        assert resource_utils.do_proxy_requests_differ(current, desired) is False
+
+    @pytest.mark.parametrize("current,desired,diff", [
+        (["a", "b"], ["a", "b"], False),
+        (["a", "b"], ["b", "a"], False),
+        (None, [], False),
+        (["a", "b"], ["c", "a"], True),
+        (["a", "b"], ["a", "b", "c"], True),
+    ])
+    def test_treat_entity_attributes_as_a_set(self, current, desired, diff):
+        c = dict(proxy_requests=dict(entity_attributes=current))
+        d = dict(proxy_requests=dict(entity_attributes=desired))
+
+        assert resource_utils.do_proxy_requests_differ(c, d) is diff
+
+    def test_ignore_missing_entity_attributes_in_desired(self):
+        current = dict(proxy_requests=dict(entity_attributes=["a", "b"]))
+        desired = dict(proxy_requests=dict())
+
+        assert resource_utils.do_proxy_requests_differ(current, desired) is False
+
+    @pytest.mark.parametrize("current,desired,diff", [
+        (dict(splay=False), dict(splay=False), False),
+        (dict(splay=False), dict(), False),
+        (dict(splay=False), dict(splay=True), True),
+        (dict(), dict(splay=True), True),
+    ])
+    def test_other_stuff_is_compared_as_usual(self, current, desired, diff):
+        c = dict(proxy_requests=current)
+        d = dict(proxy_requests=desired)
+
+        assert resource_utils.do_proxy_requests_differ(c, d) is diff
+
+
+class TestDoCheckHooksDiffer:
+    def test_missing_check_hooks_in_desired_is_ignored(self):
+        current = dict(check_hooks=[dict(warning=["a"])])
+        desired = dict()
+
+        assert resource_utils.do_check_hooks_differ(current, desired) is False
+
+    @pytest.mark.parametrize("current,desired,diff", [
+        (["a", "b"], ["a", "b"], False),
+        (["a", "b"], ["b", "a"], False),
+        (["a", "b"], ["c", "a"], True),
+        (["a", "b"], ["a", "b", "c"], True),
+    ])
+    def test_treat_hooks_as_a_set(self, current, desired, diff):
+        c = dict(check_hooks=[dict(warning=current)])
+        d = dict(check_hooks=[dict(warning=desired)])
+
+        assert resource_utils.do_check_hooks_differ(c, d) is diff
+
+
+class TestDoCheckDiffer:
+    def test_no_difference(self):
+        assert not resource_utils.do_check_differ(
+            dict(
+                command="sleep",
+                subscriptions=["sub1", "sub2"],
+                handlers=["ha1", "ha2", "ha3"],
+                interval=123,
+                cron="* * * 3 2",
+                publish=False,
+                timeout=30,
+                ttl=60,
+                stdin=True,
+                low_flap_threshold=2,
+                high_flap_threshold=10,
+                runtime_assets=["asset1", "asset2"],
+                check_hooks=[
+                    dict(warning=["hook0-1", "hook0-2"]),
+                    dict(critical=["hook1-1", "hook1-2"]),
+                ],
+                proxy_entity_name="name",
+                proxy_requests=dict(
+                    entity_attributes=["a1", "a2", "a3"],
+                    splay=True,
+                    splay_coverage=10,
+                ),
+                output_metric_format="influxdb_line",
+                output_metric_handlers=["mhandler1", "mhandler2"],
+                round_robin=False,
+                env_vars=["k1=v1", "k2=v2"],
+            ),
+            dict(
+                command="sleep",
+                subscriptions=["sub2", "sub1"],
+                handlers=["ha3", "ha1", "ha2"],
+                interval=123,
+                cron="* * * 3 2",
+                publish=False,
+                timeout=30,
+                ttl=60,
+                stdin=True,
+                low_flap_threshold=2,
+                high_flap_threshold=10,
+                runtime_assets=["asset2", "asset1"],
+                check_hooks=[
+                    dict(critical=["hook1-2", "hook1-1"]),
+                    dict(warning=["hook0-2", "hook0-1"]),
+                ],
+                proxy_entity_name="name",
+                proxy_requests=dict(
+                    splay=True,
+                    entity_attributes=["a3", "a2", "a1"],
+                    splay_coverage=10,
+                ),
+                output_metric_format="influxdb_line",
+                output_metric_handlers=["mhandler2", "mhandler1"],
+                round_robin=False,
+                env_vars=["k2=v2", "k1=v1"],
+            )
+        )
+
+    @pytest.mark.parametrize("current,desired", [
+        (  # No diff in params, no secrets
+            dict(name="demo"),
+            dict(name="demo"),
+        ),
+        (  # No diff in params, no diff in secrets
+            dict(name="demo", secrets=[
+                dict(name="n1", secret="s1"), dict(name="n2", secret="s2"),
+            ]),
+            dict(name="demo", secrets=[
+                dict(name="n2", secret="s2"), dict(name="n1", secret="s1"),
+            ]),
+        ),
+    ])
+    def test_no_difference_secrets(self, current, desired):
+        assert resource_utils.do_check_differ(current, desired) is False
+
+    @pytest.mark.parametrize("current,desired", [
+        (  # Diff in params, no diff in secrets
+            dict(name="demo", secrets=[dict(name="a", secret="1")]),
+            dict(name="prod", secrets=[dict(name="a", secret="1")]),
+        ),
+        (  # No diff in params, missing and set secrets
+            dict(name="demo", secrets=[dict(name="a", secret="1")]),
+            dict(name="demo", secrets=[dict(name="b", secret="2")]),
+        ),
+        (  # Diff in params, missing and set secrets
+            dict(name="demo", secrets=[dict(name="a", secret="1")]),
+            dict(name="prod", secrets=[dict(name="b", secret="2")]),
+        ),
+    ])
+    def test_difference_secrets(self, current, desired):
+        assert resource_utils.do_check_differ(current, desired) is True
+
+
+class TestDoAssetDiffer:
+    def test_equal_assets_with_none_values(self):
+        assert resource_utils.do_asset_differ(
+            {
+                "name": "asset",
+                "builds": [
+                    {
+                        "sha512": "a",
+                        "url": "a",
+                        "filters": None
+                    },
+                ],
+            },
+            {
+                "name": "asset",
+                "builds": [
+                    {
+                        "sha512": "a",
+                        "url": "a",
+                        "headers": None,
+                    },
+                ],
+            },
+        ) is False
+
+    def test_equal_assets_with_different_build_content(self):
+        assert resource_utils.do_asset_differ(
+            {
+                "name": "asset",
+                "builds": [
+                    {
+                        "url": "http://abc.com",
+                        "sha512": "abc",
+                        "headers": {
+                            "foo": "bar",
+                            "bar": "foo",
+                        }
+                    },
+                    {
+                        "url": "http://def.com",
+                        "sha512": "def",
+                        "filters": ["d == d", "e == e"],
+                    },
+
+                ]
+            },
+            {
+                "name": "asset",
+                "builds": [
+                    {
+                        "url": "http://def.com",
+                        "sha512": "def",
+                        "filters": ["e == e", "d == d"],
+                    },
+                    {
+                        "url": "http://abc.com",
+                        "sha512": "abc",
+                        "headers": {
+                            "bar": "foo",
+                            "foo": "bar"
+                        }
+                    },
+                ]
+            },
+        ) is False
+
+    def test_updated_asset(self):
+        assert resource_utils.do_asset_differ(
+            {
+                "name": "asset",
+                "builds": [
+                    {
+                        "url": "http://abc.com",
+                        "sha512": "abc",
+                    }
+                ],
+                "annotations": {
+                    "foo": "bar",
+                }
+            },
+            {
+                "name": "asset",
+                "builds": [
+                    {
+                        "url": "http://def.com",
+                        "sha512": "abc",
+                    },
+                    {
+                        "url": "http://def.com",
+                        "sha512": "abc",
+                        "filters": ["abc == def"],
+                    }
+                ],
+            },
+        ) is True
+
+    def test_different_assets_with_same_builds(self):
+        assert resource_utils.do_asset_differ(
+            {
+                "name": "a",
+                "builds": [
+                    {
+                        "url": "http://abc.com",
+                        "sha512": "abc",
+                    }
+                ],
+                "annotations": {
+                    "foo": "bar",
+                }
+            },
+            {
+                "name": "b",
+                "builds": [
+                    {
+                        "url": "http://abc.com",
+                        "sha512": "abc",
+                    }
+                ],
+                "annotations": {
+                    "bar": "foo"
+                }
+            },
+        ) is True
+
+    def test_single_build_asset(self):
+        assert resource_utils.do_asset_differ(
+            dict(url="http://abc.com", sha512="abc"),
+            dict(url="http://abc.com", sha512="abc"),
+        ) is False
+
+    def test_updated_single_build_asset(self):
+        assert resource_utils.do_asset_differ(
+            dict(url="http://abc.com", sha512="abc"),
+            dict(url="http://def.com", sha512="def"),
+        ) is True
+
+
+class TestDoEntityDiffer:
+    @pytest.mark.parametrize('current', [
+        dict(no=dict(system="here")),
+        dict(system=dict(here="is")),
+    ])
+    def test_no_system_in_desired(self, current):
+        assert resource_utils.do_entity_differ(current, {}) is False
+
+    def test_system_keys_not_in_current_are_ignored(self):
+        assert resource_utils.do_entity_differ(
+            dict(system=dict(a=1, b=2)),
+            dict(system=dict(a=1)),
+        ) is False
+
+    def test_actual_changes_are_detected(self):
+        assert resource_utils.do_entity_differ(
+            dict(system=dict(a=1, b=2)),
+            dict(system=dict(a=2)),
+        ) is True
+
+    def test_missing_keys_are_detected(self):
+        assert resource_utils.do_entity_differ(
+            dict(system=dict(b=2)),
+            dict(system=dict(a=2)),
+        ) is True
+
+    @pytest.mark.parametrize("current,desired", [
+        ([], None), ([], []),
+        (["a"], ["a"]),
+        (["a", "b"], ["b", "a"]),
+    ])
+    def test_no_diff_in_subscriptions(self, current, desired):
+        assert resource_utils.do_entity_differ(
+            dict(subscriptions=current), dict(subscriptions=desired),
+        ) is False
+
+    @pytest.mark.parametrize("current,desired", [
+        ([], ["a"]), (["a"], []),
+        (["a"], ["b"]),
+        (["a", "b"], ["a", "c"]),
+    ])
+    def test_diff_in_subscriptions(self, current, desired):
+        print((current, desired))
+        assert resource_utils.do_entity_differ(
+            dict(subscriptions=current), dict(subscriptions=desired),
+        ) is True
+
+
+class TestBuildPath:
+    def test_namespaced_kind(self):
+        assert "/api/core/v2/namespaces/ns/checks/name" == (
+            resource_utils.build_path("CheckConfig", "ns", "name")
+        )
+
+    def test_cluster_wide_kind(self):
+        assert "/api/core/v2/clusterroles/name" == (
+            resource_utils.build_path("ClusterRole", "ns", "name")
+        )
+
+    def test_enterprise_kind(self):
+        assert "/api/enterprise/secrets/v1/namespaces/ns/secrets/name" == (
+            resource_utils.build_path("Secret", "ns", "name")
+        )
+
+
+class TestBuildPayload:
+    def test_core_kind(self):
+        payload = resource_utils.build_payload(
+            "CheckConfig", "name", "ns", dict(command="cmd", ttl=None),
+            labels=dict(a=1), annotations=None,
+        )
+
+        assert payload == dict(
+            command="cmd",
+            metadata=dict(name="name", namespace="ns", labels=dict(a="1")),
+        )
+
+    def test_cluster_wide_kind(self):
+        payload = resource_utils.build_payload(
+            "ClusterRole", "name", "ns", dict(rules=[]),
+        )
+
+        assert payload == dict(rules=[], metadata=dict(name="name"))
+
+    def test_kind_without_metadata(self):
+        payload = resource_utils.build_payload(
+            "Namespace", "name", "ns", {},
+        )
+
+        assert payload == dict(name="name")
+
+    def test_enterprise_kind(self):
+        payload = resource_utils.build_payload(
+            "Secret", "name", "ns", dict(provider="env", id="ID"),
+            annotations=dict(b="c"),
+        )
+
+        assert payload == dict(
+            type="Secret",
+            api_version="secrets/v1",
+            metadata=dict(
+                name="name", namespace="ns", annotations=dict(b="c"),
+            ),
+            spec=dict(provider="env", id="ID"),
+        )
+
+
+class TestSync:
+    def test_core_kind(self, mocker):
+        sync = mocker.patch.object(utils, "sync")
+        sync.return_value = True, {}
+
+        resource_utils.sync(
+            "present", "client", "CheckConfig", "name", "ns",
+            dict(command="cmd"), False,
+        )
+
+        sync.assert_called_once_with(
+            "present", "client", "/api/core/v2/namespaces/ns/checks/name",
+            dict(command="cmd", metadata=dict(name="name", namespace="ns")),
+            False, resource_utils.do_check_differ, "full",
+            set_keys=resource_utils.CHECK_SET_KEYS,
+        )
+
+    def test_existing_namespace(self, mocker):
+        client = mocker.Mock(sync_cache_ttl=0)
+        client.get.return_value = http.Response(200, '{"name": "bulk"}')
+
+        changed, result = resource_utils.sync(
+            "present", client, "Namespace", "bulk", None, {}, False,
+        )
+
+        assert changed is False
+        assert dict(name="bulk") == result
+        client.put.assert_not_called()
+
+    def test_enterprise_kind(self, mocker):
+        sync = mocker.patch.object(utils, "sync_v1")
+        sync.return_value = True, {}
+
+        resource_utils.sync(
+            "absent", "client", "Secret", "name", "ns", None, True,
+        )
+
+        state, client, path, payload, check_mode, compare, return_object = (
+            sync.call_args[0]
+        )
+        assert "/api/enterprise/secrets/v1/namespaces/ns/secrets/name" == path
+        assert check_mode is True
+        assert utils.do_differ_v1 == compare
@@ -0,0 +1,114 @@
+# -*- coding: utf-8 -*-
+# Copyright: (c) 2019, XLAB Steampunk <steampunk@xlab.si>
+#
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+__metaclass__ = type
+
+import sys
+
+import pytest
+
+from ansible_collections.sensu.sensu_go.plugins.module_utils import throttle
+
+pytestmark = pytest.mark.skipif(
+    sys.version_info < (2, 7), reason="requires python2.7 or higher"
+)
+
+
+class StopPolling(Exception):
+    pass
+
+
+class TestReserveToken:
+    def test_no_rate_limit(self, tmpdir):
+        limits = throttle.Throttle("http://a", str(tmpdir))
+
+        assert 0 == limits._reserve_token()
+        assert [] == tmpdir.listdir()
+
+    def test_burst_then_wait(self, mocker, tmpdir):
+        mocker.patch.object(throttle.time, "time", return_value=100)
+        limits = throttle.Throttle("http://a", str(tmpdir), rate=2)
+
+        assert [0, 0, 0.5, 1] == [limits._reserve_token() for _i in range(4)]
+
+    def test_refill(self, mocker, tmpdir):
+        time_mock = mocker.patch.object(throttle.time, "time")
+        time_mock.return_value = 100
+        limits = throttle.Throttle("http://a", str(tmpdir), rate=1)
+        limits._reserve_token()
+        time_mock.return_value = 101
+
+        assert 0 == limits._reserve_token()
+
+    def test_shared_between_instances(self, mocker, tmpdir):
+        mocker.patch.object(throttle.time, "time", return_value=100)
+        throttle.Throttle("http://a", str(tmpdir), rate=1)._reserve_token()
+
+        assert 1 == throttle.Throttle(
+            "http://a", str(tmpdir), rate=1,
+        )._reserve_token()
+        assert 0 == throttle.Throttle(
+            "http://b", str(tmpdir), rate=1,
+        )._reserve_token()
+
+    def test_corrupted_state(self, tmpdir):
+        limits = throttle.Throttle("http://a", str(tmpdir), rate=1)
+        with open(limits.prefix + ".bucket", "w") as f:
+            f.write("{bad")
+
+        assert 0 == limits._reserve_token()
+
+    def test_inaccessible_directory(self, tmpdir):
+        tmpdir.join("file").write("")
+        limits = throttle.Throttle(
+            "http://a", str(tmpdir.join("file", "dir")), rate=1,
+        )
+
+        assert [0, 0] == [limits._reserve_token() for _i in range(2)]
+
+
+class TestSlot:
+    def test_no_concurrency_limit(self, tmpdir):
+        limits = throttle.Throttle("http://a", str(tmpdir))
+
+        with limits.slot():
+            pass
+
+        assert [] == tmpdir.listdir()
+
+    def test_wait_for_free_slot(self, mocker, tmpdir):
+        mocker.patch.object(throttle.time, "sleep", side_effect=StopPolling)
+        limits = throttle.Throttle("http://a", str(tmpdir), max_in_flight=1)
+
+        with limits.slot():
+            with pytest.raises(StopPolling):
+                throttle.Throttle(
+                    "http://a", str(tmpdir), max_in_flight=1,
+                )._acquire_slot()
+
+        # Slot is free again.
+        release = throttle.Throttle(
+            "http://a", str(tmpdir), max_in_flight=1,
+        )._acquire_slot()
+        release()
+
+    def test_use_all_slots(self, tmpdir):
+        limits = throttle.Throttle("http://a", str(tmpdir), max_in_flight=2)
+
+        with limits.slot():
+            with limits.slot():
+                pass
+
+    def test_sleep_before_request(self, mocker, tmpdir):
+        sleep = mocker.patch.object(throttle.time, "sleep")
+        mocker.patch.object(throttle.time, "time", return_value=100)
+        limits = throttle.Throttle("http://a", str(tmpdir), rate=1)
+
+        for _i in range(2):
+            with limits.slot():
+                pass
+
+        sleep.assert_called_once_with(1)
@@ -0,0 +1,601 @@
+from __future__ import absolute_import, division, print_function
+__metaclass__ = type
+
+import sys
+
+from distutils import version
+
+import pytest
+
+from ansible_collections.sensu.sensu_go.plugins.module_utils import (
+    cache, errors, http, user_utils,
+)
+
+pytestmark = pytest.mark.skipif(
+    sys.version_info < (2, 7), reason="requires python2.7 or higher"
+)
+
+
+class TestUpdatePassword:
+    @pytest.mark.parametrize('check', [False, True])
+    def test_password_is_valid(self, mocker, check):
+        client = mocker.Mock()
+        client.validate_auth_data.return_value = True
+
+        changed = user_utils.update_password(client, '/path', 'user', 'pass', check)
+
+        assert changed is False
+        client.validate_auth_data.assert_called_once_with('user', 'pass')
+        client.put.assert_not_called()
+
+    def test_password_is_invalid_older_than_5_21_0(self, mocker):
+        client = mocker.Mock()
+        client.validate_auth_data.return_value = False
+        client.version = version.StrictVersion("5.20.2")
+        client.put.return_value = http.Response(201, '')
+
+        changed = user_utils.update_password(client, '/path', 'user', 'pass', False)
+
+        assert changed is True
+        client.validate_auth_data.assert_called_once_with('user', 'pass')
+        client.put.assert_called_once_with('/path/password', dict(
+            username='user', password='pass',
+        ))
+
+    def test_password_is_invalid_5_21_0_or_newer(self, mocker):
+        client = mocker.Mock()
+        client.validate_auth_data.return_value = False
+        client.version = version.StrictVersion("5.21.0")
+        client.put.return_value = http.Response(201, '')
+
+        changed = user_utils.update_password(client, '/path', 'user', 'pass', False)
+
+        assert changed is True
+        client.validate_auth_data.assert_called_once_with('user', 'pass')
+        client.put.assert_called_once()
+
+        path, payload = client.put.call_args[0]
+        assert path == '/path/reset_password'
+        assert payload['username'] == 'user'
+
+        # (tadeboro): We cannot validate the value without mocking the bcrypt.
+        # And I would rather see that our code gets tested by actually using
+        # the bcrypt rather than mocking it out. This way, the message
+        # encode/decode stuff gets put through its paces.
+        assert 'password_hash' in payload
+
+    def test_password_is_invalid_check_mode(self, mocker):
+        client = mocker.Mock()
+        client.validate_auth_data.return_value = False
+
+        changed = user_utils.update_password(client, '/path', 'user', 'pass', True)
+
+        assert changed is True
+        client.validate_auth_data.assert_called_once_with('user', 'pass')
+        client.put.assert_not_called()
+
+    @pytest.mark.parametrize(
+        # bcrypt_present                   ... is bcrypt library present (True/False).
+        # expected_exception               ... is missing requirements exception expected.
+        # expected_result                  ... expected update_password return.
+        (
+            "bcrypt_present",
+            "expected_exception",
+            "expected_result",
+        ),
+        [
+            # bcrypt present
+            (True, False, True),
+            # bcrypt not present
+            (False, True, None),
+        ],
+    )
+    def test_missing_bcrypt_library(self, mocker, bcrypt_present, expected_exception, expected_result):
+        # Mock HAS_BCRYPT global variable
+        mocker.patch("ansible_collections.sensu.sensu_go.plugins.module_utils.user_utils.HAS_BCRYPT", bcrypt_present)
+
+        # Mock client
+        client = mocker.Mock()
+        client.validate_auth_data.return_value = False
+        client.version = version.StrictVersion("5.21.1")
+        client.put.return_value = http.Response(201, '')
+
+        if expected_exception:
+            with pytest.raises(errors.RequirementsError):
+                user_utils.update_password(client, "", "", "", False)
+        else:
+            result = user_utils.update_password(client, "", "", "", False)
+            assert result is expected_result
+
+    def test_use_supplied_hash(self, mocker):
+        client = mocker.Mock()
+        client.validate_auth_data.return_value = False
+        client.version = version.StrictVersion("5.21.0")
+        client.put.return_value = http.Response(201, '')
+        hash_password = mocker.patch.object(user_utils, 'hash_password')
+
+        changed = user_utils.update_password(
+            client, '/path', 'user', 'pass', False, password_hash='hash',
+        )
+
+        assert changed is True
+        client.put.assert_called_once_with('/path/reset_password', dict(
+            username='user', password_hash='hash',
+        ))
+        hash_password.assert_not_called()
+
+    def test_skip_remembered_password(self, mocker, tmpdir):
+        client = mocker.Mock(address='http://a', cache=cache.FileCache(
+            str(tmpdir),
+        ))
+        client.cache.set(True, None, *user_utils.password_cache_key(
+            client.cache, 'http://a', 'user', 'pass',
+        ))
+
+        changed = user_utils.update_password(
+            client, '/path', 'user', 'pass', False, cache_ttl=60,
+        )
+
+        assert changed is False
+        client.validate_auth_data.assert_not_called()
+
+    def test_remember_valid_password(self, mocker, tmpdir):
+        client = mocker.Mock(address='http://a', cache=cache.FileCache(
+            str(tmpdir),
+        ))
+        client.validate_auth_data.return_value = True
+
+        user_utils.update_password(
+            client, '/path', 'user', 'pass', False, cache_ttl=60,
+        )
+
+        assert client.cache.get(*user_utils.password_cache_key(
+            client.cache, 'http://a', 'user', 'pass',
+        )) is True
+
+    def test_remember_updated_password(self, mocker, tmpdir):
+        client = mocker.Mock(address='http://a', cache=cache.FileCache(
+            str(tmpdir),
+        ))
+        client.validate_auth_data.return_value = False
+        client.version = version.StrictVersion("5.20.0")
+        client.put.return_value = http.Response(201, '')
+
+        user_utils.update_password(
+            client, '/path', 'user', 'pass', False, cache_ttl=60,
+        )
+
+        assert client.cache.get(*user_utils.password_cache_key(
+            client.cache, 'http://a', 'user', 'pass',
+        )) is True
+
+    def test_do_not_remember_password_in_check_mode(self, mocker, tmpdir):
+        client = mocker.Mock(address='http://a', cache=cache.FileCache(
+            str(tmpdir),
+        ))
+        client.validate_auth_data.return_value = False
+
+        user_utils.update_password(
+            client, '/path', 'user', 'pass', True, cache_ttl=60,
+        )
+
+        assert [cache.FileCache.KEY_FILE] == [
+            p.basename for p in tmpdir.listdir()
+        ]
+
+
+class TestPasswordCacheKey:
+    def test_key_does_not_contain_password(self, tmpdir):
+        c = cache.FileCache(str(tmpdir))
+
+        key = user_utils.password_cache_key(c, 'http://a/', 'user', 'secret')
+
+        assert ('verified_password', 'http://a', 'user') == key[:3]
+        assert c.digest('secret') == key[3]
+
+    def test_different_passwords(self, tmpdir):
+        c = cache.FileCache(str(tmpdir))
+
+        assert user_utils.password_cache_key(
+            c, 'http://a', 'user', 'pass1',
+        ) != user_utils.password_cache_key(c, 'http://a', 'user', 'pass2')
+
+
+class TestUpdatePasswordHash:
+    @pytest.mark.parametrize('check', [False, True])
+    def test_sensu_go_older_than_5_21_0(self, mocker, check):
+        client = mocker.Mock()
+        client.version = version.StrictVersion("5.20.0")
+
+        with pytest.raises(errors.SensuError):
+            user_utils.update_password_hash(client, '/path', 'user', 'hash', check)
+
+        client.put.assert_not_called()
+
+    def test_sensu_go_newer_than_5_21_0(self, mocker):
+        client = mocker.Mock()
+        client.version = version.StrictVersion("5.21.0")
+        client.put.return_value = http.Response(201, '')
+
+        changed = user_utils.update_password_hash(
+            client, '/path', 'user', 'hash', False,
+        )
+
+        assert changed is True
+        client.put.assert_called_once()
+
+        path, payload = client.put.call_args[0]
+        assert path == '/path/reset_password'
+        assert payload['username'] == 'user'
+        assert payload['password_hash'] == 'hash'
+
+    def test_sensu_go_newer_than_5_21_0_check_mode(self, mocker):
+        client = mocker.Mock()
+        client.version = version.StrictVersion("5.21.0")
+
+        changed = user_utils.update_password_hash(
+            client, '/path', 'user', 'pass', True,
+        )
+
+        assert changed is True
+        client.put.assert_not_called()
+
+
+class TestUpdateGroups:
+    @pytest.mark.parametrize('check', [False, True])
+    def test_update_groups_no_change(self, mocker, check):
+        client = mocker.Mock()
+
+        result = user_utils.update_groups(
+            client, '/path', ['a', 'b'], ['b', 'a'], check,
+        )
+
+        assert result is False
+        client.put.assert_not_called()
+        client.delete.assert_not_called()
+
+    def test_update_groups(self, mocker):
+        client = mocker.Mock()
+        client.put.side_effect = [
+            http.Response(201, ''), http.Response(201, ''),
+        ]
+        client.delete.side_effect = [
+            http.Response(204, ''), http.Response(204, ''),
+        ]
+
+        result = user_utils.update_groups(
+            client, '/path', ['a', 'b', 'c'], ['e', 'd', 'c'], False,
+        )
+
+        assert result is True
+        client.put.assert_has_calls([
+            mocker.call('/path/groups/d', None),
+            mocker.call('/path/groups/e', None),
+        ], any_order=True)
+        client.delete.assert_has_calls([
+            mocker.call('/path/groups/a'),
+            mocker.call('/path/groups/b'),
+        ], any_order=True)
+
+    def test_update_groups_concurrently(self, mocker):
+        map_mock = mocker.patch.object(
+            user_utils.utils, 'map_concurrently',
+        )
+
+        user_utils.update_groups(
+            mocker.Mock(), '/path', ['a', 'b'], ['c', 'b'], False, 8,
+        )
+
+        _func, changes, concurrency = map_mock.call_args[0]
+        assert [(True, 'c'), (False, 'a')] == changes
+        assert 8 == concurrency
+
+    def test_update_groups_check_mode(self, mocker):
+        client = mocker.Mock()
+
+        result = user_utils.update_groups(
+            client, '/path', ['a', 'b', 'c'], ['e', 'd', 'c'], True,
+        )
+
+        assert result is True
+        client.put.assert_not_called()
+        client.delete.assert_not_called()
+
+
+class TestUpdateState:
+    @pytest.mark.parametrize('check', [False, True])
+    @pytest.mark.parametrize('state', [False, True])
+    def test_update_state_no_change(self, mocker, check, state):
+        client = mocker.Mock()
+
+        result = user_utils.update_state(client, '/path', state, state, check)
+
+        assert result is False
+        client.put.assert_not_called()
+        client.delete.assert_not_called()
+
+    def test_disable_user(self, mocker):
+        client = mocker.Mock()
+        client.delete.return_value = http.Response(204, '')
+
+        # Go from disabled == False to disabled == True
+        result = user_utils.update_state(client, '/path', False, True, False)
+
+        assert result is True
+        client.put.assert_not_called()
+        client.delete.assert_called_once_with('/path')
+
+    def test_disable_user_check_mode(self, mocker):
+        client = mocker.Mock()
+
+        # Go from disabled == False to disabled == True
+        result = user_utils.update_state(client, '/path', False, True, True)
+
+        assert result is True
+        client.put.assert_not_called()
+        client.delete.assert_not_called()
+
+    def test_enable_user(self, mocker):
+        client = mocker.Mock()
+        client.put.return_value = http.Response(201, '')
+
+        # Go from disabled == True to disabled == False
+        result = user_utils.update_state(client, '/path', True, False, False)
+
+        assert result is True
+        client.put.assert_called_once_with('/path/reinstate', None)
+        client.delete.assert_not_called()
+
+    def test_enable_user_check_mode(self, mocker):
+        client = mocker.Mock()
+
+        # Go from disabled == True to disabled == False
+        result = user_utils.update_state(client, '/path', True, False, True)
+
+        assert result is True
+        client.put.assert_not_called()
+        client.delete.assert_not_called()
+
+
+class TestSync:
+    def test_no_current_object(self, mocker):
+        client = mocker.Mock()
+        client.get.return_value = http.Response(200, '{"new": "data"}')
+        client.put.return_value = http.Response(201, '')
+
+        changed, result = user_utils.sync(
+            None, client, '/path', {'password': 'data'}, False
+        )
+
+        assert changed is True
+        assert {'new': 'data'} == result
+        client.put.assert_called_once_with('/path', {'password': 'data'})
+
+    def test_no_current_object_check(self, mocker):
+        client = mocker.Mock()
+        client.get.return_value = http.Response(200, '{"new": "data"}')
+
+        changed, result = user_utils.sync(
+            None, client, '/path', {'password_hash': 'data'}, True
+        )
+
+        assert changed is True
+        assert {} == result
+        client.put.assert_not_called()
+
+    def test_no_current_object_return_payload(self, mocker):
+        client = mocker.Mock()
+        client.put.return_value = http.Response(201, '')
+
+        changed, result = user_utils.sync(
+            None, client, '/path', {'username': 'a', 'password': 'data'},
+            False, return_object='payload',
+        )
+
+        assert changed is True
+        assert {'username': 'a'} == result
+        client.get.assert_not_called()
+
+    def test_no_current_object_return_none(self, mocker):
+        client = mocker.Mock()
+        client.put.return_value = http.Response(201, '')
+
+        changed, result = user_utils.sync(
+            None, client, '/path', {'password': 'data'}, False,
+            return_object='none',
+        )
+
+        assert changed is True
+        assert result is None
+        client.get.assert_not_called()
+
+    def test_password_update(self, mocker):
+        client = mocker.Mock()
+        client.get.return_value = http.Response(200, '{"new": "data"}')
+        p_mock = mocker.patch.object(user_utils, 'update_password')
+        p_mock.return_value = True
+        g_mock = mocker.patch.object(user_utils, 'update_groups')
+        s_mock = mocker.patch.object(user_utils, 'update_state')
+
+        changed, result = user_utils.sync(
+            dict(old='data'), client, '/path',
+            dict(username='user', password='pass'), False
+        )
+
+        assert changed is True
+        assert dict(new='data') == result
+        p_mock.assert_called_once()
+        g_mock.assert_not_called()
+        s_mock.assert_not_called()
+
+    def test_password_update_check_mode(self, mocker):
+        client = mocker.Mock()
+        client.get.return_value = http.Response(200, '{"new": "data"}')
+        p_mock = mocker.patch.object(user_utils, 'update_password')
+        p_mock.return_value = False
+        g_mock = mocker.patch.object(user_utils, 'update_groups')
+        s_mock = mocker.patch.object(user_utils, 'update_state')
+
+        changed, result = user_utils.sync(
+            dict(old='data'), client, '/path',
+            dict(username='user', password='pass'), True
+        )
+
+        assert changed is False
+        assert dict(old='data', username='user') == result
+        p_mock.assert_called_once()
+        g_mock.assert_not_called()
+        s_mock.assert_not_called()
+
+    def test_password_hash_update(self, mocker):
+        client = mocker.Mock()
+        client.get.return_value = http.Response(200, '{"new": "data"}')
+        mock = mocker.patch.object(user_utils, 'update_password_hash')
+        mock.return_value = True
+
+        changed, result = user_utils.sync(
+            dict(old='data'), client, '/path',
+            dict(username='user', password_hash='pass'), False
+        )
+
+        assert changed is True
+        assert dict(new='data') == result
+        mock.assert_called_once()
+
+    def test_password_hash_update_check_mode(self, mocker):
+        client = mocker.Mock()
+        client.get.return_value = http.Response(200, '{"new": "data"}')
+        mock = mocker.patch.object(user_utils, 'update_password_hash')
+        mock.return_value = True
+
+        changed, result = user_utils.sync(
+            dict(old='data'), client, '/path',
+            dict(username='user', password_hash='pass'), True
+        )
+
+        assert changed is True
+        assert dict(old='data', username='user') == result
+        mock.assert_called_once()
+
+    def test_when_password_is_set_we_ignore_hash(self, mocker):
+        client = mocker.Mock()
+        client.get.return_value = http.Response(200, '{"new": "data"}')
+        p_mock = mocker.patch.object(user_utils, 'update_password')
+        p_mock.return_value = True
+        h_mock = mocker.patch.object(user_utils, 'update_password_hash')
+
+        user_utils.sync(
+            dict(old='data'), client, '/path',
+            dict(username='user', password='pass', password_hash='hash'),
+            False
+        )
+
+        p_mock.assert_called_once()
+        h_mock.assert_not_called()
+
+    def test_groups_update(self, mocker):
+        client = mocker.Mock()
+        client.get.return_value = http.Response(200, '{"new": "data"}')
+        p_mock = mocker.patch.object(user_utils, 'update_password')
+        g_mock = mocker.patch.object(user_utils, 'update_groups')
+        g_mock.return_value = False
+        s_mock = mocker.patch.object(user_utils, 'update_state')
+
+        changed, result = user_utils.sync(
+            dict(groups=['a']), client, '/path', dict(groups=['b']), False
+        )
+
+        assert changed is False
+        assert dict(new='data') == result
+        p_mock.assert_not_called()
+        g_mock.assert_called_once()
+        s_mock.assert_not_called()
+
+    def test_groups_update_concurrency(self, mocker):
+        client = mocker.Mock()
+        g_mock = mocker.patch.object(user_utils, 'update_groups')
+        g_mock.return_value = True
+
+        user_utils.sync(
+            dict(groups=['a']), client, '/path', dict(groups=['b']), False,
+            return_object='none', concurrency=6,
+        )
+
+        g_mock.assert_called_once_with(
+            client, '/path', ['a'], ['b'], False, 6,
+        )
+
+    def test_groups_update_check_mode(self, mocker):
+        client = mocker.Mock()
+        client.get.return_value = http.Response(200, '{"new": "data"}')
+        p_mock = mocker.patch.object(user_utils, 'update_password')
+        g_mock = mocker.patch.object(user_utils, 'update_groups')
+        g_mock.return_value = True
+        s_mock = mocker.patch.object(user_utils, 'update_state')
+
+        changed, result = user_utils.sync(
+            dict(x=3, groups=['a']), client, '/path', dict(groups=['b']), True
+        )
+
+        assert changed is True
+        assert dict(x=3, groups=['b']) == result
+        p_mock.assert_not_called()
+        g_mock.assert_called_once()
+        s_mock.assert_not_called()
+
+    def test_state_update(self, mocker):
+        client = mocker.Mock()
+        client.get.return_value = http.Response(200, '{"new": "data"}')
+        p_mock = mocker.patch.object(user_utils, 'update_password')
+        g_mock = mocker.patch.object(user_utils, 'update_groups')
+        s_mock = mocker.patch.object(user_utils, 'update_state')
+        s_mock.return_value = False
+
+        changed, result = user_utils.sync(
+            dict(disabled=True), client, '/path', dict(disabled=False), False
+        )
+
+        assert changed is False
+        assert dict(new='data') == result
+        p_mock.assert_not_called()
+        g_mock.assert_not_called()
+        s_mock.assert_called_once()
+
+    def test_state_update_check_mode(self, mocker):
+        client = mocker.Mock()
+        client.get.return_value = http.Response(200, '{"new": "data"}')
+        p_mock = mocker.patch.object(user_utils, 'update_password')
+        g_mock = mocker.patch.object(user_utils, 'update_groups')
+        s_mock = mocker.patch.object(user_utils, 'update_state')
+        s_mock.return_value = True
+
+        changed, result = user_utils.sync(
+            dict(disabled=True), client, '/path', dict(disabled=False), True
+        )
+
+        assert changed is True
+        assert dict(disabled=False) == result
+        p_mock.assert_not_called()
+        g_mock.assert_not_called()
+        s_mock.assert_called_once()
+
+
+class TestBuildPayload:
+    def test_minimal_parameters(self):
+        payload = user_utils.build_payload(dict(
+            name="alice", state="enabled", password=None,
+            password_hash=None, groups=None,
+        ))
+
+        assert dict(username="alice", disabled=False) == payload
+
+    def test_all_parameters(self):
+        payload = user_utils.build_payload(dict(
+            name="alice", state="disabled", password="pass",
+            password_hash="hash", groups=["dev"],
+        ))
+
+        assert dict(
+            username="alice", disabled=True, password="pass",
+            password_hash="hash", groups=["dev"],
+        ) == payload
@@ -7,11 +7,12 @@ from __future__ import absolute_import, division, print_function
 __metaclass__ = type
 
 import sys
+import threading
 
 import pytest
 
 from ansible_collections.sensu.sensu_go.plugins.module_utils import (
-    errors, http, utils,
+    client as client_module, errors, http, utils,
 )
 
 pytestmark = pytest.mark.skipif(
@@ -21,7 +22,7 @@ pytestmark = pytest.mark.skipif(
 
 class TestSync:
     def test_absent_no_current_object(self, mocker):
-        client = mocker.Mock()
+        client = mocker.Mock(sync_cache_ttl=0)
         client.get.return_value = http.Response(404, "")
 
         changed, object = utils.sync("absent", client, "/path", {}, False)
@@ -30,7 +31,7 @@ class TestSync:
         assert object is None
 
     def test_absent_no_current_object_check(self, mocker):
-        client = mocker.Mock()
+        client = mocker.Mock(sync_cache_ttl=0)
         client.get.return_value = http.Response(404, "")
 
         changed, object = utils.sync("absent", client, "/path", {}, True)
@@ -39,7 +40,7 @@ class TestSync:
         assert object is None
 
     def test_absent_current_object_present(self, mocker):
-        client = mocker.Mock()
+        client = mocker.Mock(sync_cache_ttl=0)
         client.get.return_value = http.Response(200, '{}')
         client.delete.return_value = http.Response(204, "")
 
@@ -50,7 +51,7 @@ class TestSync:
         client.delete.assert_called_with("/path")
 
     def test_absent_current_object_present_check(self, mocker):
-        client = mocker.Mock()
+        client = mocker.Mock(sync_cache_ttl=0)
         client.get.return_value = http.Response(200, '{}')
         client.delete.return_value = http.Response(204, "")
 
@@ -61,7 +62,7 @@ class TestSync:
         client.delete.assert_not_called()
 
     def test_present_no_current_object(self, mocker):
-        client = mocker.Mock()
+        client = mocker.Mock(sync_cache_ttl=0)
         client.get.side_effect = (
             http.Response(404, ""),
             http.Response(200, '{"new": "data"}'),
@@ -77,7 +78,7 @@ class TestSync:
         client.put.assert_called_once_with("/path", {"my": "data"})
 
     def test_present_no_current_object_check(self, mocker):
-        client = mocker.Mock()
+        client = mocker.Mock(sync_cache_ttl=0)
         client.get.return_value = http.Response(404, "")
 
         changed, object = utils.sync(
@@ -89,7 +90,7 @@ class TestSync:
         client.put.assert_not_called()
 
     def test_present_current_object_differ(self, mocker):
-        client = mocker.Mock()
+        client = mocker.Mock(sync_cache_ttl=0)
         client.get.side_effect = (
             http.Response(200, '{"current": "data"}'),
             http.Response(200, '{"new": "data"}'),
@@ -105,7 +106,7 @@ class TestSync:
         client.put.assert_called_once_with("/path", {"my": "data"})
 
     def test_present_current_object_differ_check(self, mocker):
-        client = mocker.Mock()
+        client = mocker.Mock(sync_cache_ttl=0)
         client.get.return_value = http.Response(200, '{"current": "data"}')
 
         changed, object = utils.sync(
@@ -117,7 +118,7 @@ class TestSync:
         client.put.assert_not_called()
 
     def test_present_current_object_does_not_differ(self, mocker):
-        client = mocker.Mock()
+        client = mocker.Mock(sync_cache_ttl=0)
         client.get.return_value = http.Response(200, '{"my": "data"}')
 
         changed, object = utils.sync(
@@ -129,7 +130,7 @@ class TestSync:
         client.put.assert_not_called()
 
     def test_present_current_object_does_not_differ_check(self, mocker):
-        client = mocker.Mock()
+        client = mocker.Mock(sync_cache_ttl=0)
         client.get.return_value = http.Response(200, '{"my": "data"}')
 
         changed, object = utils.sync(
@@ -140,6 +141,210 @@ class TestSync:
         assert {"my": "data"} == object
         client.put.assert_not_called()
 
+    def test_present_return_payload(self, mocker):
+        client = mocker.Mock(sync_cache_ttl=0)
+        client.get.return_value = http.Response(
+            200, '{"metadata": {"name": "a", "created_by": "admin"}, "x": 1}',
+        )
+        client.put.return_value = http.Response(201, "")
+
+        changed, object = utils.sync(
+            "present", client, "/path",
+            {"metadata": {"name": "a"}, "x": 2}, False,
+            return_object="payload",
+        )
+
+        assert changed is True
+        assert {
+            "metadata": {"name": "a", "created_by": "admin"}, "x": 2,
+        } == object
+        client.get.assert_called_once_with("/path", cache_object=True)
+
+    def test_present_return_none(self, mocker):
+        client = mocker.Mock(sync_cache_ttl=0)
+        client.get.return_value = http.Response(404, "")
+        client.put.return_value = http.Response(201, "")
+
+        changed, object = utils.sync(
+            "present", client, "/path", {"my": "data"}, False,
+            return_object="none",
+        )
+
+        assert changed is True
+        assert object is None
+        client.get.assert_called_once_with("/path", cache_object=True)
+
+    def test_present_unchanged_return_none(self, mocker):
+        client = mocker.Mock(sync_cache_ttl=0)
+        client.get.return_value = http.Response(200, '{"my": "data"}')
+
+        changed, object = utils.sync(
+            "present", client, "/path", {"my": "data"}, False,
+            return_object="none",
+        )
+
+        assert changed is False
+        assert object is None
+
+
+class TestFingerprint:
+    def test_ignore_key_order(self):
+        assert utils.fingerprint(dict(a=1, b=dict(c=2, d=3))) == \
+            utils.fingerprint(dict(b=dict(d=3, c=2), a=1))
+
+    def test_list_order_matters(self):
+        assert utils.fingerprint(dict(a=[1, 2])) != \
+            utils.fingerprint(dict(a=[2, 1]))
+
+    def test_set_keys(self):
+        assert utils.fingerprint(dict(a=["x", "y", "x"], b=[1]), ["a"]) == \
+            utils.fingerprint(dict(a=["y", "x"], b=[1]), ["a"])
+
+    def test_unhashable_set_items(self):
+        assert utils.fingerprint(dict(a=[{}]), ["a"]) == \
+            utils.fingerprint(dict(a=[{}]))
+
+
+class TestSyncCache:
+    @staticmethod
+    def client(mocker, tmpdir, sync_cache_ttl=60, force_refresh=False):
+        c = client_module.Client(
+            "http://example.com", None, None, "key", True, None,
+            cache_dir=str(tmpdir), sync_cache_ttl=sync_cache_ttl,
+            force_refresh=force_refresh,
+        )
+        c.request = mocker.Mock(
+            return_value=http.Response(200, '{"my": ["b", "a"], "x": 1}'),
+        )
+        return c
+
+    def test_disabled_without_cache_dir(self):
+        c = client_module.Client(
+            "http://example.com", None, None, "key", True, None,
+            sync_cache_ttl=60,
+        )
+
+        assert 0 == c.sync_cache_ttl
+
+    def test_skip_unchanged_payload(self, mocker, tmpdir):
+        c = self.client(mocker, tmpdir)
+        utils.sync("present", c, "/path", {"my": ["b", "a"]}, False)
+        c.request.reset_mock()
+
+        changed, object = utils.sync(
+            "present", c, "/path", {"my": ["b", "a"]}, False,
+        )
+
+        assert changed is False
+        assert {"my": ["b", "a"], "x": 1} == object
+        c.request.assert_not_called()
+
+    def test_skip_reordered_set(self, mocker, tmpdir):
+        c = self.client(mocker, tmpdir)
+        utils.sync(
+            "present", c, "/path", {"my": ["b", "a"]}, False,
+            set_keys=["my"],
+        )
+        c.request.reset_mock()
+
+        changed, object = utils.sync(
+            "present", c, "/path", {"my": ["a", "b"]}, False,
+            return_object="none", set_keys=["my"],
+        )
+
+        assert (False, None) == (changed, object)
+        c.request.assert_not_called()
+
+    def test_sync_changed_payload(self, mocker, tmpdir):
+        c = self.client(mocker, tmpdir)
+        utils.sync("present", c, "/path", {"my": ["b", "a"]}, False)
+        c.request.reset_mock()
+
+        changed, _object = utils.sync(
+            "present", c, "/path", {"my": ["c"]}, False, return_object="none",
+        )
+
+        assert changed is True
+        c.request.assert_any_call("PUT", "/path", {"my": ["c"]})
+
+    def test_do_not_remember_changed_objects(self, mocker, tmpdir):
+        c = self.client(mocker, tmpdir)
+        utils.sync("present", c, "/path", {"my": ["c"]}, True)
+
+        assert c.cache.get("sync", "http://example.com", "/path") is None
+
+    def test_force_refresh(self, mocker, tmpdir):
+        utils.sync(
+            "present", self.client(mocker, tmpdir), "/path",
+            {"my": ["b", "a"]}, False,
+        )
+        c = self.client(mocker, tmpdir, force_refresh=True)
+
+        utils.sync("present", c, "/path", {"my": ["b", "a"]}, False)
+
+        c.request.assert_called_once_with("GET", "/path")
+
+    def test_expire_entries(self, mocker, tmpdir):
+        time = mocker.patch.object(utils.time, "time", return_value=1000)
+        c = self.client(mocker, tmpdir)
+        utils.sync("present", c, "/path", {"my": ["b", "a"]}, False)
+        c.request.reset_mock()
+        time.return_value = 1061
+
+        utils.sync("present", c, "/path", {"my": ["b", "a"]}, False)
+
+        c.request.assert_called_once_with("GET", "/path")
+
+    def test_ignore_corrupted_entries(self, mocker, tmpdir):
+        c = self.client(mocker, tmpdir)
+        c.cache.set(
+            dict(desired=utils.fingerprint({"my": 1}), remote="x", object={}),
+            None, "sync", "http://example.com", "/path",
+        )
+
+        utils.sync("present", c, "/path", {"my": 1}, False)
+
+        c.request.assert_any_call("GET", "/path")
+
+    def test_modification_evicts_entry(self, mocker, tmpdir):
+        c = self.client(mocker, tmpdir)
+        utils.sync("present", c, "/path", {"my": ["b", "a"]}, False)
+
+        c.put("/path", {})
+
+        assert c.cache.get("sync", "http://example.com", "/path") is None
+
+    def test_absent_ignores_cache(self, mocker, tmpdir):
+        c = self.client(mocker, tmpdir)
+        utils.sync("present", c, "/path", {"my": ["b", "a"]}, False)
+        c.request.reset_mock()
+
+        utils.sync("absent", c, "/path", None, True)
+
+        c.request.assert_called_once_with("GET", "/path")
+
+
+class TestMergeRemoteMetadata:
+    def test_no_remote_object(self):
+        payload = dict(metadata=dict(name="a"), x=1)
+
+        assert payload == utils.merge_remote_metadata(None, payload)
+
+    def test_labels_and_annotations_are_replaced(self):
+        remote = dict(
+            metadata=dict(
+                name="a", created_by="admin", labels=dict(a="b"),
+                annotations=dict(c="d"),
+            ),
+            x=1,
+        )
+        payload = dict(metadata=dict(name="a", labels=dict(e="f")), x=2)
+
+        assert dict(
+            metadata=dict(name="a", created_by="admin", labels=dict(e="f")),
+            x=2,
+        ) == utils.merge_remote_metadata(remote, payload)
+
 
 class TestSyncV1:
     def test_parameter_passthrough(self, mocker):
@@ -283,6 +488,171 @@ class TestGet:
         client.get.assert_called_once_with("/get")
 
 
+class TestIterObjects:
+    def test_single_request_without_pagination(self, mocker):
+        client = mocker.Mock()
+        client.get.return_value = http.Response(200, '[{"a": 1}, {"b": 2}]')
+
+        objects = list(utils.iter_objects(client, "/path"))
+
+        assert [{"a": 1}, {"b": 2}] == objects
+        client.get.assert_called_once_with("/path")
+
+    def test_single_object(self, mocker):
+        client = mocker.Mock()
+        client.get.return_value = http.Response(200, '{"a": 1}')
+
+        assert [{"a": 1}] == list(utils.iter_objects(client, "/path/a"))
+
+    def test_missing_object(self, mocker):
+        client = mocker.Mock()
+        client.get.return_value = http.Response(404, "")
+
+        assert [] == list(utils.iter_objects(client, "/path/a", 10))
+
+    def test_follow_continue_tokens(self, mocker):
+        client = mocker.Mock()
+        client.get.side_effect = (
+            http.Response(
+                200, '[{"a": 1}, {"b": 2}]', headers={"Sensu-Continue": "c1"},
+            ),
+            http.Response(200, '[{"c": 3}]'),
+        )
+
+        objects = list(utils.iter_objects(client, "/path", page_size=2))
+
+        assert [{"a": 1}, {"b": 2}, {"c": 3}] == objects
+        client.get.assert_has_calls([
+            mocker.call("/path?limit=2"),
+            mocker.call("/path?continue=c1&limit=2"),
+        ])
+
+    def test_fetch_pages_lazily(self, mocker):
+        client = mocker.Mock()
+        client.get.return_value = http.Response(
+            200, '[{"a": 1}]', headers={"Sensu-Continue": "c1"},
+        )
+
+        next(utils.iter_objects(client, "/path", page_size=1))
+
+        client.get.assert_called_once_with("/path?limit=1")
+
+    def test_max_items_limits_last_page(self, mocker):
+        client = mocker.Mock()
+        client.get.side_effect = (
+            http.Response(
+                200, '[{"a": 1}, {"b": 2}]', headers={"Sensu-Continue": "c1"},
+            ),
+            http.Response(
+                200, '[{"c": 3}]', headers={"Sensu-Continue": "c2"},
+            ),
+        )
+
+        objects = list(utils.iter_objects(client, "/path", 2, max_items=3))
+
+        assert [{"a": 1}, {"b": 2}, {"c": 3}] == objects
+        client.get.assert_has_calls([
+            mocker.call("/path?limit=2"),
+            mocker.call("/path?continue=c1&limit=1"),
+        ])
+
+    def test_max_items_without_pagination_support(self, mocker):
+        client = mocker.Mock()
+        client.get.return_value = http.Response(200, '[{"a": 1}, {"b": 2}]')
+
+        objects = list(utils.iter_objects(client, "/path", max_items=1))
+
+        assert [{"a": 1}] == objects
+        client.get.assert_called_once_with("/path?limit=1")
+
+    @pytest.mark.parametrize("page_size,max_items", [(0, None), (None, -1)])
+    def test_invalid_limits(self, mocker, page_size, max_items):
+        with pytest.raises(errors.SyncError):
+            list(utils.iter_objects(
+                mocker.Mock(), "/path", page_size, max_items,
+            ))
+
+    def test_failure(self, mocker):
+        client = mocker.Mock()
+        client.get.return_value = http.Response(500, "bad")
+
+        with pytest.raises(errors.SyncError, match="500"):
+            list(utils.iter_objects(client, "/path", page_size=2))
+
+    def test_keep_existing_query(self, mocker):
+        client = mocker.Mock()
+        client.get.return_value = http.Response(200, '[]')
+
+        list(utils.iter_objects(client, "/path?fieldSelector=a", 10))
+
+        client.get.assert_called_once_with("/path?fieldSelector=a&limit=10")
+
+
+class TestProject:
+    def test_no_fields(self):
+        obj = dict(a=1)
+
+        assert obj is utils.project(obj, None)
+
+    def test_nested_fields(self):
+        obj = dict(
+            metadata=dict(name="n", namespace="ns"),
+            system=dict(platform="linux", network=dict(interfaces=[])),
+            last_seen=123,
+        )
+
+        result = utils.project(
+            obj, ["metadata.name", "last_seen", "system.platform"],
+        )
+
+        assert dict(
+            metadata=dict(name="n"), system=dict(platform="linux"),
+            last_seen=123,
+        ) == result
+
+    def test_missing_fields(self):
+        obj = dict(a=dict(b=1), c=[dict(d=2)])
+
+        assert {} == utils.project(obj, ["x", "a.x", "a.b.c", "c.d"])
+
+    def test_falsy_values(self):
+        obj = dict(a=None, b=dict(c=0))
+
+        assert dict(a=None, b=dict(c=0)) == utils.project(obj, ["a", "b.c"])
+
+
+class TestPrefetch:
+    def test_prefetch(self, mocker):
+        client = mocker.Mock()
+        client.get.return_value = http.Response(
+            200, '[{"metadata": {"name": "a"}}]',
+        )
+
+        utils.prefetch(client, "/collection")
+
+        client.get.assert_called_once_with("/collection")
+        client.index_collection.assert_called_once_with(
+            "/collection", [dict(metadata=dict(name="a"))],
+        )
+
+    def test_prefetch_missing_collection(self, mocker):
+        client = mocker.Mock()
+        client.get.return_value = http.Response(404, "")
+
+        utils.prefetch(client, "/collection")
+
+        client.index_collection.assert_called_once_with("/collection", [])
+
+    def test_prefetch_failure(self, mocker):
+        client = mocker.Mock()
+        client.get.return_value = http.Response(500, "")
+
+        with pytest.raises(errors.SyncError, match="500"):
+            utils.prefetch(client, "/collection")
+
+        client.index_collection.assert_not_called()
+
+
 class TestDelete:
     @pytest.mark.parametrize(
         "status", [100, 200, 201, 202, 203, 400, 401, 403, 500, 501],
@@ -328,6 +698,39 @@ class TestPut:
         client.put.assert_called_once_with("/put", {"payload": "data"})
 
 
+class TestMapConcurrently:
+    @pytest.mark.parametrize("concurrency", [1, 2, 10])
+    def test_keep_order(self, concurrency):
+        result = utils.map_concurrently(
+            lambda x: x * 2, range(5), concurrency,
+        )
+
+        assert [0, 2, 4, 6, 8] == result
+
+    def test_use_multiple_threads(self):
+        barrier = threading.Event()
+        seen = []
+
+        def func(item):
+            seen.append(item)
+            if len(seen) == 2:
+                barrier.set()
+            # Both calls must be running at the same time for this to pass.
+            assert barrier.wait(5)
+            return item
+
+        assert [1, 2] == utils.map_concurrently(func, [1, 2], 2)
+
+    def test_reraise_failure(self):
+        def func(item):
+            if item == 3:
+                raise errors.Error("bad")
+            return item
+
+        with pytest.raises(errors.Error, match="bad"):
+            utils.map_concurrently(func, range(6), 2)
+
+
 class TestDictToSingleItemDicts:
     def test_conversion(self):
         result = utils.dict_to_single_item_dicts({"a": 0, 1: "b"})
@@ -378,6 +781,28 @@ class TestBuildUrlPath:
             "core", "v2", "default", *parts
         )
 
+    def test_build_url_path_with_query(self):
+        path = utils.build_url_path(
+            "core", "v2", "default", "events",
+            labelSelector='region == "us-west-1"', fieldSelector=None,
+        )
+
+        assert path == (
+            "/api/core/v2/namespaces/default/events"
+            "?labelSelector=region+%3D%3D+%22us-west-1%22"
+        )
+
+
+class TestAddQuery:
+    def test_no_query(self):
+        assert "/path" == utils.add_query("/path", a=None)
+
+    def test_sorted_parameters(self):
+        assert "/path?a=1&b=%26" == utils.add_query("/path", b="&", a=1)
+
+    def test_extend_existing_query(self):
+        assert "/path?a=1&b=2" == utils.add_query("/path?a=1", b=2)
+
 
 class TestBuildCoreV2Path:
     def test_build_path_no_namespace(self):
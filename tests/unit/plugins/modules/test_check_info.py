@@ -32,6 +32,35 @@ class TestSensuGoCheckInfo(ModuleTestCase):
         assert path == "/api/core/v2/namespaces/my/checks"
         assert context.value.args[0]["objects"] == [1, 2, 3]
 
+    def test_get_checks_from_multiple_namespaces(self, mocker):
+        get_mock = mocker.patch.object(utils, "get")
+        get_mock.side_effect = lambda _client, path: [path]
+        set_module_args(namespaces=["a", "b"], concurrency=2)
+
+        with pytest.raises(AnsibleExitJson) as context:
+            check_info.main()
+
+        assert context.value.args[0]["objects"] == [
+            "/api/core/v2/namespaces/a/checks",
+            "/api/core/v2/namespaces/b/checks",
+        ]
+
+    def test_get_checks_from_all_namespaces(self, mocker):
+        get_mock = mocker.patch.object(utils, "get")
+        get_mock.side_effect = lambda _client, path: (
+            [dict(name="x"), dict(name="y")] if path.endswith("/namespaces")
+            else [path]
+        )
+        set_module_args(all_namespaces=True, name="c")
+
+        with pytest.raises(AnsibleExitJson) as context:
+            check_info.main()
+
+        assert context.value.args[0]["objects"] == [
+            "/api/core/v2/namespaces/x/checks/c",
+            "/api/core/v2/namespaces/y/checks/c",
+        ]
+
     def test_get_single_check(self, mocker):
         get_mock = mocker.patch.object(utils, "get")
         get_mock.return_value = 4
@@ -19,54 +19,6 @@ pytestmark = pytest.mark.skipif(
 )
 
 
-class TestDoDiffer:
-    @pytest.mark.parametrize('current', [
-        dict(no=dict(system="here")),
-        dict(system=dict(here="is")),
-    ])
-    def test_no_system_in_desired(self, current):
-        assert entity.do_differ(current, {}) is False
-
-    def test_system_keys_not_in_current_are_ignored(self):
-        assert entity.do_differ(
-            dict(system=dict(a=1, b=2)),
-            dict(system=dict(a=1)),
-        ) is False
-
-    def test_actual_changes_are_detected(self):
-        assert entity.do_differ(
-            dict(system=dict(a=1, b=2)),
-            dict(system=dict(a=2)),
-        ) is True
-
-    def test_missing_keys_are_detected(self):
-        assert entity.do_differ(
-            dict(system=dict(b=2)),
-            dict(system=dict(a=2)),
-        ) is True
-
-    @pytest.mark.parametrize("current,desired", [
-        ([], None), ([], []),
-        (["a"], ["a"]),
-        (["a", "b"], ["b", "a"]),
-    ])
-    def test_no_diff_in_subscriptions(self, current, desired):
-        assert entity.do_differ(
-            dict(subscriptions=current), dict(subscriptions=desired),
-        ) is False
-
-    @pytest.mark.parametrize("current,desired", [
-        ([], ["a"]), (["a"], []),
-        (["a"], ["b"]),
-        (["a", "b"], ["a", "c"]),
-    ])
-    def test_diff_in_subscriptions(self, current, desired):
-        print((current, desired))
-        assert entity.do_differ(
-            dict(subscriptions=current), dict(subscriptions=desired),
-        ) is True
-
-
 class TestEntity(ModuleTestCase):
     def test_minimal_entity_parameters(self, mocker):
         sync_mock = mocker.patch.object(utils, 'sync')
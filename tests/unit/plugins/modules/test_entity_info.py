@@ -32,6 +32,35 @@ class TestEntityInfo(ModuleTestCase):
         assert path == "/api/core/v2/namespaces/my/entities"
         assert context.value.args[0]["objects"] == [1, 2, 3]
 
+    def test_get_entities_in_pages(self, mocker):
+        iter_mock = mocker.patch.object(utils, "iter_objects")
+        iter_mock.return_value = iter([1, 2, 3])
+        set_module_args(page_size=2, max_items=3)
+
+        with pytest.raises(AnsibleExitJson) as context:
+            entity_info.main()
+
+        _client, path, page_size, max_items = iter_mock.call_args[0]
+        assert path == "/api/core/v2/namespaces/default/entities"
+        assert page_size == 2
+        assert max_items == 3
+        assert context.value.args[0]["objects"] == [1, 2, 3]
+
+    def test_get_entity_fields(self, mocker):
+        get_mock = mocker.patch.object(utils, "get")
+        get_mock.return_value = [
+            dict(metadata=dict(name="a", namespace="default"), last_seen=1),
+            dict(metadata=dict(name="b", namespace="default"), last_seen=2),
+        ]
+        set_module_args(fields=["metadata.name"])
+
+        with pytest.raises(AnsibleExitJson) as context:
+            entity_info.main()
+
+        assert context.value.args[0]["objects"] == [
+            dict(metadata=dict(name="a")), dict(metadata=dict(name="b")),
+        ]
+
     def test_get_single_entity(self, mocker):
         get_mock = mocker.patch.object(utils, "get")
         get_mock.return_value = 4
@@ -6,7 +6,7 @@ import sys
 import pytest
 
 from ansible_collections.sensu.sensu_go.plugins.module_utils import (
-    errors, http,
+    errors, event_utils,
 )
 from ansible_collections.sensu.sensu_go.plugins.modules import event
 
@@ -19,41 +19,9 @@ pytestmark = pytest.mark.skipif(
 )
 
 
-class TestGetObjects:
-    def test_get_entity(self, mocker):
-        client = mocker.Mock()
-        client.get.return_value = http.Response(200, '{"entity": "entity"}')
-        resp = event.get_entity(client, 'default', 'entity')
-
-        assert resp == {'entity': 'entity'}
-
-    def test_get_entity_404(self, mocker):
-        client = mocker.Mock()
-        client.get.return_value = http.Response(404, '')
-
-        with pytest.raises(errors.SyncError,
-                           match="Entity with name 'entity' does not exist on remote."):
-            event.get_entity(client, 'default', 'entity')
-
-    def test_get_check(self, mocker):
-        client = mocker.Mock()
-        client.get.return_value = http.Response(200, '{"check": "check"}')
-        resp = event.get_check(client, 'default', 'check')
-
-        assert resp == {'check': 'check'}
-
-    def test_get_check_404(self, mocker):
-        client = mocker.Mock()
-        client.get.return_value = http.Response(404, '')
-
-        with pytest.raises(errors.SyncError,
-                           match="Check with name 'check' does not exist on remote."):
-            event.get_check(client, 'default', 'check')
-
-
 class TestEvent(ModuleTestCase):
     def test_missing_entity_on_remote(self, mocker):
-        get_entity_mock = mocker.patch.object(event, 'get_entity')
+        get_entity_mock = mocker.patch.object(event_utils, 'get_entity')
         get_entity_mock.side_effect = errors.SyncError('Error')
 
         set_module_args(
@@ -65,8 +33,8 @@ class TestEvent(ModuleTestCase):
             event.main()
 
     def test_missing_check_on_remote(self, mocker):
-        mocker.patch.object(event, 'get_entity')
-        get_check_mock = mocker.patch.object(event, 'get_check')
+        mocker.patch.object(event_utils, 'get_entity')
+        get_check_mock = mocker.patch.object(event_utils, 'get_check')
         get_check_mock.side_effect = errors.SyncError('Error')
 
         set_module_args(
@@ -80,7 +48,7 @@ class TestEvent(ModuleTestCase):
     def test_minimal_event_parameters(self, mocker):
         send_event_mock = mocker.patch.object(event, 'send_event')
         send_event_mock.return_value = True, {}
-        get_entity_mock = mocker.patch.object(event, 'get_entity')
+        get_entity_mock = mocker.patch.object(event_utils, 'get_entity')
         get_entity_mock.return_value = dict(
             metadata=dict(
                 name='awesome_entity',
@@ -88,7 +56,7 @@ class TestEvent(ModuleTestCase):
             ),
             entity_class='proxy'
         )
-        get_check_mock = mocker.patch.object(event, 'get_check')
+        get_check_mock = mocker.patch.object(event_utils, 'get_check')
         get_check_mock.return_value = dict(
             metadata=dict(
                 name='awesome_check',
@@ -147,9 +115,9 @@ class TestEvent(ModuleTestCase):
         )
         send_event_mock = mocker.patch.object(event, 'send_event')
         send_event_mock.return_value = True, {}
-        get_entity_mock = mocker.patch.object(event, 'get_entity')
+        get_entity_mock = mocker.patch.object(event_utils, 'get_entity')
         get_entity_mock.return_value = entity_object
-        get_check_mock = mocker.patch.object(event, 'get_check')
+        get_check_mock = mocker.patch.object(event_utils, 'get_check')
         get_check_mock.return_value = check_object
 
         set_module_args(
@@ -273,7 +241,7 @@ class TestEvent(ModuleTestCase):
         assert check_mode is False
 
     def test_failure(self, mocker):
-        get_entity_mock = mocker.patch.object(event, 'get_entity')
+        get_entity_mock = mocker.patch.object(event_utils, 'get_entity')
         get_entity_mock.side_effect = errors.Error('Bad error')
         set_module_args(
             entity='awesome_entity',
@@ -284,3 +252,43 @@ class TestEvent(ModuleTestCase):
 
         with pytest.raises(AnsibleFailJson):
             event.main()
+
+    def test_lean_event(self, mocker):
+        send_event_mock = mocker.patch.object(event, 'send_event')
+        send_event_mock.return_value = True, {}
+        get_entity_mock = mocker.patch.object(event_utils, 'get_entity')
+        get_check_mock = mocker.patch.object(event_utils, 'get_check')
+        set_module_args(
+            entity='awesome_entity',
+            check='awesome_check',
+            lean=True,
+            check_attributes=dict(
+                status='critical',
+            ),
+        )
+
+        with pytest.raises(AnsibleExitJson):
+            event.main()
+
+        get_entity_mock.assert_not_called()
+        get_check_mock.assert_not_called()
+        _client, path, payload, check_mode = send_event_mock.call_args[0]
+        assert path == '/api/core/v2/namespaces/default/events/awesome_entity/awesome_check'
+        assert payload == dict(
+            metadata=dict(
+                namespace='default',
+            ),
+            entity=dict(
+                metadata=dict(
+                    name='awesome_entity',
+                    namespace='default',
+                ),
+            ),
+            check=dict(
+                metadata=dict(
+                    name='awesome_check',
+                    namespace='default',
+                ),
+                status=2,
+            ),
+        )
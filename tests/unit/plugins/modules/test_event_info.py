@@ -32,6 +32,38 @@ class TestEventInfo(ModuleTestCase):
         assert path == '/api/core/v2/namespaces/my/events'
         assert context.value.args[0]['objects'] == [1, 2, 3]
 
+    def test_get_events_in_pages(self, mocker):
+        iter_mock = mocker.patch.object(utils, 'iter_objects')
+        iter_mock.return_value = iter([1, 2])
+        set_module_args(page_size=500)
+
+        with pytest.raises(AnsibleExitJson) as context:
+            event_info.main()
+
+        _client, path, page_size, max_items = iter_mock.call_args[0]
+        assert path == '/api/core/v2/namespaces/default/events'
+        assert page_size == 500
+        assert max_items is None
+        assert context.value.args[0]['objects'] == [1, 2]
+
+    def test_get_events_with_selectors(self, mocker):
+        get_mock = mocker.patch.object(utils, 'get')
+        get_mock.return_value = [1]
+        set_module_args(
+            label_selector='team == ops',
+            field_selector='linux in event.entity.subscriptions',
+        )
+
+        with pytest.raises(AnsibleExitJson):
+            event_info.main()
+
+        _client, path = get_mock.call_args[0]
+        assert path == (
+            '/api/core/v2/namespaces/default/events'
+            '?fieldSelector=linux+in+event.entity.subscriptions'
+            '&labelSelector=team+%3D%3D+ops'
+        )
+
     def test_get_events_by_entity(self, mocker):
         get_mock = mocker.patch.object(utils, 'get')
         get_mock.return_value = [1, 2]
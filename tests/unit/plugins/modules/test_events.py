@@ -0,0 +1,212 @@
+from __future__ import absolute_import, division, print_function
+__metaclass__ = type
+
+import sys
+
+import pytest
+
+from ansible_collections.sensu.sensu_go.plugins.module_utils import (
+    errors, event_utils, http, utils,
+)
+from ansible_collections.sensu.sensu_go.plugins.modules import events
+
+from .common.utils import (
+    AnsibleExitJson, AnsibleFailJson, ModuleTestCase, set_module_args,
+)
+
+pytestmark = pytest.mark.skipif(
+    sys.version_info < (2, 7), reason="requires python2.7 or higher"
+)
+
+
+class TestFetchObjects:
+    def test_fetch_each_object_once(self, mocker):
+        getter = mocker.Mock(side_effect=lambda c, ns, name: dict(name=name))
+
+        result = events.fetch_objects(
+            "client", getter, [("ns", "a"), ("ns", "b"), ("ns", "a")], 2,
+        )
+
+        assert result == {
+            ("ns", "a"): (dict(name="a"), None),
+            ("ns", "b"): (dict(name="b"), None),
+        }
+        assert 2 == getter.call_count
+
+    def test_record_errors(self, mocker):
+        getter = mocker.Mock(side_effect=errors.SyncError("missing"))
+
+        result = events.fetch_objects("client", getter, [("ns", "a")], 2)
+
+        assert result == {("ns", "a"): (None, "missing")}
+
+
+class TestSendEvent:
+    @staticmethod
+    def item():
+        return dict(
+            entity="e", check="c", namespace="ns", timestamp=None,
+            check_attributes=None, metric_attributes=None,
+        )
+
+    def test_send_event(self, mocker):
+        put_mock = mocker.patch.object(utils, "put")
+
+        result = events.send_event(
+            "client", self.item(), {("ns", "e"): (dict(a=1), None)},
+            {("ns", "c"): (dict(b=2), None)}, False,
+        )
+
+        assert result == dict(
+            entity="e", check="c", namespace="ns", changed=True, failed=False,
+        )
+        put_mock.assert_called_once_with(
+            "client", "/api/core/v2/namespaces/ns/events/e/c", dict(
+                metadata=dict(namespace="ns"), entity=dict(a=1),
+                check=dict(b=2),
+            ),
+        )
+
+    def test_check_mode(self, mocker):
+        put_mock = mocker.patch.object(utils, "put")
+
+        result = events.send_event(
+            "client", self.item(), {("ns", "e"): (dict(a=1), None)},
+            {("ns", "c"): (dict(b=2), None)}, True,
+        )
+
+        assert result["changed"] is True
+        put_mock.assert_not_called()
+
+    def test_missing_entity(self, mocker):
+        put_mock = mocker.patch.object(utils, "put")
+
+        result = events.send_event(
+            "client", self.item(), {("ns", "e"): (None, "no entity")},
+            {("ns", "c"): (dict(b=2), None)}, False,
+        )
+
+        assert result["failed"] is True
+        assert result["msg"] == "no entity"
+        put_mock.assert_not_called()
+
+    def test_lean_event(self, mocker):
+        put_mock = mocker.patch.object(utils, "put")
+
+        result = events.send_event("client", self.item(), None, None, False)
+
+        assert result["changed"] is True
+        put_mock.assert_called_once_with(
+            "client", "/api/core/v2/namespaces/ns/events/e/c", dict(
+                metadata=dict(namespace="ns"),
+                entity=dict(
+                    metadata=dict(name="e", namespace="ns"),
+                ),
+                check=dict(metadata=dict(name="c", namespace="ns")),
+            ),
+        )
+
+    def test_put_failure(self, mocker):
+        put_mock = mocker.patch.object(utils, "put")
+        put_mock.side_effect = errors.SyncError("put failed")
+
+        result = events.send_event(
+            "client", self.item(), {("ns", "e"): (dict(a=1), None)},
+            {("ns", "c"): (dict(b=2), None)}, False,
+        )
+
+        assert result["changed"] is False
+        assert result["failed"] is True
+        assert result["msg"] == "put failed"
+
+
+class TestEvents(ModuleTestCase):
+    def test_send_all_events(self, mocker):
+        client = mocker.Mock()
+        client.get.side_effect = lambda path: http.Response(
+            200, '{"path": "%s"}' % path,
+        )
+        client.put.return_value = http.Response(201, "")
+        mocker.patch(
+            "ansible_collections.sensu.sensu_go.plugins.module_utils."
+            "arguments.get_sensu_client",
+        ).return_value = client
+        set_module_args(
+            concurrency=2,
+            events=[
+                dict(entity="e1", check="c", check_attributes=dict(
+                    status="warning",
+                )),
+                dict(entity="e2", check="c", namespace="other"),
+                dict(entity="e1", check="d"),
+            ],
+        )
+
+        with pytest.raises(AnsibleExitJson) as context:
+            events.main()
+
+        assert context.value.args[0]["changed"] is True
+        assert [
+            ("e1", "default"), ("e2", "other"), ("e1", "default"),
+        ] == [
+            (r["entity"], r["namespace"])
+            for r in context.value.args[0]["results"]
+        ]
+        # Two entities and three checks in total, one request for each.
+        assert 5 == client.get.call_count
+        payloads = dict(
+            (call[0][0], call[0][1]) for call in client.put.call_args_list
+        )
+        assert sorted(payloads) == [
+            "/api/core/v2/namespaces/default/events/e1/c",
+            "/api/core/v2/namespaces/default/events/e1/d",
+            "/api/core/v2/namespaces/other/events/e2/c",
+        ]
+        assert payloads["/api/core/v2/namespaces/default/events/e1/c"] == dict(
+            metadata=dict(namespace="default"),
+            entity=dict(path="/api/core/v2/namespaces/default/entities/e1"),
+            check=dict(
+                path="/api/core/v2/namespaces/default/checks/c", status=1,
+            ),
+        )
+
+    def test_partial_failure(self, mocker):
+        def get_entity(client, namespace, name):
+            if name != "e1":
+                raise errors.SyncError("missing {0}".format(name))
+            return dict(name=name)
+
+        mocker.patch.object(event_utils, "get_entity", side_effect=get_entity)
+        mocker.patch.object(event_utils, "get_check").return_value = {}
+        mocker.patch.object(utils, "put")
+        set_module_args(events=[
+            dict(entity="e1", check="c"),
+            dict(entity="e2", check="c"),
+        ])
+
+        with pytest.raises(AnsibleFailJson) as context:
+            events.main()
+
+        result = context.value.args[0]
+        assert result["msg"] == "Failed to send 1 of 2 events"
+        assert result["changed"] is True
+        assert [False, True] == [r["failed"] for r in result["results"]]
+
+    def test_lean_events(self, mocker):
+        client = mocker.Mock()
+        client.put.return_value = http.Response(201, "")
+        mocker.patch(
+            "ansible_collections.sensu.sensu_go.plugins.module_utils."
+            "arguments.get_sensu_client",
+        ).return_value = client
+        set_module_args(lean=True, events=[
+            dict(entity="e1", check="c"),
+            dict(entity="e2", check="c"),
+        ])
+
+        with pytest.raises(AnsibleExitJson) as context:
+            events.main()
+
+        assert context.value.args[0]["changed"] is True
+        client.get.assert_not_called()
+        assert 2 == client.put.call_count
@@ -0,0 +1,222 @@
+from __future__ import absolute_import, division, print_function
+__metaclass__ = type
+
+import sys
+
+import pytest
+
+from ansible_collections.sensu.sensu_go.plugins.module_utils import (
+    errors, http, resource_utils, utils,
+)
+from ansible_collections.sensu.sensu_go.plugins.modules import resources
+
+from .common.utils import (
+    AnsibleExitJson, AnsibleFailJson, ModuleTestCase, set_module_args,
+)
+
+pytestmark = pytest.mark.skipif(
+    sys.version_info < (2, 7), reason="requires python2.7 or higher"
+)
+
+
+class TestValidateModuleParams:
+    def test_missing_spec(self):
+        params = dict(resources=[
+            dict(kind="Namespace", name="a", state="absent", spec=None),
+            dict(kind="Namespace", name="b", state="present", spec=None),
+        ])
+
+        assert "Namespace b" in resources.validate_module_params(params)
+
+    def test_metadata_in_spec(self):
+        params = dict(resources=[
+            dict(kind="Handler", name="h", state="present", spec=dict(
+                metadata=dict(name="h"),
+            )),
+        ])
+
+        assert "metadata" in resources.validate_module_params(params)
+
+    def test_labels_without_metadata(self):
+        params = dict(resources=[
+            dict(kind="Namespace", name="n", state="present", spec=dict(),
+                 labels=dict(a="b"), annotations=None),
+        ])
+
+        assert "Namespace n" in resources.validate_module_params(params)
+
+    def test_valid_params(self):
+        params = dict(resources=[
+            dict(kind="Handler", name="h", state="present", spec=dict()),
+        ])
+
+        assert resources.validate_module_params(params) is None
+
+
+class TestResources(ModuleTestCase):
+    def test_sync_all_resources(self, mocker):
+        sync_mock = mocker.patch.object(resource_utils, "sync")
+        sync_mock.side_effect = ((True, dict(a=1)), (False, None))
+        get_sensu_client = mocker.patch(
+            "ansible_collections.sensu.sensu_go.plugins.module_utils."
+            "arguments.get_sensu_client",
+        )
+        set_module_args(
+            namespace="ns",
+            resources=[
+                dict(
+                    kind="CheckConfig", name="check", labels=dict(a="b"),
+                    spec=dict(command="cmd"),
+                ),
+                dict(kind="ClusterRole", name="role", state="absent"),
+            ],
+        )
+
+        with pytest.raises(AnsibleExitJson) as context:
+            resources.main()
+
+        assert context.value.args[0]["changed"] is True
+        assert context.value.args[0]["results"] == [
+            dict(
+                kind="CheckConfig", name="check", namespace="ns",
+                changed=True, object=dict(a=1),
+            ),
+            dict(
+                kind="ClusterRole", name="role", namespace=None,
+                changed=False, object=None,
+            ),
+        ]
+        client = get_sensu_client.return_value
+        sync_mock.assert_any_call(
+            "present", client, "CheckConfig", "check", "ns",
+            dict(command="cmd"), False, dict(a="b"), None, "full",
+        )
+        sync_mock.assert_any_call(
+            "absent", client, "ClusterRole", "role", None, None, False,
+            None, None, "full",
+        )
+
+    def test_item_namespace_overrides_default(self, mocker):
+        sync_mock = mocker.patch.object(resource_utils, "sync")
+        sync_mock.return_value = False, {}
+        set_module_args(
+            resources=[
+                dict(kind="Handler", name="h", namespace="own", spec={}),
+            ],
+        )
+
+        with pytest.raises(AnsibleExitJson) as context:
+            resources.main()
+
+        assert context.value.args[0]["changed"] is False
+        assert "own" == sync_mock.call_args[0][4]
+
+    def test_return_object_is_passed_through(self, mocker):
+        sync_mock = mocker.patch.object(resource_utils, "sync")
+        sync_mock.return_value = True, None
+        set_module_args(
+            return_object="none",
+            resources=[dict(kind="Handler", name="h", spec={})],
+        )
+
+        with pytest.raises(AnsibleExitJson) as context:
+            resources.main()
+
+        assert context.value.args[0]["results"][0]["object"] is None
+        assert "none" == sync_mock.call_args[0][9]
+
+    def test_diff_mode(self, mocker):
+        client = mocker.Mock()
+        client.get.return_value = http.Response(
+            200, '{"command": "old", "metadata": {"name": "h"}}',
+        )
+        mocker.patch(
+            "ansible_collections.sensu.sensu_go.plugins.module_utils."
+            "arguments.get_sensu_client",
+        ).return_value = client
+        set_module_args(
+            _ansible_diff=True, _ansible_check_mode=True,
+            resources=[
+                dict(kind="HookConfig", name="h", spec=dict(command="new")),
+            ],
+        )
+
+        with pytest.raises(AnsibleExitJson) as context:
+            resources.main()
+
+        result, = context.value.args[0]["results"]
+        assert result["diff"] == dict(
+            before=dict(command="old", metadata=dict(name="h")),
+            after=dict(
+                command="new",
+                metadata=dict(name="h", namespace="default"),
+            ),
+        )
+
+    def test_invalid_params(self, mocker):
+        set_module_args(
+            resources=[dict(kind="Handler", name="h")],
+        )
+
+        with pytest.raises(AnsibleFailJson, match="spec is required"):
+            resources.main()
+
+    def test_prefetch_shared_collections(self, mocker):
+        mocker.patch.object(resource_utils, "sync").return_value = False, {}
+        prefetch = mocker.patch.object(utils, "prefetch")
+        set_module_args(
+            resources=[
+                dict(kind="Handler", name="a", spec={}),
+                dict(kind="Handler", name="b", spec={}),
+                dict(kind="Handler", name="c", namespace="other", spec={}),
+                dict(kind="Namespace", name="x", spec={}),
+                dict(kind="Namespace", name="y", spec={}),
+            ],
+        )
+
+        with pytest.raises(AnsibleExitJson):
+            resources.main()
+
+        assert [
+            c[0][1] for c in prefetch.call_args_list
+        ] == [
+            "/api/core/v2/namespaces",
+            "/api/core/v2/namespaces/default/handlers",
+        ]
+
+    def test_prefetch_failure(self, mocker):
+        sync_mock = mocker.patch.object(resource_utils, "sync")
+        mocker.patch.object(utils, "prefetch").side_effect = errors.Error(
+            "Bad error",
+        )
+        set_module_args(
+            resources=[
+                dict(kind="Handler", name="a", spec={}),
+                dict(kind="Handler", name="b", spec={}),
+            ],
+        )
+
+        with pytest.raises(AnsibleFailJson, match="Bad error"):
+            resources.main()
+
+        sync_mock.assert_not_called()
+
+    def test_failure(self, mocker):
+        mocker.patch.object(utils, "prefetch")
+        sync_mock = mocker.patch.object(resource_utils, "sync")
+        sync_mock.side_effect = (
+            (True, {}), errors.Error("Bad error"),
+        )
+        set_module_args(
+            resources=[
+                dict(kind="Handler", name="a", spec={}),
+                dict(kind="Handler", name="b", spec={}),
+            ],
+        )
+
+        with pytest.raises(AnsibleFailJson) as context:
+            resources.main()
+
+        assert "Handler b: Bad error" == context.value.args[0]["msg"]
+        assert context.value.args[0]["changed"] is True
+        assert 1 == len(context.value.args[0]["results"])
@@ -55,6 +55,20 @@ class TestSecretInfo(ModuleTestCase):
             {"k1": "v1"}, {"k2": "v2"},
         ]
 
+    def test_fields_apply_to_converted_objects(self, mocker):
+        get_mock = mocker.patch.object(utils, "get")
+        get_mock.return_value = [
+            {"metadata": {"name": "a"}, "spec": {"id": "ID", "provider": "env"}},
+        ]
+        set_module_args(fields=["metadata.name", "provider"])
+
+        with pytest.raises(AnsibleExitJson) as context:
+            secret_info.main()
+
+        assert context.value.args[0]["objects"] == [
+            {"metadata": {"name": "a"}, "provider": "env"},
+        ]
+
     def test_get_single_secret(self, mocker):
         get_mock = mocker.patch.object(utils, "get")
         get_mock.return_value = {"spec": {"k3": "v3"}}
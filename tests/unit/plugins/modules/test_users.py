@@ -0,0 +1,135 @@
+from __future__ import absolute_import, division, print_function
+__metaclass__ = type
+
+import sys
+
+import pytest
+
+from ansible_collections.sensu.sensu_go.plugins.module_utils import (
+    errors, user_utils, utils,
+)
+from ansible_collections.sensu.sensu_go.plugins.modules import users
+
+from .common.utils import (
+    AnsibleExitJson, AnsibleFailJson, ModuleTestCase, set_module_args,
+)
+
+pytestmark = pytest.mark.skipif(
+    sys.version_info < (2, 7), reason="requires python2.7 or higher"
+)
+
+
+def item(name, **kwargs):
+    return dict(
+        dict(
+            name=name, state="enabled", password=None, password_hash=None,
+            groups=None,
+        ), **kwargs
+    )
+
+
+class TestSyncUser:
+    def test_update_existing_user(self, mocker):
+        sync_mock = mocker.patch.object(user_utils, "sync")
+        sync_mock.return_value = True, None
+
+        result = users.sync_user(
+            "client", item("alice", groups=["dev"]),
+            dict(alice=dict(username="alice")), False,
+        )
+
+        assert dict(name="alice", changed=True, failed=False) == result
+        sync_mock.assert_called_once_with(
+            dict(username="alice"), "client", "/api/core/v2/users/alice",
+            dict(username="alice", disabled=False, groups=["dev"]), False,
+            return_object="none", password_cache_ttl=0,
+        )
+
+    def test_create_user(self, mocker):
+        sync_mock = mocker.patch.object(user_utils, "sync")
+        sync_mock.return_value = True, None
+
+        result = users.sync_user(
+            "client", item("alice", password="pass"), {}, True,
+        )
+
+        assert dict(name="alice", changed=True, failed=False) == result
+        remote_object, _client, _path, payload, check_mode = (
+            sync_mock.call_args[0]
+        )
+        assert remote_object is None
+        assert "pass" == payload["password"]
+        assert check_mode is True
+
+    def test_cannot_create_user_without_password(self, mocker):
+        sync_mock = mocker.patch.object(user_utils, "sync")
+
+        result = users.sync_user("client", item("alice"), {}, False)
+
+        assert result["failed"] is True
+        assert "without a password" in result["msg"]
+        sync_mock.assert_not_called()
+
+    def test_record_errors(self, mocker):
+        sync_mock = mocker.patch.object(user_utils, "sync")
+        sync_mock.side_effect = errors.Error("Bad error")
+
+        result = users.sync_user(
+            "client", item("alice"), dict(alice=dict(username="alice")),
+            False,
+        )
+
+        assert dict(
+            name="alice", changed=False, failed=True, msg="Bad error",
+        ) == result
+
+
+class TestUsers(ModuleTestCase):
+    def test_fetch_users_once(self, mocker):
+        iter_mock = mocker.patch.object(utils, "iter_objects")
+        iter_mock.return_value = iter([
+            dict(username="alice"), dict(username="bob"),
+        ])
+        sync_mock = mocker.patch.object(users, "sync_user")
+        sync_mock.side_effect = lambda c, i, r, m, t: dict(
+            name=i["name"], changed=i["name"] == "bob", failed=False,
+        )
+        set_module_args(users=[dict(name="alice"), dict(name="bob")])
+
+        with pytest.raises(AnsibleExitJson) as context:
+            users.main()
+
+        assert context.value.args[0]["changed"] is True
+        assert ["alice", "bob"] == [
+            r["name"] for r in context.value.args[0]["results"]
+        ]
+        iter_mock.assert_called_once_with(mocker.ANY, "/api/core/v2/users")
+        for call in sync_mock.call_args_list:
+            assert dict(
+                alice=dict(username="alice"), bob=dict(username="bob"),
+            ) == call[0][2]
+
+    def test_failed_users(self, mocker):
+        mocker.patch.object(utils, "iter_objects").return_value = iter([])
+        sync_mock = mocker.patch.object(users, "sync_user")
+        sync_mock.side_effect = (
+            dict(name="alice", changed=True, failed=False),
+            dict(name="bob", changed=False, failed=True, msg="Bad"),
+        )
+        set_module_args(
+            users=[dict(name="alice"), dict(name="bob")], concurrency=1,
+        )
+
+        with pytest.raises(AnsibleFailJson) as context:
+            users.main()
+
+        assert "1 of 2" in context.value.args[0]["msg"]
+        assert context.value.args[0]["changed"] is True
+
+    def test_failure_on_listing(self, mocker):
+        iter_mock = mocker.patch.object(utils, "iter_objects")
+        iter_mock.side_effect = errors.Error("Bad error")
+        set_module_args(users=[dict(name="alice")])
+
+        with pytest.raises(AnsibleFailJson, match="Bad error"):
+            users.main()